@@ -0,0 +1,119 @@
+import sys
+import numpy as np
+
+from data.ticks import read_ticks
+
+
+class BookStore:
+
+	# Recorded / Historical L2 Snapshots per (Venue, Asset) as Memory-Mapped Record Arrays
+	# The Snapshot Valid at Each Backtest Step is Looked Up Once Up Front (-1 = None / Stale)
+
+	def __init__(self, tick_dir, assets, times, max_age_ms):
+		self.tick_dir = tick_dir
+		self.assets = list(assets)
+		self.times = np.asarray(times, dtype='int64')
+		self.books = {}
+		self.rows = {}
+
+		start_ns = (int(self.times[0]) - max_age_ms) * 10 ** 6
+		end_ns = (int(self.times[-1]) + 1) * 10 ** 6
+		t_ns = self.times * 10 ** 6
+
+		for venue in ('binance', 'hl'):
+			for asset in assets:
+				rec = read_ticks(str(tick_dir), venue, asset, 'book', start_ns, end_ns)
+				if not len(rec): continue
+
+				rows = np.searchsorted(rec['t'], t_ns, side='right') - 1
+				age = t_ns - rec['t'][np.maximum(rows, 0)]
+				rows[(rows < 0) | (age > max_age_ms * 10 ** 6)] = -1
+
+				self.books[(venue, asset)] = rec
+				self.rows[(venue, asset)] = rows
+
+	def coverage(self, *venues):
+
+		# Share of (Asset, Step) Pairs with a Usable Snapshot on Every Given Venue
+		usable = np.ones((len(self.assets), len(self.times)), dtype=bool)
+		for i, asset in enumerate(self.assets):
+			for venue in venues:
+				rows = self.rows.get((venue, asset))
+				usable[i] &= rows >= 0 if rows is not None else False
+		return float(usable.mean()) if usable.size else 0.0
+
+	def get(self, venue, asset, step):
+
+		# (bids, asks) as (levels, 2) Views, None if No Usable Snapshot
+		rows = self.rows.get((venue, asset))
+		if rows is None or step >= len(rows) or rows[step] < 0: return None
+		rec = self.books[(venue, asset)][rows[step]]
+		return rec['bids'], rec['asks']
+
+
+def walk(levels, qty):
+
+	# Taker Walk Down Zero-Padded Levels -> (avg_px, filled_qty)
+	sizes = levels[:, 1]
+	cum = np.cumsum(sizes)
+	filled = min(qty, cum[-1])
+	if filled <= 0: return None, 0
+
+	i = int(np.searchsorted(cum, filled))
+	prev = cum[i - 1] if i else 0
+	cost = np.dot(levels[:i, 0], sizes[:i]) + levels[i, 0] * (filled - prev)
+	return cost / filled, filled
+
+
+class BookFillModel:
+
+	# execution_model: book
+	# HL Leg Rests at the Touch Behind the Displayed Size; it Fills from the Bar's Flow
+	# (maker_flow_frac of Volume) Once the Queue Ahead is Consumed, or in Full if the Next
+	# Snapshot Trades Through. The Binance Hedge Walks the Book. Both Legs Fill the Same Qty.
+
+	def __init__(self, config, store):
+		self.config = config
+		self.store = store
+		self.flow_frac = config['maker_flow_frac']
+
+		# Fills Need Both Books; Only HL Archives are Converted (get_hl_books), Binance Depth
+		# Comes from the Live Recorder, so Historical Ranges Often Have None
+		for venue in ('hl', 'binance'):
+			if not store.coverage(venue):
+				raise ValueError(f'execution_model: book found no {venue} book snapshots in {store.tick_dir} for the backtest range')
+		share = store.coverage('hl', 'binance')
+		if share < 1: print(f'warning: hl and binance books cover {share:.1%} of steps; the rest fill on the slippage model', file=sys.stderr)
+
+	def fill(self, step, asset, qty, buy_exch, sell_exch, hl_volume):
+
+		# -> (qty, buy_px, sell_px), None to Fall Back to the Slippage Model
+		hl_side = 'buy' if buy_exch == 'hl' else 'sell'
+		hl_book = self.store.get('hl', asset, step)
+		bn_book = self.store.get('binance', asset, step)
+		if hl_book is None or bn_book is None: return None
+
+		hl_bids, hl_asks = hl_book
+		bn_bids, bn_asks = bn_book
+		touch = hl_bids[0] if hl_side == 'buy' else hl_asks[0]
+		if touch[0] <= 0: return None
+
+		# Maker Fill: Trade-Through on the Next Snapshot, Else Flow Beyond the Queue
+		nxt = self.store.get('hl', asset, step + 1)
+		through = nxt is not None and nxt[1 if hl_side == 'buy' else 0][0, 0] > 0 and (
+			nxt[1][0, 0] <= touch[0] if hl_side == 'buy' else nxt[0][0, 0] >= touch[0])
+
+		if through:
+			maker_qty = qty
+		else:
+			flow = hl_volume * self.flow_frac
+			maker_qty = min(qty, max(flow - touch[1], 0))
+
+		# Taker Hedge Sells into Binance Bids when HL Buys, and Vice Versa
+		bn_levels = bn_bids if hl_side == 'buy' else bn_asks
+		_, hedge_qty = walk(bn_levels, maker_qty)
+		if hedge_qty <= 0: return 0, None, None
+		hedge_px, _ = walk(bn_levels, hedge_qty)
+
+		if hl_side == 'buy': return hedge_qty, touch[0], hedge_px
+		return hedge_qty, hedge_px, touch[0]
@@ -1,11 +1,23 @@
+import numpy as np
+import pandas as pd
+
+from backtest.flows import CashFlows, VENUES, FUNDING, FEE, NOTIONAL, SLIPPAGE
+
+
 class Portfolio:
 
-	def __init__(self, name, config, cash, assets):
+	# Cash Moves by Trade Notional, so Equity = Cash + Position x Mark
+	cash_nets_notional = True
+
+	def __init__(self, name, config, cash, assets, flows=None):
 		self.name = name
+		self.venue = VENUES.index(name)
 		self.config = config
 		self.cash = cash
 		self.assets = assets
+		self.flows = flows
 		self.positions = {a: {'position': 0, 'cost_basis': 0} for a in assets}
+		self.notional = np.zeros(len(assets))
 
 	def accrue_funding(self, t, state):
 
@@ -24,6 +36,7 @@ class Portfolio:
 				mod = 1/8 if exch == 'hl' else 1
 				funding_payment = drc * ntl * funding_rate * mod
 				self.cash += funding_payment
+				if self.flows: self.flows.add(self.venue, asset, FUNDING, funding_payment)
 
 		return
 
@@ -42,6 +55,9 @@ class Portfolio:
 		self.cash -= fee
 		# Adjust Cash by Notional of Trade
 		self.cash -= (drc * ntl)
+		if self.flows:
+			self.flows.add(self.venue, asset, FEE, -fee)
+			self.flows.add(self.venue, asset, NOTIONAL, -drc * ntl)
 		
 		A = position >= 0 and side == 'buy'
 		B = position <= 0 and side == 'sell'
@@ -56,55 +72,52 @@ class Portfolio:
 			self.positions[asset]['cost_basis'] = new_cost_basis
 
 		# Trading in Opposite Direction of Position
+		# (Cash Already Moved by the Trade Notional, Which Realizes the PnL vs Cost Basis)
 		else:
 			
-			trade_pnl = 0
 			# Fully Close Position
 			if abs(position) == qty:
-
-				trade_pnl = (cost_basis - px) * drc * qty 
-
 				self.positions[asset]['position'] = 0
 				self.positions[asset]['cost_basis'] = 0
 
 			# Flipping on Directional Exposure
 			elif abs(position) < qty:
-				
-				trade_pnl = (cost_basis - px) * drc * position 
-
 				diff = qty - abs(position)
 				self.positions[asset]['position'] = diff * drc
 				self.positions[asset]['cost_basis'] = px
 
 			# Partially Closing Position
 			else:
-
-				trade_pnl = (cost_basis - px) * drc * qty 
-
 				new_pos = position + (drc * qty)
 				self.positions[asset]['position'] = new_pos
 
-			self.cash += trade_pnl
-
 		return
 
 	def mark_to_market(self, state):
 
+		# Per-Asset Notionals Kept for the Report's Exposure Breakdown
 		mtm_equity = self.cash
-		for asset in self.positions:
+		for i, asset in enumerate(self.positions):
 			mark_px = state[asset].iloc[0][f'{self.name}_mark_price']
-			mtm_equity += self.positions[asset]['position'] * mark_px
+			self.notional[i] = self.positions[asset]['position'] * mark_px
+			mtm_equity += self.notional[i]
 
 		return mtm_equity
 
 
 class Strategy:
 
-	def __init__(self, config, bn_portfolio, hl_portfolio):
+	def __init__(self, config, bn_portfolio, hl_portfolio, trackers=None, fill_model=None):
 		self.config = config
 		self.bn_port = bn_portfolio
 		self.hl_port = hl_portfolio
+		self.flows = bn_portfolio.flows
+		self.trackers = trackers
+		self.fill_model = fill_model
+		self.step = 0
 		self.equity_curve = []
+		self.venue_equity = []
+		self.notional = []
 
 	def accrue_funding(self, t, state):
 
@@ -160,59 +173,120 @@ class Strategy:
 
 	def simulate_execution(self, state, trades):
 
+		# Returns Fills as (exch, asset, fill) for Position Caches
+		fills = []
 		for trade in trades:
 
 			asset, qty = trade[0]
 			buy_exch = trade[1][0]
 			sell_exch = trade[2][0]
+			row = state[asset].iloc[0]
 
 			# Cap Trade Size by Volume Participation
-			buy_vlm = state[asset].iloc[0][f'{buy_exch}_perp_volume']
-			sell_vlm = state[asset].iloc[0][f'{sell_exch}_perp_volume']
+			buy_vlm = row[f'{buy_exch}_perp_volume']
+			sell_vlm = row[f'{sell_exch}_perp_volume']
 			trade_vlm = min(buy_vlm, sell_vlm) * self.config['max_pov']
 			trade_qty = min(abs(qty), trade_vlm)
 
-			# Slippage Adjusted Prices
-			slip = self.config['slippage']
-			buy_px = state[asset].iloc[0][f'{buy_exch}_perp_price'] * (1 + slip)
-			sell_px = state[asset].iloc[0][f'{sell_exch}_perp_price'] * (1 - slip)
+			# Book-Aware Fill Where Snapshots Exist, Otherwise Slippage Adjusted Prices
+			# (Perp Prices are also the Reference for Slippage Records)
+			buy_ref = row[f'{buy_exch}_perp_price']
+			sell_ref = row[f'{sell_exch}_perp_price']
+			hl_vlm = buy_vlm if buy_exch == 'hl' else sell_vlm
+			fill = self.fill_model.fill(self.step, asset, trade_qty, buy_exch, sell_exch, hl_vlm) if self.fill_model else None
+			if fill is not None:
+				trade_qty, buy_px, sell_px = fill
+				if trade_qty <= 0: continue
+			else:
+				slip = self.config['slippage']
+				buy_px = buy_ref * (1 + slip)
+				sell_px = sell_ref * (1 - slip)
 
 			buy_port = self.bn_port if buy_exch =='binance' else self.hl_port
 			sell_port = self.bn_port if sell_exch =='binance' else self.hl_port
 
+			if self.flows:
+				self.flows.add(buy_port.venue, asset, SLIPPAGE, (buy_ref - buy_px) * trade_qty)
+				self.flows.add(sell_port.venue, asset, SLIPPAGE, (sell_px - sell_ref) * trade_qty)
+
 			buy_trd = [asset, trade_qty, 'buy', buy_px]
 			buy_port.update_position(buy_trd)
 
 			sell_trd = [asset, trade_qty, 'sell', sell_px]
 			sell_port.update_position(sell_trd)
 
-		return
+			fills.append((buy_exch, asset, {'side': 'buy', 'size': trade_qty, 'price': buy_px}))
+			fills.append((sell_exch, asset, {'side': 'sell', 'size': trade_qty, 'price': sell_px}))
+
+		return fills
 
 	def mark_to_market(self, t, state):
 		
 		bn_equity = self.bn_port.mark_to_market(state)
 		hl_equity = self.hl_port.mark_to_market(state)
 		self.equity_curve.append([t, bn_equity + hl_equity])
+		self.venue_equity.append((bn_equity, hl_equity))
+		self.notional.append(np.stack([self.bn_port.notional, self.hl_port.notional]))
+
+		# Feed Streaming Risk Trackers (HL Mark, Volume-Based Depth Proxy)
+		if self.trackers:
+			n = len(self.trackers.assets)
+			prices, depth = np.zeros(n), np.zeros(n)
+			for asset, df in state.items():
+				if asset not in self.trackers.index or df.empty: continue
+				row = df.iloc[0]
+				i = self.trackers.index[asset]
+				prices[i] = row['hl_mark_price']
+				depth[i] = min(row['binance_perp_volume'], row['hl_perp_volume'])
+			self.trackers.update(t, bn_equity + hl_equity, np.nan_to_num(prices), np.nan_to_num(depth))
 
 		return
 
 	def summary(self):
 
-		return {"equity_curve": self.equity_curve}
+		# Venue Equity (T x 2) and Notionals (T x Venue x Asset) in binance, hl Order
+		return {
+			"equity_curve": self.equity_curve,
+			"venue_equity": np.array(self.venue_equity).reshape(-1, 2),
+			"notional": np.array(self.notional).reshape(-1, 2, len(self.bn_port.assets)),
+			"venues": list(VENUES),
+			"assets": list(self.bn_port.assets),
+			"flows": self.flows.arrays() if self.flows else None
+		}
 
 
-def backtest_strategy(historical_data, signals, sizes, risk_mgr, config):
+def time_index(historical_data, times):
+
+	# First Row of Each Timestamp per Asset (-1 if Missing), Computed Once for the Run
+	index = {}
+	for asset, df in historical_data.items():
+		first = pd.Series(np.arange(len(df)), index=df['t'].values)
+		first = first[~first.index.duplicated()]
+		index[asset] = first.reindex(times).fillna(-1).astype(int).values
+	return index
+
+
+def backtest_strategy(historical_data, signals, sizes, risk_mgr, config, verbose=True, fill_model=None):
 
 	assets = signals.columns
 	initial_capital = config['starting_capital'] / 2
-	bn_portfolio = Portfolio('binance', config, initial_capital, assets)
-	hl_portfolio = Portfolio('hl', config, initial_capital, assets)
-	strategy = Strategy(config, bn_portfolio, hl_portfolio)
+	flows = CashFlows(assets)
+	bn_portfolio = Portfolio('binance', config, initial_capital, assets, flows)
+	hl_portfolio = Portfolio('hl', config, initial_capital, assets, flows)
+	strategy = Strategy(config, bn_portfolio, hl_portfolio, risk_mgr.trackers, fill_model)
+	risk_mgr.load(historical_data)
+
+	# Precomputed Time Index (One-Row Slices Instead of Scanning Every Table per Step)
+	rows = time_index({a: historical_data[a] for a in assets}, signals.index)
 	
-	for t in signals.index:
+	for k, t in enumerate(signals.index):
+
+		# Step Index Keys Precomputed Lookups (Book Snapshots)
+		strategy.step = k
+		flows.step = k
 
 		# Get Current State
-		state = {a: historical_data[a][historical_data[a]['t'] == t] for a in assets}
+		state = {a: historical_data[a].iloc[rows[a][k]:rows[a][k] + 1] if rows[a][k] >= 0 else historical_data[a].iloc[0:0] for a in assets}
 		target_sizes = sizes.loc[t]
 
 		# Accrue Funding
@@ -223,14 +297,17 @@ def backtest_strategy(historical_data, signals, sizes, risk_mgr, config):
 
 		# Assess Intents Against Portfolio
 		trades = risk_mgr.perform_checks(state, intents, strategy.bn_port, strategy.hl_port)
-		print(t, trades)
+		if verbose: print(t, trades)
 
 		# Simulate Execution
-		strategy.simulate_execution(state, trades)
+		fills = strategy.simulate_execution(state, trades)
+		for fill in fills: risk_mgr.on_fill(*fill)
 
 		# Determine if Any Risk Mitigation Necessary, if so Execute Orders
 		er_trades = risk_mgr.excess_risk(state, strategy.bn_port, strategy.hl_port)
-		if er_trades: strategy.simulate_execution(state, er_trades)
+		if er_trades:
+			fills = strategy.simulate_execution(state, er_trades)
+			for fill in fills: risk_mgr.on_fill(*fill)
 
 		# Mark to Market
 		strategy.mark_to_market(t, state)
@@ -0,0 +1,71 @@
+import numpy as np
+import pandas as pd
+
+DAY_MS = 24 * 60 * 60 * 1000
+
+# Cash-Flow Kinds; SLIPPAGE is the Part of NOTIONAL Paid Away from the Reference (Perp) Price
+FUNDING, FEE, NOTIONAL, SLIPPAGE = range(4)
+VENUES = ['binance', 'hl']
+
+
+class CashFlows:
+
+	# Compact Per-Event Records (Step, Venue, Asset, Kind, Amount) Appended in the Backtest Loop;
+	# Everything Else Happens After the Run in attribute()
+
+	def __init__(self, assets):
+		self.assets = list(assets)
+		self.index = {a: i for i, a in enumerate(self.assets)}
+		self.step = 0
+		self.records = []
+
+	def add(self, venue, asset, kind, amount):
+		self.records.append((self.step, venue, self.index[asset], kind, amount))
+		return
+
+	def arrays(self):
+		records = np.array(self.records, dtype=float).reshape(-1, 5)
+		return {
+			'step': records[:, 0].astype(np.int64),
+			'venue': records[:, 1].astype(np.int64),
+			'asset': records[:, 2].astype(np.int64),
+			'kind': records[:, 3].astype(np.int64),
+			'amount': records[:, 4]
+		}
+
+
+def attribute(result):
+
+	# PnL per Day x Venue x Asset Split into Funding, Fees, Slippage and Basis
+	# Trading PnL = Notional Cash Flows + Change in Marked Notional; Basis = Trading PnL Less Slippage
+	# Components Sum to the Change in Equity (Books Start Flat)
+	flows, notional, assets = result['flows'], result['notional'], result['assets']
+	t = np.asarray(result['equity_curve'], dtype=float).reshape(-1, 2)[:, 0]
+	days, day_of_step = np.unique(t // DAY_MS, return_inverse=True)
+	D, V, A, K = len(days), len(VENUES), len(assets), SLIPPAGE + 1
+
+	# One Grouped Reduction over All Records
+	key = ((day_of_step[flows['step']] * V + flows['venue']) * A + flows['asset']) * K + flows['kind']
+	sums = np.bincount(key, weights=flows['amount'], minlength=D * V * A * K).reshape(D, V, A, K)
+
+	# Marked Notional at Each Day's Last Step, Less the Previous Day's
+	last = np.flatnonzero(np.diff(day_of_step, append=D))
+	marked = notional[last]
+	d_marked = marked - np.concatenate([np.zeros((1, V, A)), marked[:-1]])
+
+	trading = sums[..., NOTIONAL] + d_marked
+	parts = {
+		'funding': sums[..., FUNDING],
+		'fees': sums[..., FEE],
+		'slippage': sums[..., SLIPPAGE],
+		'basis': trading - sums[..., SLIPPAGE]
+	}
+	parts['total'] = sum(parts.values())
+
+	day, venue, asset = np.indices((D, V, A)).reshape(3, -1)
+	return pd.DataFrame({
+		'day': pd.to_datetime(days[day] * DAY_MS, unit='ms').date,
+		'venue': np.array(VENUES)[venue],
+		'asset': np.array(assets)[asset],
+		**{k: v.ravel() for k, v in parts.items()}
+		})
@@ -0,0 +1,376 @@
+import copy
+import json
+import heapq
+import numpy as np
+import pandas as pd
+from pathlib import Path
+
+from live.logs import compact_quote
+from backtest.engine import Portfolio, Strategy
+
+VENUES = ('binance', 'hl')
+CASH = {'binance': 'bn_cash', 'hl': 'hl_cash'}
+INPUTS = ('market_data', 'position_snapshot', 'target_sizes', 'order_intent', 'order_submit', 'order_fill', 'execute_hedge')
+EVENTS = INPUTS + ('log_stats',)
+
+# Events of run_live.py Carry No strategy Tag (Hosted Strategies' Do)
+STRATEGY = 'main'
+
+# Compact Quote Layout (market_data.log); Older Logs Lack the Premium
+BID, BID_QTY, ASK, ASK_QTY, FUNDING, PREMIUM = range(6)
+FIELDS = 6
+
+STATE_COLUMNS = [
+	'binance_spot_price', 'binance_premium', 'hl_premium', 'binance_perp_price', 'hl_perp_price',
+	'binance_perp_volume', 'hl_perp_volume'
+	]
+
+STATS = (
+	'cycles', 'intents_live', 'intents_backtest', 'matched', 'side_mismatch', 'live_only', 'backtest_only', 'size_rel_err',
+	'submits_live', 'fills_live_hl', 'fills_backtest_hl', 'fills_live_binance', 'fills_backtest_binance',
+	'cost_live', 'notional_live', 'cost_backtest', 'notional_backtest',
+	'holding_live', 'holding_backtest', 'cost_sim'
+	)
+
+
+def log_paths(log_dir, name):
+
+	# Rotated Files Oldest First (name.N ... name.1, then name)
+	log_dir = Path(log_dir)
+	rotated = [p for p in log_dir.glob(f'{name}.*') if p.suffix[1:].isdigit()]
+	rotated.sort(key=lambda p: int(p.suffix[1:]), reverse=True)
+	current = log_dir / name
+	return rotated + ([current] if current.exists() else [])
+
+
+def read_events(paths, events=EVENTS):
+
+	# One Pass, a Line at a Time -> ((t, seq), Event); the Event Name is Sliced Out of the
+	# Raw Line First so Unwanted Records Never Pay for json.loads
+	wanted = {e.encode() for e in events}
+	for path in paths:
+		with open(path, 'rb') as f:
+			for line in f:
+				i = line.find(b'"event":"')
+				if i < 0: continue
+				if line[i + 9:line.find(b'"', i + 9)] not in wanted: continue
+				try:
+					e = json.loads(line[line.find(b'{'):])
+				except ValueError:
+					continue
+				yield (e.get('t') or 0, e.get('seq') or 0), e
+
+
+def merged_events(log_dir, start=None, end=None):
+
+	# production.log and market_data.log are Each in Write Order; Merge on (t, seq)
+	streams = [read_events(log_paths(log_dir, 'production.log')), read_events(log_paths(log_dir, 'market_data.log'))]
+	for key, e in heapq.merge(*streams, key=lambda x: x[0]):
+		if start is not None and key[0] < start: continue
+		if end is not None and key[0] > end: break
+		yield e
+
+
+class Reconciler:
+
+	# Feeds What the Live Loop Saw (Quotes, Positions, Targets) Through the Backtest Strategy
+	# - Anchored: Backtest Portfolios Reset to Live Positions Every Cycle, so trade_intents /
+	#   simulate_execution Decide on the Same Inputs -> Intent and Fill Divergences
+	# - Free-Running: a Backtest Book Trading Only its Own Fills from the First Snapshot -> PnL
+	# Per-Cycle Work is Python; Holding PnL is Reduced per Chunk of Columnar Market-Data Rows
+
+	def __init__(self, config, assets):
+		self.config = config
+		self.assets = list(assets)
+		self.index = {a: i for i, a in enumerate(self.assets)}
+		A = len(self.assets)
+
+		self.t = None
+		self.quotes = np.full((2, A, FIELDS), np.nan)
+		self.live = np.zeros((2, A))
+		self.basis = np.zeros((2, A))
+		self.anchored = Strategy(config, Portfolio('binance', config, 0, self.assets), Portfolio('hl', config, 0, self.assets))
+		self.sim = None
+		self.cycle = None
+
+		self.stats = {k: np.zeros(A) for k in STATS}
+		self.examples = []
+
+		# Columnar Chunk: Mids and Live / Backtest Positions at Each Market-Data Row
+		n = config['reconcile_chunk']
+		self.mid = np.zeros((n, 2, A))
+		self.pos_live = np.zeros((n, 2, A))
+		self.pos_sim = np.zeros((n, 2, A))
+		self.rows = 0
+
+		self.handlers = {
+			'market_data': self.on_market_data,
+			'position_snapshot': self.on_position_snapshot,
+			'target_sizes': self.on_target_sizes,
+			'order_intent': self.on_order_intent,
+			'order_submit': self.on_order_submit,
+			'order_fill': self.on_order_fill,
+			'execute_hedge': self.on_execute_hedge
+		}
+
+	def handle(self, e):
+		self.handlers[e['event']](e)
+		return
+
+	def finish(self):
+		self.close_cycle()
+		self.flush()
+		return self.summary()
+
+	# Inputs
+
+	def on_market_data(self, e):
+
+		for v, venue in enumerate(VENUES):
+			for asset, q in (e.get(venue) or {}).items():
+				if asset not in self.index: continue
+
+				# Full Payloads (Logs Written Before the market_data.log Split) -> Compact
+				if isinstance(q, dict): q = compact_quote(venue, q)
+				if q is None: continue
+				self.quotes[v, self.index[asset], :len(q)] = [np.nan if x is None else float(x) for x in q[:FIELDS]]
+
+		self.t = e.get('t')
+		self.mid[self.rows] = self.mids()
+		self.pos_live[self.rows] = self.live
+		self.pos_sim[self.rows] = self.sim_positions()
+		self.rows += 1
+		if self.rows == len(self.mid): self.flush()
+		return
+
+	def on_position_snapshot(self, e):
+
+		for v, key in enumerate(('bn_positions', 'hl_positions')):
+			for asset, p in (e.get(key) or {}).items():
+				if asset not in self.index: continue
+				self.live[v, self.index[asset]] = p['position']
+				self.basis[v, self.index[asset]] = p.get('cost_basis') or 0
+
+		# Free-Running Book Starts from the First Snapshot
+		if self.sim is None:
+			ports = [Portfolio(venue, self.config, e.get(CASH[venue], 0), self.assets) for venue in VENUES]
+			for v, port in enumerate(ports): self.load_positions(port, v)
+			self.sim = Strategy(self.config, *ports)
+		return
+
+	def on_target_sizes(self, e):
+
+		self.close_cycle()
+		mids = self.mids()
+		targets = {a: float(x) for a, x in e['targets'].items() if a in self.index and not np.isnan(mids[:, self.index[a]]).any()}
+		if not targets: return
+
+		state = self.state()
+		for asset in targets: self.stats['cycles'][self.index[asset]] += 1
+
+		# Anchored on Live Positions; Intent Size is the Participation-Capped Fill, the
+		# Backtest's Counterpart of the Live Cap at Hedge Book Depth
+		for v, port in enumerate((self.anchored.bn_port, self.anchored.hl_port)): self.load_positions(port, v)
+		backtest = {}
+		for fill_exch, asset, fill in self.anchored.simulate_execution(state, self.anchored.trade_intents(state, targets)):
+			v, i = VENUES.index(fill_exch), self.index[asset]
+			self.stats[f'fills_backtest_{fill_exch}'][i] += fill['size']
+			self.stats['cost_backtest'][i] += self.execution_pnl(v, i, fill['side'], fill['size'], fill['price'])
+			self.stats['notional_backtest'][i] += fill['size'] * fill['price']
+			if fill_exch == 'hl' and fill['size'] > 0: backtest[asset] = (fill['side'], fill['size'])
+
+		# Free-Running Book
+		if self.sim is not None:
+			for fill_exch, asset, fill in self.sim.simulate_execution(state, self.sim.trade_intents(state, targets)):
+				v, i = VENUES.index(fill_exch), self.index[asset]
+				self.stats['cost_sim'][i] += self.execution_pnl(v, i, fill['side'], fill['size'], fill['price'])
+
+		self.cycle = {'t': self.t, 'targets': targets, 'backtest': backtest, 'live': {}}
+		return
+
+	def on_order_intent(self, e):
+		if self.cycle is not None and e['asset'] in self.index: self.cycle['live'][e['asset']] = (e['side'], float(e['trade_size']))
+		return
+
+	def on_order_submit(self, e):
+		if e['asset'] in self.index: self.stats['submits_live'][self.index[e['asset']]] += 1
+		return
+
+	def on_order_fill(self, e):
+
+		# HL Maker Fill at its Own Price
+		fill, i = e['fill_data'], self.index.get(e['asset'])
+		if i is None: return
+		self.live_fill(1, i, fill['side'], float(fill['size']), float(fill['price']))
+		return
+
+	def on_execute_hedge(self, e):
+
+		# Binance Taker Hedge; the Log Has No Fill Price so Assume the Touch
+		order, i = e['order_data'], self.index.get(e['asset'])
+		if i is None: return
+		px = self.quotes[0, i, ASK] if order['side'] == 'buy' else self.quotes[0, i, BID]
+		if not np.isnan(px): self.live_fill(0, i, order['side'], float(order['amount']), px)
+		return
+
+	# Helpers
+
+	def mids(self):
+		return (self.quotes[..., BID] + self.quotes[..., ASK]) / 2
+
+	def sim_positions(self):
+		if self.sim is None: return np.zeros_like(self.live)
+		return np.array([[port.positions[a]['position'] for a in self.assets] for port in (self.sim.bn_port, self.sim.hl_port)])
+
+	def load_positions(self, port, v):
+		for asset, i in self.index.items(): port.positions[asset] = {'position': self.live[v, i], 'cost_basis': self.basis[v, i]}
+		return
+
+	def state(self):
+
+		# One-Row Frames in the Clean-Table Columns the Backtest Reads (Built from One
+		# Float Block, Far Cheaper than from Records); Perp Volume is Set so the max_pov
+		# Cap Equals the Displayed Touch Size
+		mids, q, pov = self.mids(), self.quotes, self.config['max_pov']
+		touch = np.nan_to_num((q[..., BID_QTY] + q[..., ASK_QTY]) / 2) / pov
+		rows = np.stack([mids[0], q[0, :, PREMIUM], q[1, :, PREMIUM], mids[0], mids[1], touch[0], touch[1]], axis=1)
+		return {asset: pd.DataFrame(rows[i:i + 1], columns=STATE_COLUMNS) for asset, i in self.index.items()}
+
+	def execution_pnl(self, v, i, side, size, price):
+
+		# Against the Venue Mid, Net of the Venue Fee
+		mid = self.mids()[v, i]
+		edge = (mid - price) * size if side == 'buy' else (price - mid) * size
+		return edge - size * price * self.config['fees'][VENUES[v]]
+
+	def live_fill(self, v, i, side, size, price):
+		self.stats[f'fills_live_{VENUES[v]}'][i] += size
+		self.stats['cost_live'][i] += self.execution_pnl(v, i, side, size, price)
+		self.stats['notional_live'][i] += size * price
+		return
+
+	def close_cycle(self):
+
+		# Compare One Cycle's Live Intents (HL Side, Size) with the Backtest's
+		if self.cycle is None: return
+		tol = self.config['reconcile_size_tol']
+		live, backtest = self.cycle['live'], self.cycle['backtest']
+		for asset in set(live) | set(backtest):
+			i = self.index[asset]
+			l, b = live.get(asset), backtest.get(asset)
+			if l: self.stats['intents_live'][i] += 1
+			if b: self.stats['intents_backtest'][i] += 1
+
+			err = None
+			if l and b and l[0] == b[0]:
+				self.stats['matched'][i] += 1
+				err = abs(l[1] - b[1]) / max(l[1], b[1], 1e-12)
+				self.stats['size_rel_err'][i] += err
+			elif l and b: self.stats['side_mismatch'][i] += 1
+			elif l: self.stats['live_only'][i] += 1
+			else: self.stats['backtest_only'][i] += 1
+
+			# Bounded Sample of Divergent Cycles
+			if (err is None or err > tol) and len(self.examples) < self.config['reconcile_max_examples']:
+				self.examples.append({
+					't': self.cycle['t'], 'asset': asset, 'target': self.cycle['targets'].get(asset),
+					'live_side': l and l[0], 'live_size': l and l[1],
+					'backtest_side': b and b[0], 'backtest_size': b and b[1]
+					})
+
+		self.cycle = None
+		return
+
+	def flush(self):
+
+		# Holding PnL of the Chunk: Position Held Before Each Row x the Mid Move Into It
+		if self.rows >= 2:
+			move = np.diff(self.mid[:self.rows], axis=0)
+			self.stats['holding_live'] += np.nansum(self.pos_live[:self.rows - 1] * move, axis=(0, 1))
+			self.stats['holding_backtest'] += np.nansum(self.pos_sim[:self.rows - 1] * move, axis=(0, 1))
+
+		# The Last Row Opens the Next Chunk
+		if self.rows:
+			self.mid[0], self.pos_live[0], self.pos_sim[0] = self.mid[self.rows - 1], self.pos_live[self.rows - 1], self.pos_sim[self.rows - 1]
+			self.rows = 1
+		return
+
+	def summary(self):
+
+		s = self.stats
+		with np.errstate(divide='ignore', invalid='ignore'):
+			df = pd.DataFrame({
+				'asset': self.assets,
+				'cycles': s['cycles'],
+				'intents_live': s['intents_live'],
+				'intents_backtest': s['intents_backtest'],
+				'matched': s['matched'],
+				'side_mismatch': s['side_mismatch'],
+				'live_only': s['live_only'],
+				'backtest_only': s['backtest_only'],
+				'size_rel_err': s['size_rel_err'] / s['matched'],
+				'submits_live': s['submits_live'],
+				'fills_live_hl': s['fills_live_hl'],
+				'fills_backtest_hl': s['fills_backtest_hl'],
+				'fills_live_binance': s['fills_live_binance'],
+				'fills_backtest_binance': s['fills_backtest_binance'],
+				'cost_bps_live': -s['cost_live'] / s['notional_live'] * 1e4,
+				'cost_bps_backtest': -s['cost_backtest'] / s['notional_backtest'] * 1e4,
+				'pnl_live': s['holding_live'] + s['cost_live'],
+				'pnl_backtest': s['holding_backtest'] + s['cost_sim']
+				})
+		df['pnl_diff'] = df['pnl_backtest'] - df['pnl_live']
+		return df
+
+
+class LogReconciler:
+
+	# One Reconciler per strategy Tag, Each on That Strategy's Config (host_strategies
+	# Overrides), so Hosted Accounts Never Mix; Market Data is Shared by All of Them
+	# log_stats Records Give the Inputs the Logger Sampled Out, Rate Limited, Coalesced or
+	# Dropped; Counters Restart with the Process so the Largest Seen is a Lower Bound
+
+	def __init__(self, config, strategy=None):
+		self.config = config
+		self.strategy = strategy
+		self.specs = {s['name']: s for s in config.get('host_strategies') or []}
+		self.groups = {}
+		self.last_quotes = None
+		self.gaps = {}
+
+	def run(self, events):
+
+		for e in events:
+			evt = e['event']
+			if evt == 'log_stats':
+				self.on_log_stats(e)
+			elif evt == 'market_data':
+				self.last_quotes = e
+				for r in self.groups.values(): r.handle(e)
+			else:
+				name = e.get('strategy', STRATEGY)
+				if self.strategy is None or name == self.strategy: self.group(name).handle(e)
+
+		frames = [r.finish().assign(strategy=name) for name, r in self.groups.items()]
+		summary = pd.concat(frames, ignore_index=True) if frames else pd.DataFrame(columns=['strategy', 'asset'])
+		return summary[['strategy', *summary.columns.drop('strategy')]]
+
+	def group(self, name):
+
+		# Created on a Strategy's First Event, Primed with the Latest Quotes
+		if name not in self.groups:
+			config = copy.deepcopy(self.config)
+			config.update(copy.deepcopy((self.specs.get(name) or {}).get('overrides') or {}))
+			self.groups[name] = Reconciler(config, config['assets'])
+			if self.last_quotes: self.groups[name].handle(self.last_quotes)
+		return self.groups[name]
+
+	def on_log_stats(self, e):
+		for kind in ('sampled_out', 'rate_limited', 'coalesced'):
+			for evt, n in (e.get(kind) or {}).items():
+				if evt in INPUTS and n: self.gaps[(kind, evt)] = max(self.gaps.get((kind, evt), 0), n)
+		if e.get('dropped'): self.gaps[('dropped', 'any')] = max(self.gaps.get(('dropped', 'any'), 0), e['dropped'])
+		return
+
+	def examples(self):
+		return [{'strategy': name, **x} for name, r in self.groups.items() for x in r.examples]
@@ -1,60 +1,235 @@
 import os
 import numpy as np
 import pandas as pd
-import matplotlib.pyplot as plt
+
+from backtest.flows import attribute
+
+YEAR_MS = 365 * 24 * 60 * 60 * 1000
+DAY_MS = 24 * 60 * 60 * 1000
+
+
+def lttb(x, y, n):
+
+    # Largest-Triangle-Three-Buckets -> Indices of the Points to Keep
+    # Each Bucket Keeps the Point Forming the Largest Triangle with the Previous Pick and the
+    # Next Bucket's Mean, so Spikes and Drawdown Troughs Survive; Cost is n Python Steps + O(len) NumPy
+    size = len(x)
+    if n >= size or n < 3: return np.arange(size)
+
+    edges = np.linspace(1, size - 1, n - 1).astype(int)
+    cx = np.concatenate([[0], np.cumsum(x)])
+    cy = np.concatenate([[0], np.cumsum(y)])
+
+    keep = np.empty(n, dtype=int)
+    keep[0], keep[-1] = 0, size - 1
+    a = 0
+    for i in range(n - 2):
+        lo, hi = edges[i], edges[i + 1]
+        nlo, nhi = (edges[i + 1], edges[i + 2]) if i + 2 < n - 1 else (size - 1, size)
+        mx = (cx[nhi] - cx[nlo]) / (nhi - nlo)
+        my = (cy[nhi] - cy[nlo]) / (nhi - nlo)
+
+        area = np.abs((x[a] - mx) * (y[lo:hi] - y[a]) - (x[a] - x[lo:hi]) * (my - y[a]))
+        a = lo + int(np.argmax(area))
+        keep[i + 1] = a
+
+    return keep
+
+
+def rolling_sharpe(excess, window, periods):
+
+    # Windowed Mean / Std from Running Sums (Sample Std, as pandas)
+    cs = np.concatenate([[0], np.cumsum(excess)])
+    cs2 = np.concatenate([[0], np.cumsum(excess ** 2)])
+    out = np.full(len(excess), np.nan)
+    if window < 2 or len(excess) < window: return out
+
+    s = cs[window:] - cs[:-window]
+    s2 = cs2[window:] - cs2[:-window]
+    mean = s / window
+    var = np.maximum(s2 - window * mean ** 2, 0) / (window - 1)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        out[window - 1:] = np.where(var > 0, mean / np.sqrt(var), np.nan) * np.sqrt(periods)
+    return out
+
+
+def compute_metrics(t, equity, config):
+
+    # Every Series and Headline Number in One Pass over the Equity Array
+    t = np.asarray(t, dtype=float)
+    equity = np.asarray(equity, dtype=float)
+    step = np.median(np.diff(t)) if len(t) > 1 else 60_000
+    periods = YEAR_MS / step
+    window = max(int(round(config['report_rolling_days'] * DAY_MS / step)), 2)
+
+    ret = np.zeros_like(equity)
+    ret[1:] = equity[1:] / equity[:-1] - 1
+    excess = ret - config['rfr'] / periods
+    drawdown = equity / np.maximum.accumulate(equity) - 1
+    rolling_peak = pd.Series(equity).rolling(window, min_periods=1).max().to_numpy()
+
+    num_days = (t[-1] - t[0]) / DAY_MS
+    cum_return = equity[-1] / config['starting_capital']
+    std = excess.std(ddof=1) if len(excess) > 1 else np.nan
+
+    return {
+        'series': {
+            'return': ret,
+            'log_return': np.log1p(ret),
+            'cum_return': equity / config['starting_capital'],
+            'excess_return': excess,
+            'drawdown': drawdown,
+            'rolling_sharpe': rolling_sharpe(excess, window, periods),
+            'rolling_drawdown': equity / rolling_peak - 1
+            },
+        'sharpe': excess.mean() / std * np.sqrt(periods) if std else np.nan,
+        'max_drawdown': drawdown.min(),
+        'cum_return': cum_return,
+        'annual_return': cum_return ** (365 / num_days) - 1 if num_days > 0 else np.nan
+    }
+
+
+def venue_breakdown(venue_equity, venues, config):
+
+    # Each Venue Book Starts with Half the Capital
+    start = config['starting_capital'] / 2
+    peak = np.maximum.accumulate(venue_equity, axis=0)
+    return pd.DataFrame({
+        'venue': venues,
+        'final_equity': venue_equity[-1],
+        'pnl': venue_equity[-1] - start,
+        'return': venue_equity[-1] / start - 1,
+        'max_drawdown': (venue_equity / peak - 1).min(axis=0)
+        })
+
+
+def asset_breakdown(notional, venues, assets):
+
+    # Exposure per Venue / Asset and the Net (Unhedged) Notional per Asset
+    gross = np.abs(notional)
+    rows = pd.DataFrame({
+        'venue': np.repeat(venues, len(assets)),
+        'asset': np.tile(assets, len(venues)),
+        'mean_abs_notional': gross.mean(axis=0).ravel(),
+        'max_abs_notional': gross.max(axis=0).ravel(),
+        'time_in_market': (gross > 1e-8).mean(axis=0).ravel()
+        })
+
+    net = notional.sum(axis=1)
+    rows = pd.concat([rows, pd.DataFrame({
+        'venue': 'net',
+        'asset': assets,
+        'mean_abs_notional': np.abs(net).mean(axis=0),
+        'max_abs_notional': np.abs(net).max(axis=0),
+        'time_in_market': (gross.sum(axis=1) > 1e-8).mean(axis=0)
+        })], ignore_index=True)
+
+    return rows
+
+
+def plot_series(ax, t, y, n, title, ylabel):
+
+    # Decimate Before Handing to Matplotlib (Leading NaNs of Rolling Series Dropped)
+    ok = np.flatnonzero(~np.isnan(y))
+    if not len(ok): return
+    t, y = t[ok[0]:], y[ok[0]:]
+    idx = lttb(t - t[0], np.nan_to_num(y), n)
+
+    ax.plot(pd.to_datetime(t[idx], unit='ms'), y[idx])
+    ax.set_title(title)
+    ax.set_xlabel("Time")
+    ax.set_ylabel(ylabel)
+    return
 
 
-def plot_drawdown(eq_df, outpath):
+def save_plot(t, y, n, title, ylabel, outfile):
 
-    plt.figure()
-    eq_df['drawdown'].plot(title="Drawdown")
-    plt.xlabel("Time")
-    plt.ylabel("Drawdown")
-    plt.tight_layout()
-    plt.savefig(os.path.join(outpath, "drawdown.png"))
-    plt.close()
+    # matplotlib Loads Only Once a Plot is Drawn
+    import matplotlib.pyplot as plt
+    fig, ax = plt.subplots()
+    plot_series(ax, t, y, n, title, ylabel)
+    fig.autofmt_xdate()
+    fig.tight_layout()
+    fig.savefig(outfile)
+    plt.close(fig)
 
     return
 
 
-def plot_equity_curve(eq_df, outpath):
-    
-    plt.figure()
-    eq_df['equity'].plot(title="Equity Curve")
-    plt.xlabel("Time")
-    plt.ylabel("Equity")
-    plt.tight_layout()
-    plt.savefig(os.path.join(outpath, "equity_curve.png"))
-    plt.close()
+def plot_rolling(t, series, n, days, outpath):
+
+    import matplotlib.pyplot as plt
+    fig, (top, bottom) = plt.subplots(2, 1, sharex=True)
+    plot_series(top, t, series['rolling_sharpe'], n, f"Rolling Sharpe ({days}d)", "Sharpe")
+    plot_series(bottom, t, series['rolling_drawdown'], n, f"Rolling Drawdown ({days}d)", "Drawdown")
+    fig.autofmt_xdate()
+    fig.tight_layout()
+    fig.savefig(os.path.join(outpath, "rolling.png"))
+    plt.close(fig)
 
     return
 
 
 def export_summary(result, outpath, config):
 
-    eq_df = pd.DataFrame(result['equity_curve'], columns=['t', 'equity'])
-    eq_df['return'] = (eq_df['equity'].pct_change()).replace(float('nan'), 0)
-    eq_df['log_return'] = np.log(1 + (eq_df['equity'].pct_change()).replace(float('nan'), 0))
-    eq_df['cum_return'] = (eq_df['equity'] / config['starting_capital'])
-    eq_df['excess_return'] = eq_df['return'] - (config['rfr'] / (365 * 24 * 60))
-    eq_df['drawdown'] = (eq_df['equity'] / eq_df['equity'].cummax()) - 1
+    curve = np.asarray(result['equity_curve'], dtype=float).reshape(-1, 2)
+    t, equity = curve[:, 0], curve[:, 1]
+    metrics = compute_metrics(t, equity, config)
+    series = metrics['series']
 
-    sharpe = (eq_df['excess_return'].mean() / eq_df['excess_return'].std()) * np.sqrt((365 * 24 * 60))
-    max_dd = eq_df['drawdown'].min()
-    cum_return = eq_df['cum_return'].iloc[-1]
-    num_days = (eq_df['t'].iloc[-1] - eq_df['t'].iloc[0]) / (60 * 60 * 24 * 100)
-    annual_return = (eq_df['cum_return'].iloc[-1] ** (365 / num_days)) - 1
+    venues, assets = result.get('venues', []), result.get('assets', [])
+    breakdowns = []
+    if 'venue_equity' in result: breakdowns.append(venue_breakdown(result['venue_equity'], venues, config))
+    if 'notional' in result: breakdowns.append(asset_breakdown(result['notional'], venues, assets))
+
+    # PnL Attribution per Day / Venue / Asset from the Engine's Cash-Flow Records
+    attribution = attribute(result) if result.get('flows') is not None else None
+    if attribution is not None:
+        attribution.to_csv(os.path.join(outpath, 'attribution.csv'), index=False)
+        parts = attribution.columns[3:]
+        breakdowns.append(attribution.groupby(['venue', 'asset'], as_index=False)[list(parts)].sum())
 
     summary_txt = os.path.join(outpath, 'summary.txt')
     with open(summary_txt, 'w') as f:
-        f.write(f"Annualized Return: {annual_return:.2%}\n")
-        f.write(f"Sharpe Ratio: {sharpe:.2f}\n")
-        f.write(f"Max Drawdown: {max_dd:.2%}\n")
-
-    plot_drawdown(eq_df, outpath)
-    plot_equity_curve(eq_df, outpath)
-    eq_df.to_csv(os.path.join(outpath, 'data.csv'), index=False)
+        f.write(f"Annualized Return: {metrics['annual_return']:.2%}\n")
+        f.write(f"Sharpe Ratio: {metrics['sharpe']:.2f}\n")
+        f.write(f"Max Drawdown: {metrics['max_drawdown']:.2%}\n")
+        f.write(f"Cumulative Return: {metrics['cum_return'] - 1:.2%}\n")
+        if attribution is not None:
+            for part in parts: f.write(f"{part.title()} PnL: {attribution[part].sum():,.2f}\n")
+        for df in breakdowns: f.write("\n" + df.to_string(index=False, float_format=lambda x: f"{x:,.4f}") + "\n")
+
+    if breakdowns: pd.concat(breakdowns, ignore_index=True).to_csv(os.path.join(outpath, 'breakdown.csv'), index=False)
+
+    # Plots from at Most report_plot_points Points per Series
+    n = config['report_plot_points']
+    save_plot(t, equity, n, "Equity Curve", "Equity", os.path.join(outpath, "equity_curve.png"))
+    save_plot(t, series['drawdown'], n, "Drawdown", "Drawdown", os.path.join(outpath, "drawdown.png"))
+    plot_rolling(t, series, n, config['report_rolling_days'], outpath)
+
+    # Full-Resolution Results: Binary Arrays (load_results), CSV Optional as it Scales with Run Length
+    flows = result.get('flows') or {}
+    np.savez(
+        os.path.join(outpath, 'results.npz'), t=t, equity=equity, **series,
+        venue_equity=result.get('venue_equity', np.empty((0, 2))), notional=result.get('notional', np.empty((0, 2, 0))),
+        venues=np.array(venues, dtype=str), assets=np.array(assets, dtype=str),
+        **{f'flow_{k}': v for k, v in flows.items()}
+        )
+    if config['report_csv']: pd.DataFrame({'t': t, 'equity': equity, **series}).to_csv(os.path.join(outpath, 'data.csv'), index=False)
 
     return
 
 
+def load_results(outpath):
+
+    # results.npz -> the backtest_strategy Result Shape export_summary Takes
+    with np.load(os.path.join(outpath, 'results.npz')) as z:
+        flows = {k[5:]: z[k] for k in z.files if k.startswith('flow_')}
+        return {
+            'equity_curve': np.stack([z['t'], z['equity']], axis=1),
+            'venue_equity': z['venue_equity'],
+            'notional': z['notional'],
+            'venues': list(z['venues']),
+            'assets': list(z['assets']),
+            'flows': flows or None
+        }
@@ -0,0 +1,222 @@
+import os
+import numpy as np
+import pandas as pd
+import multiprocessing as mp
+
+from strategy.signal import funding_spread, generate_signals
+from strategy.sizing import compute_sizes
+from risk.manager import RiskManager
+from backtest.engine import backtest_strategy
+
+
+VENUES = ('binance', 'hl')
+PRICE_COLS = ['binance_spot_price', 'binance_perp_price', 'binance_mark_price', 'binance_index_price',
+	'hl_perp_price', 'hl_mark_price', 'hl_index_price']
+
+# Read-Only Base Tables, Inherited by Forked Workers (Pages Shared Until Written)
+BASE = {}
+
+
+def build_scenarios(config, n_paths, seed=0):
+
+	# Parameterized Shock Specs, Cycling Through Kinds; Every Path has its Own Seed
+	rng = np.random.default_rng(seed)
+	kinds = config['scenario_kinds']
+	lo_w, hi_w = config['scenario_window_min']
+
+	scenarios = []
+	for k in range(n_paths):
+		kind = kinds[k % len(kinds)]
+		spec = {'id': k, 'kind': kind, 'seed': int(rng.integers(2 ** 31)),
+			'start': float(rng.uniform()), 'window': int(rng.integers(lo_w, hi_w + 1))}
+
+		if kind == 'funding_spike':
+			spec['venue'] = VENUES[int(rng.integers(2))]
+			spec['size'] = float(rng.uniform(*config['scenario_funding_spike']))
+		elif kind == 'basis_blowout':
+			spec['size'] = float(rng.uniform(*config['scenario_basis_bps']))
+		elif kind == 'volume_drought':
+			spec['size'] = float(rng.uniform(*config['scenario_drought_frac']))
+		elif kind == 'bootstrap':
+			spec['block'] = config['scenario_block_min']
+
+		scenarios.append(spec)
+
+	return scenarios
+
+
+def common_grid(base):
+
+	# Times Every Asset Table Has a Row For (Tables are Sorted by t)
+	grid = None
+	for df in base.values():
+		grid = df['t'].values if grid is None else np.intersect1d(grid, df['t'].values)
+	return grid
+
+
+def window_mask(n, spec):
+	start = int(spec['start'] * max(n - spec['window'], 1))
+	mask = np.zeros(n, dtype=bool)
+	mask[start:start + spec['window']] = True
+	return mask
+
+
+def overlay(spec, base):
+
+	# Shocked Columns Only; Everything Else Still Points at the Base Arrays
+	columns = {}
+	rng = np.random.default_rng(spec['seed'])
+
+	if spec['kind'] == 'bootstrap':
+
+		# Moving Block Bootstrap on the Common t Grid: Same Block Draws for Every Asset, so
+		# Resampled Cross-Asset Moves Stay Aligned in Time
+		# Prices Rebuilt from Resampled Log Returns; Settlement Times Stay on the Base Grid
+		grid = common_grid(base)
+		n = len(grid)
+		if spec['block'] >= n: raise ValueError(f"bootstrap block {spec['block']} must be shorter than the {n}-row common grid")
+		starts = rng.integers(0, n - spec['block'] + 1, size=-(-n // spec['block']))
+		rows = (starts[:, None] + np.arange(spec['block'])[None, :]).ravel()[:n]
+
+		for asset, df in base.items():
+			cols = {}
+			on_grid = np.searchsorted(df['t'].values, grid)
+			for col in df.columns:
+				values = df[col].values[on_grid]
+				if col == 't' or col.endswith('_funding_time'):
+					cols[col] = values
+					continue
+				if col in PRICE_COLS:
+					r = np.diff(np.log(values), prepend=np.log(values[0]))[rows]
+					r[0] = 0
+					cols[col] = values[0] * np.exp(np.nancumsum(r))
+				else:
+					cols[col] = values[rows]
+			columns[asset] = cols
+		return columns
+
+	for asset, df in base.items():
+		mask = window_mask(len(df), spec)
+		cols = {}
+
+		# Additive Funding Shock on One Venue Over the Window
+		if spec['kind'] == 'funding_spike':
+			for col in (f"{spec['venue']}_funding_prev", f"{spec['venue']}_funding_next"):
+				cols[col] = np.where(mask, df[col].values + spec['size'], df[col].values)
+
+		# HL Prices Pulled Away from Binance, Ramped In and Out Over the Window
+		elif spec['kind'] == 'basis_blowout':
+			ramp = np.zeros(len(df))
+			ramp[mask] = np.sin(np.linspace(0, np.pi, mask.sum()))
+			for col in ('hl_perp_price', 'hl_mark_price'):
+				cols[col] = df[col].values * (1 + ramp * spec['size'] / 1e4)
+			cols['hl_premium'] = df['hl_premium'].values + ramp * spec['size'] / 1e4
+
+		# Volumes Cut to a Fraction (Binds max_pov)
+		elif spec['kind'] == 'volume_drought':
+			for col in ('binance_perp_volume', 'hl_perp_volume'):
+				cols[col] = np.where(mask, df[col].values * spec['size'], df[col].values)
+
+		columns[asset] = cols
+
+	return columns
+
+
+def apply_overlay(base, columns):
+	data = {}
+	for asset, df in base.items():
+		cols = columns.get(asset, {})
+		n = min((len(v) for v in cols.values()), default=len(df))
+		path = df.iloc[:n].copy(deep=False)
+		for col, values in cols.items(): path[col] = values
+		data[asset] = path
+	return data
+
+
+def path_metrics(equity, config):
+
+	equity = np.asarray(equity, dtype=float)
+	peak = np.maximum.accumulate(equity)
+	return {
+		'return': equity[-1] / config['starting_capital'] - 1,
+		'max_drawdown': float((1 - equity / peak).max()),
+		'min_equity': float(equity.min())
+	}
+
+
+def run_path(args):
+
+	spec, config = args
+	data = apply_overlay(BASE, overlay(spec, BASE))
+
+	# Spread Computed Once for Both (as in run_backtest)
+	spread = funding_spread(data, config)
+	signals = generate_signals(data, config, spread)
+	sizes = compute_sizes(signals, config, spread)
+	result = backtest_strategy(data, signals, sizes, RiskManager(config), config, verbose=False)
+
+	metrics = path_metrics([e for _, e in result['equity_curve']], config)
+	metrics.update({k: v for k, v in spec.items() if k != 'seed'})
+	return metrics
+
+
+def init_worker(base):
+	BASE.update(base)
+	return
+
+
+def run_scenarios(historical_data, config, n_paths=None, workers=None, seed=0):
+
+	n_paths = n_paths or config['scenario_paths']
+	scenarios = [{'id': -1, 'kind': 'base', 'seed': 0, 'start': 0, 'window': 0}] + build_scenarios(config, n_paths, seed)
+
+	# Bootstrap Blocks Must Fit the Common Grid (Otherwise Every Path is the Base Path)
+	if 'bootstrap' in config['scenario_kinds'] and config['scenario_block_min'] >= len(common_grid(historical_data)):
+		raise ValueError(f"scenario_block_min {config['scenario_block_min']} must be shorter than the common t grid")
+
+	# Fork Shares the Base Tables Copy-on-Write; Spawn Falls Back to One Copy per Worker
+	BASE.clear()
+	BASE.update(historical_data)
+	methods = mp.get_all_start_methods()
+	ctx = mp.get_context('fork' if 'fork' in methods else None)
+	initargs = () if 'fork' in methods else (historical_data,)
+
+	with ctx.Pool(workers or config['scenario_workers'] or os.cpu_count(),
+		initializer=init_worker if initargs else None, initargs=initargs) as pool:
+		results = pool.map(run_path, [(spec, config) for spec in scenarios], chunksize=1)
+
+	return pd.DataFrame(results)
+
+
+def tail_summary(results, config):
+
+	# Per Kind: Mean / VaR / CVaR of Path Returns and the Worst Drawdown
+	alpha = config['scenario_alpha']
+	rows = []
+	for kind, grp in results.groupby('kind'):
+		r = np.sort(grp['return'].values)
+		k = max(int(np.ceil(alpha * len(r))), 1)
+		rows.append({
+			'kind': kind,
+			'paths': len(r),
+			'mean_return': r.mean(),
+			f'var_{alpha}': r[k - 1],
+			f'cvar_{alpha}': r[:k].mean(),
+			'worst_return': r[0],
+			'mean_max_drawdown': grp['max_drawdown'].mean(),
+			'worst_max_drawdown': grp['max_drawdown'].max()
+		})
+	return pd.DataFrame(rows)
+
+
+def export_scenarios(results, outpath, config):
+
+	summary = tail_summary(results, config)
+	results.to_csv(os.path.join(outpath, 'scenario_paths.csv'), index=False)
+	summary.to_csv(os.path.join(outpath, 'scenario_summary.csv'), index=False)
+
+	with open(os.path.join(outpath, 'scenario_summary.txt'), 'w') as f:
+		f.write(summary.to_string(index=False, float_format=lambda x: f'{x:.4%}' if abs(x) < 10 else f'{x:.0f}'))
+		f.write('\n')
+
+	return summary
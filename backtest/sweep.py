@@ -0,0 +1,74 @@
+import os
+import pandas as pd
+import multiprocessing as mp
+
+from strategy.signal import funding_spread, generate_signal_grid
+from strategy.sizing import compute_size_grid, param_grid
+from risk.manager import RiskManager
+from backtest.engine import backtest_strategy
+from backtest.scenarios import path_metrics
+
+
+# Parameters a Sweep Can Vary (Each Defaults to its Single Config Value)
+SWEEP_KEYS = ('edge_threshold', 'notional_per_trade', 'max_position_size', 'edge_size_scale')
+
+# Read-Only Base Tables, Spread and (param, time, asset) Grids, Inherited by Forked Workers
+GRID = {}
+
+
+def build_grid(historical_data, config):
+
+	# Spread Computed Once; One Broadcast Pass Gives Signals and Sizes for Every Setting
+	params = param_grid(**{k: config['sweep_params'].get(k, [config[k]]) for k in SWEEP_KEYS})
+	spread = funding_spread(historical_data, config)
+	signals = generate_signal_grid(spread.values, params['edge_threshold'])
+	edge_scales = params['edge_size_scale'] if config['sizing_mode'] == 'edge' else None
+	sizes = compute_size_grid(signals, spread.values, params['notional_per_trade'], params['max_position_size'], edge_scales)
+
+	return {'data': historical_data, 'params': params, 'index': spread.index, 'columns': spread.columns,
+		'signals': signals, 'sizes': sizes}
+
+
+def run_setting(args):
+
+	k, config = args
+	params = {key: GRID['params'][key][k].item() for key in SWEEP_KEYS}
+	config = {**config, **params}
+
+	signals = pd.DataFrame(GRID['signals'][k], index=GRID['index'], columns=GRID['columns']).astype(int)
+	sizes = pd.DataFrame(GRID['sizes'][k], index=GRID['index'], columns=GRID['columns'])
+	result = backtest_strategy(GRID['data'], signals, sizes, RiskManager(config), config, verbose=False)
+
+	metrics = path_metrics([e for _, e in result['equity_curve']], config)
+	metrics.update(params)
+	return metrics
+
+
+def init_worker(grid):
+	GRID.update(grid)
+	return
+
+
+def run_sweep(historical_data, config, workers=None):
+
+	GRID.clear()
+	GRID.update(build_grid(historical_data, config))
+	n = len(GRID['params']['edge_threshold'])
+
+	# Fork Shares the Grids Copy-on-Write; Spawn Falls Back to One Copy per Worker
+	methods = mp.get_all_start_methods()
+	ctx = mp.get_context('fork' if 'fork' in methods else None)
+	initargs = () if 'fork' in methods else (dict(GRID),)
+
+	with ctx.Pool(min(workers or config['sweep_workers'] or os.cpu_count(), n),
+		initializer=init_worker if initargs else None, initargs=initargs) as pool:
+		results = pool.map(run_setting, [(k, config) for k in range(n)], chunksize=1)
+
+	return pd.DataFrame(results)
+
+
+def export_sweep(results, outpath):
+
+	results = results.sort_values('return', ascending=False)
+	results.to_csv(os.path.join(outpath, 'sweep.csv'), index=False)
+	return results
@@ -0,0 +1,65 @@
+import sys
+import json
+import yaml
+import subprocess
+from pathlib import Path
+
+BASE_DIR = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(BASE_DIR))
+
+from cli import COMMANDS
+
+# Runs in a Fresh Interpreter: Resolve One Command, Report Wall Time and Which Heavy Modules Loaded
+PROBE = """
+import sys, json, time
+t0 = time.perf_counter()
+import cli
+cli.resolve(sys.argv[1])
+ms = (time.perf_counter() - t0) * 1000
+print(json.dumps({'ms': ms, 'modules': sorted({m.split('.')[0] for m in sys.modules})}))
+"""
+
+
+def probe(command):
+
+	# -X importtime Goes to stderr; Keep Cumulative us of Each Top-Level Package, Less the
+	# Entry Modules Themselves (Their Cost is Everything Below Them)
+	out = subprocess.run([sys.executable, '-X', 'importtime', '-c', PROBE, command], cwd=BASE_DIR, capture_output=True, text=True, check=True)
+	skip = {'cli', 'site', *(module for module, _, _ in COMMANDS.values())}
+	cumulative = {}
+	for line in out.stderr.splitlines():
+		if not line.startswith('import time:') or 'cumulative' in line: continue
+		_, cum, name = line[len('import time:'):].split('|')
+		name = name.strip()
+		if '.' not in name and name not in skip: cumulative[name] = int(cum)
+	return json.loads(out.stdout.strip().splitlines()[-1]), cumulative
+
+
+def main(args):
+
+	with open(BASE_DIR / "config.yaml", "r") as f: config = yaml.safe_load(f)
+	n = int(args[1]) if len(args) > 1 else 5
+	budgets, forbidden = config['import_budget_ms'], config['import_forbidden']
+
+	failed = False
+	for command in COMMANDS:
+		if command not in budgets: continue
+
+		# Best of n Cold Starts (Each a New Process; the OS File Cache Stays Warm)
+		runs = [probe(command) for _ in range(n)]
+		result, cumulative = min(runs, key=lambda r: r[0]['ms'])
+		loaded = sorted(set(forbidden.get(command, [])) & set(result['modules']))
+		slow = sorted(cumulative.items(), key=lambda kv: -kv[1])[:3]
+
+		ok = result['ms'] <= budgets[command] and not loaded
+		failed = failed or not ok
+		print(f"{command:<10} {result['ms']:7.1f}ms  budget {budgets[command]}ms  {'ok' if ok else 'REGRESSION'}"
+			+ (f"  loads {','.join(loaded)}" if loaded else '')
+			+ f"  top: {', '.join(f'{m} {us / 1000:.0f}ms' for m, us in slow)}")
+
+	if failed: sys.exit(1)
+	return
+
+
+if __name__ == '__main__':
+	main(sys.argv)
@@ -0,0 +1,84 @@
+import sys
+import time
+import yaml
+import numpy as np
+import pandas as pd
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from risk.manager import RiskManager
+from backtest.engine import Portfolio
+
+
+def backtest_inputs(config, rng):
+
+	# One-Row Frames per Asset, as backtest_strategy Builds Them
+	state = {}
+	for asset in config['assets']:
+		px = rng.uniform(1, 100_000)
+		state[asset] = pd.DataFrame([{
+			't': 0,
+			'binance_mark_price': px, 'hl_mark_price': px * 1.0001,
+			'binance_perp_price': px, 'hl_perp_price': px * 1.0001,
+			'binance_perp_volume': 1e6 / px, 'hl_perp_volume': 1e6 / px
+			}])
+	intents = []
+	for asset in config['assets']:
+		qty = 50_000 / state[asset]['binance_mark_price'].iloc[0]
+		intents.append([[asset, qty], ['binance', 'buy'], ['hl', 'sell']])
+	return state, intents
+
+
+def live_inputs(config, rng):
+
+	# Venue-Keyed Market Data, as Strategy.get_market_data Returns It
+	state = {'binance': {}, 'hl': {}}
+	for asset in config['assets']:
+		px = rng.uniform(1, 100_000)
+		levels = [[str(px * (1 - k / 1e4)), '10'] for k in range(10)]
+		state['binance'][asset] = {
+			'ticker': {'bidPrice': str(px * 0.9999), 'askPrice': str(px * 1.0001)},
+			'book': {'bids': levels, 'asks': levels}
+			}
+		state['hl'][asset] = {'ticker': {'bid': px * 0.9999, 'ask': px * 1.0001, 'last': px}}
+	intents = [[asset, 'sell', 1.0] for asset in config['assets']]
+	return state, intents
+
+
+def bench(fn, n):
+	times = np.empty(n)
+	for k in range(n):
+		t0 = time.perf_counter()
+		fn()
+		times[k] = time.perf_counter() - t0
+	return np.percentile(times, [50, 99]) * 1e6
+
+
+def main(args):
+
+	BASE_DIR = Path(__file__).resolve().parent.parent
+	with open(BASE_DIR / "config.yaml", "r") as f: config = yaml.safe_load(f)
+	n = int(args[1]) if len(args) > 1 else 10_000
+	rng = np.random.default_rng(0)
+	budget = config['risk_latency_budget_us']
+
+	for name, inputs in (('backtest_strategy', backtest_inputs), ('execution_loop', live_inputs)):
+		state, intents = inputs(config, rng)
+		risk_mgr = RiskManager(config)
+		if name == 'backtest_strategy': risk_mgr.load(state)
+		bn_port = Portfolio('binance', config, config['starting_capital'] / 2, config['assets'])
+		hl_port = Portfolio('hl', config, config['starting_capital'] / 2, config['assets'])
+
+		for label, fn in (
+			('perform_checks', lambda: risk_mgr.perform_checks(state, intents, bn_port, hl_port)),
+			('excess_risk', lambda: risk_mgr.excess_risk(state, bn_port, hl_port))):
+			p50, p99 = bench(fn, n)
+			status = 'ok' if p99 <= budget else 'OVER BUDGET'
+			print(f'{name:<18} {label:<15} p50 {p50:8.1f}us  p99 {p99:8.1f}us  budget {budget}us  {status}')
+
+	return
+
+
+if __name__ == '__main__':
+	main(sys.argv)
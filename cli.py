@@ -0,0 +1,39 @@
+import sys
+import argparse
+import importlib
+
+# Subcommand -> (Entry Module, Function, Help)
+# Only the Chosen Command's Module is Imported; Remaining Arguments Go to its Own Parser
+COMMANDS = {
+	'download': ('run_backtest', 'download', 'Download raw venue history'),
+	'clean': ('run_backtest', 'clean', 'Merge raw downloads into clean per-asset tables'),
+	'backtest': ('run_backtest', 'backtest', 'Run the backtest and write results/'),
+	'report': ('run_backtest', 'report', 'Rebuild the report from results/results.npz'),
+	'scenarios': ('run_scenarios', 'main', 'Run the backtest across shocked / resampled paths'),
+	'sweep': ('run_sweep', 'main', 'Backtest every setting in sweep_params'),
+	'replay': ('run_replay', 'main', 'Replay the live loop against simulated venues'),
+	'live': ('run_live', 'main', 'Run the live strategy'),
+	'host': ('run_host', 'main', 'Run every host_strategies entry in one process'),
+	'monitor': ('live_monitor', 'main', 'Serve the monitoring dashboard'),
+	'reconcile': ('run_reconcile', 'main', 'Compare live logs with the backtest strategy on the same inputs')
+}
+
+
+def resolve(command):
+	module, fn, _ = COMMANDS[command]
+	return getattr(importlib.import_module(module), fn)
+
+
+def main(args):
+
+	parser = argparse.ArgumentParser(description='Funding rate arbitrage toolkit')
+	commands = parser.add_subparsers(dest='command', required=True)
+	for name, (_, _, text) in COMMANDS.items(): commands.add_parser(name, help=text, add_help=False)
+	opts = parser.parse_args(args[1:2])
+
+	resolve(opts.command)([f'{args[0]} {opts.command}', *args[2:]])
+	return
+
+
+if __name__ == '__main__':
+	main(sys.argv)
@@ -1,7 +1,9 @@
 import os
+import json
 import yaml
 import boto3
 import lz4.frame
+import numpy as np
 import pandas as pd
 import multiprocessing as mp
 
@@ -10,6 +12,8 @@ from pathlib import Path
 from datetime import timedelta
 from dotenv import load_dotenv, find_dotenv
 
+from data.ticks import TickWriter, BOOK_LEVELS
+
 
 def list_dates(start, end):
 	dates = []
@@ -52,3 +56,47 @@ def get_hl_data(config):
 			print(date_str, 'asset_ctxt', e)
 
 	return
+
+
+def get_hl_books(config, tick_dir):
+
+	# Hourly l2Book Archives -> Fixed-Width Book Records (Same Files the Live Recorder Writes)
+	s3 = boto3.client(
+		"s3",
+		aws_access_key_id=os.getenv("AWS_ACCESS_KEY_ID"),
+		aws_secret_access_key=os.getenv("AWS_SECRET_ACCESS_KEY")
+		)
+
+	for asset in config['assets']:
+		writer = TickWriter(str(tick_dir), 'hl', asset, 'book')
+
+		for date_str in list_dates(config['start'], config['end']):
+			for hour in range(24):
+
+				try:
+					resp = s3.get_object(
+						Bucket="hyperliquid-archive",
+						Key=f"market_data/{date_str}/{hour}/l2Book/{asset}.lz4",
+						RequestPayer="requester"
+						)
+					lines = lz4.frame.decompress(resp["Body"].read()).splitlines()
+
+				# Data Not Uploaded to S3 Bucket
+				except Exception as e:
+					print(date_str, hour, 'l2Book', asset, e)
+					continue
+
+				for line in lines:
+					data = json.loads(line)['raw']['data']
+					sides = []
+					for levels in data['levels']:
+						arr = np.zeros((BOOK_LEVELS, 2))
+						top = [[float(l['px']), float(l['sz'])] for l in levels[:BOOK_LEVELS]]
+						if top: arr[:len(top)] = top
+						sides.append(arr)
+					t = int(data['time'])
+					writer.append(t * 10 ** 6, t, 0, sides[0], sides[1])
+
+		writer.flush()
+
+	return
@@ -0,0 +1,237 @@
+import os
+import time
+import threading
+import numpy as np
+
+from datetime import datetime, timezone
+
+
+# Fixed-Width Little-Endian Records
+# t = Local Receive Time (ns), exch_t = Exchange Timestamp (ms)
+BOOK_LEVELS = 10
+DTYPES = {
+	'bbo': np.dtype([
+		('t', '<i8'), ('exch_t', '<i8'),
+		('bid', '<f8'), ('bid_qty', '<f8'),
+		('ask', '<f8'), ('ask_qty', '<f8')]),
+	'book': np.dtype([
+		('t', '<i8'), ('exch_t', '<i8'), ('seq', '<i8'),
+		('bids', '<f8', (BOOK_LEVELS, 2)),
+		('asks', '<f8', (BOOK_LEVELS, 2))]),
+	'funding': np.dtype([
+		('t', '<i8'), ('exch_t', '<i8'),
+		('rate', '<f8'), ('funding_time', '<i8')])
+}
+
+# Sparse Index: One (t, record_no) Entry Every INDEX_STRIDE Records
+INDEX_STRIDE = 4096
+INDEX_DTYPE = np.dtype([('t', '<i8'), ('n', '<i8')])
+
+DAY_NS = 24 * 60 * 60 * 10 ** 9
+
+
+def tick_path(root, venue, asset, kind, day):
+	return os.path.join(root, venue, asset, f'{day}.{kind}.bin')
+
+
+def utc_day(t_ns):
+	return datetime.fromtimestamp(t_ns / 1e9, tz=timezone.utc).strftime('%Y%m%d')
+
+
+class TickWriter:
+
+	# Append-Only Writer for One (Venue, Asset, Kind), Rolls Files at UTC Midnight
+	# Records Buffer in a Preallocated Array and are Written on flush()
+
+	def __init__(self, root, venue, asset, kind, buffer_size=4096):
+		self.root = root
+		self.venue = venue
+		self.asset = asset
+		self.kind = kind
+		self.dtype = DTYPES[kind]
+
+		self.buf = np.zeros(buffer_size, dtype=self.dtype)
+		self.n = 0
+		self.day = None
+		self.day_end = 0
+		self.count = 0
+		self.last_t = 0
+
+	def _open_day(self, t):
+
+		self.flush()
+		day = utc_day(t)
+		self.day = day
+		self.day_end = (t // DAY_NS + 1) * DAY_NS
+		path = tick_path(self.root, self.venue, self.asset, self.kind, day)
+		os.makedirs(os.path.dirname(path), exist_ok=True)
+
+		# Resume Record Count if File Already Exists
+		self.count = os.path.getsize(path) // self.dtype.itemsize if os.path.exists(path) else 0
+		return
+
+	def append(self, t, *fields):
+
+		# Timestamps Forced Monotonic so Readers Can Binary Search
+		t = max(t, self.last_t)
+		self.last_t = t
+
+		if t >= self.day_end: self._open_day(t)
+		if self.n == len(self.buf): self.flush()
+
+		self.buf[self.n] = (t, *fields)
+		self.n += 1
+		return
+
+	def flush(self):
+
+		if not self.n: return
+		path = tick_path(self.root, self.venue, self.asset, self.kind, self.day)
+		records = self.buf[:self.n]
+
+		with open(path, 'ab') as f: f.write(records.tobytes())
+
+		# Index Entries for Every Stride Boundary Crossed
+		first = -(-self.count // INDEX_STRIDE) * INDEX_STRIDE
+		marks = np.arange(first, self.count + self.n, INDEX_STRIDE)
+		if len(marks):
+			idx = np.zeros(len(marks), dtype=INDEX_DTYPE)
+			idx['t'] = records['t'][marks - self.count]
+			idx['n'] = marks
+			with open(path[:-4] + '.idx', 'ab') as f: f.write(idx.tobytes())
+
+		self.count += self.n
+		self.n = 0
+		return
+
+
+class TickRecorder:
+
+	# Captures BBO, Book and Funding Updates from the Live Clients
+	# Appends are O(1) Array Writes; a Background Thread Flushes to Disk
+
+	def __init__(self, root, flush_interval=1):
+		self.root = str(root)
+		self.writers = {}
+		self.last_bbo = {}
+		self.last_funding = {}
+		self.lock = threading.Lock()
+		self.flush_interval = flush_interval
+		threading.Thread(target=self._flush_loop, name='tick-recorder', daemon=True).start()
+
+	def writer(self, venue, asset, kind):
+		key = (venue, asset, kind)
+		if key not in self.writers: self.writers[key] = TickWriter(self.root, venue, asset, kind)
+		return self.writers[key]
+
+	def record_bbo(self, venue, asset, exch_t, bid, bid_qty, ask, ask_qty):
+
+		# Only Changes are Recorded
+		quote = (bid, bid_qty, ask, ask_qty)
+		with self.lock:
+			if self.last_bbo.get((venue, asset)) == quote: return
+			self.last_bbo[(venue, asset)] = quote
+			self.writer(venue, asset, 'bbo').append(time.time_ns(), exch_t or 0, *quote)
+		return
+
+	def record_book(self, book):
+
+		bids, asks = book.top(BOOK_LEVELS)
+		with self.lock:
+			self.writer(book.venue, book.asset, 'book').append(time.time_ns(), book.t or 0, book.seq or 0, bids, asks)
+
+		bbo = book.bbo()
+		if bbo is not None: self.record_bbo(book.venue, book.asset, book.t, *bbo)
+		return
+
+	def record_funding(self, venue, asset, exch_t, rate, funding_time):
+
+		# Funding Only Changes at Settlement
+		with self.lock:
+			if self.last_funding.get((venue, asset)) == funding_time: return
+			self.last_funding[(venue, asset)] = funding_time
+			self.writer(venue, asset, 'funding').append(time.time_ns(), exch_t or 0, rate, funding_time)
+		return
+
+	def record_market_data(self, market_data):
+
+		# REST Snapshots from Strategy.get_market_data
+		for asset, data in market_data['binance'].items():
+			ticker = data['ticker']
+			self.record_bbo('binance', asset, int(ticker['time']),
+				float(ticker['bidPrice']), float(ticker['bidQty']),
+				float(ticker['askPrice']), float(ticker['askQty']))
+			if data['funding']:
+				funding = data['funding'][0]
+				self.record_funding('binance', asset, int(funding['fundingTime']),
+					float(funding['fundingRate']), int(funding['fundingTime']))
+
+		for asset, data in market_data['hl'].items():
+			bids, asks = data['book']['bids'], data['book']['asks']
+			if bids and asks:
+				self.record_bbo('hl', asset, data['book'].get('timestamp'),
+					bids[0][0], bids[0][1], asks[0][0], asks[0][1])
+			if data['funding']:
+				funding = data['funding'][0]
+				self.record_funding('hl', asset, int(funding['timestamp']),
+					float(funding['fundingRate']), int(funding['timestamp']))
+
+		return
+
+	def flush(self):
+		with self.lock:
+			for writer in self.writers.values(): writer.flush()
+		return
+
+	def _flush_loop(self):
+		while True:
+			time.sleep(self.flush_interval)
+			self.flush()
+
+
+class TickReader:
+
+	# Memory-Mapped Reader for One Day File; Slices are Zero-Copy Views
+
+	def __init__(self, root, venue, asset, kind, day):
+		self.dtype = DTYPES[kind]
+		path = tick_path(root, venue, asset, kind, day)
+
+		n = os.path.getsize(path) // self.dtype.itemsize
+		self.data = np.memmap(path, dtype=self.dtype, mode='r', shape=(n,)) if n else np.zeros(0, dtype=self.dtype)
+
+		idx_path = path[:-4] + '.idx'
+		self.index = np.fromfile(idx_path, dtype=INDEX_DTYPE) if os.path.exists(idx_path) else np.zeros(0, dtype=INDEX_DTYPE)
+
+	def __len__(self):
+		return len(self.data)
+
+	def seek(self, t):
+
+		# Index Narrows to One Stride, Binary Search Within It
+		block = np.searchsorted(self.index['t'], t) - 1
+		lo = int(self.index['n'][block]) if block >= 0 else 0
+		hi = min(lo + INDEX_STRIDE, len(self.data)) if block + 1 < len(self.index) else len(self.data)
+		return lo + int(np.searchsorted(self.data['t'][lo:hi], t))
+
+	def range(self, start, end):
+		return self.data[self.seek(start):self.seek(end)]
+
+
+def read_ticks(root, venue, asset, kind, start, end):
+
+	# Records with start <= t < end (ns) Across Day Files
+	days = []
+	cur = datetime.fromtimestamp(start / 1e9, tz=timezone.utc).date()
+	last = datetime.fromtimestamp(end / 1e9, tz=timezone.utc).date()
+	while cur <= last:
+		days.append(cur.strftime('%Y%m%d'))
+		cur = cur.fromordinal(cur.toordinal() + 1)
+
+	chunks = []
+	for day in days:
+		if not os.path.exists(tick_path(root, venue, asset, kind, day)): continue
+		chunks.append(TickReader(root, venue, asset, kind, day).range(start, end))
+
+	if not chunks: return np.zeros(0, dtype=DTYPES[kind])
+	return chunks[0] if len(chunks) == 1 else np.concatenate(chunks)
@@ -0,0 +1,267 @@
+import threading
+import numpy as np
+from collections import deque
+
+
+class OrderBook:
+
+	# Array-Backed L2 Book for One (Venue, Asset)
+	# Each Side Stores Ascending Keys (Ask Price / Negated Bid Price) and Sizes
+	# Levels Beyond Capacity are Dropped from the Far End
+	# Recently Applied Diffs are Kept so REST Snapshots Behind the Stream can be Rolled Forward
+
+	def __init__(self, venue, asset, depth=100, history=200):
+		self.venue = venue
+		self.asset = asset
+		self.depth = depth
+		self.lock = threading.Lock()
+
+		self.keys = {'bids': np.zeros(depth), 'asks': np.zeros(depth)}
+		self.sizes = {'bids': np.zeros(depth), 'asks': np.zeros(depth)}
+		self.n = {'bids': 0, 'asks': 0}
+
+		self.seq = None
+		self.t = None
+		self.synced = False
+		self.stale = True
+		self.pending = []
+		self.recent = deque(maxlen=history)
+		self.check = None
+		self.listeners = []
+
+	def reset(self):
+
+		# Gap Detected -> Wait for a Fresh Snapshot
+		with self.lock:
+			self.seq = None
+			self.synced = False
+			self.stale = True
+			self.pending = []
+			self.recent.clear()
+			self.check = None
+		return
+
+	def _load_side(self, side, levels):
+
+		levels = np.asarray(levels, dtype=float).reshape(-1, 2)[:self.depth]
+		n = len(levels)
+		sign = -1 if side == 'bids' else 1
+		order = np.argsort(sign * levels[:, 0])
+		self.keys[side][:n] = sign * levels[order, 0]
+		self.sizes[side][:n] = levels[order, 1]
+		self.n[side] = n
+		return
+
+	def _update_level(self, side, price, size):
+
+		keys, sizes, n = self.keys[side], self.sizes[side], self.n[side]
+		key = -price if side == 'bids' else price
+		i = np.searchsorted(keys[:n], key)
+		found = i < n and keys[i] == key
+
+		# Remove Level
+		if size == 0:
+			if not found: return
+			keys[i:n - 1] = keys[i + 1:n]
+			sizes[i:n - 1] = sizes[i + 1:n]
+			self.n[side] = n - 1
+
+		# Update Level
+		elif found:
+			sizes[i] = size
+
+		# Insert Level (Dropping Worst if Full)
+		elif i < self.depth:
+			end = min(n, self.depth - 1)
+			keys[i + 1:end + 1] = keys[i:end]
+			sizes[i + 1:end + 1] = sizes[i:end]
+			keys[i] = key
+			sizes[i] = size
+			self.n[side] = end + 1
+
+		return
+
+	def apply_snapshot(self, bids, asks, seq=None, t=None):
+
+		with self.lock:
+			self._load_side('bids', bids)
+			self._load_side('asks', asks)
+			self.seq = seq
+			self.t = t
+			self.synced = seq is None
+			self.stale = False
+			pending, self.pending = self.pending, []
+			self.recent.clear()
+			self.check = None
+
+		# Replay Diffs Buffered While the Snapshot was in Flight; False if One Breaks the Book
+		# (Caller Should Resync from a Fresh Snapshot)
+		ok = all([self.apply_diff(*diff) for diff in pending])
+
+		for listener in self.listeners: listener(self)
+		return ok
+
+	def apply_diff(self, bids, asks, first_seq, last_seq, prev_seq=None, t=None):
+
+		# Returns False on a Sequence Gap (Caller Should Resync from Snapshot)
+		with self.lock:
+
+			# Snapshot Pending
+			if self.seq is None:
+				if len(self.pending) < 1000: self.pending.append((bids, asks, first_seq, last_seq, prev_seq, t))
+				return True
+
+			# A Stale Book Takes No Diffs Until Resynced
+			if self.stale: return False
+
+			if not self.synced:
+				# Already Contained in Snapshot
+				if last_seq < self.seq: return True
+				if first_seq > self.seq and prev_seq != self.seq:
+					self.stale = True
+					return False
+				self.synced = True
+
+			elif prev_seq is not None and prev_seq != self.seq:
+				self.stale = True
+				return False
+
+			for px, sz in bids: self._update_level('bids', float(px), float(sz))
+			for px, sz in asks: self._update_level('asks', float(px), float(sz))
+			self.seq = last_seq
+			self.t = t
+			self.recent.append((first_seq, last_seq, bids, asks))
+
+			# Crossed Book Means Updates were Missed
+			if self.n['bids'] and self.n['asks'] and -self.keys['bids'][0] >= self.keys['asks'][0]:
+				self.stale = True
+				return False
+
+			# Deferred Snapshot Check Once the Stream has Caught Up With It
+			if self.check is not None and self.seq >= self.check[2]:
+				check, self.check = self.check, None
+				if not self._matches(*check):
+					self.stale = True
+					return False
+
+		for listener in self.listeners: listener(self)
+		return True
+
+	def verify(self, bids, asks, seq, levels=5):
+
+		# Compare Top Levels Against a REST Snapshot: Snapshots Behind the Stream are Rolled
+		# Forward with the Recent Diffs, Ones Ahead are Held Until the Stream Reaches Them
+		with self.lock:
+			if self.seq is None or self.stale or seq is None: return True
+			if seq > self.seq:
+				self.check = (bids, asks, seq, levels)
+				return True
+			if not self._matches(bids, asks, seq, levels):
+				self.stale = True
+				return False
+
+		return True
+
+	def _matches(self, bids, asks, seq, levels):
+
+		# Rebuild the Book from the Snapshot plus Every Recent Diff Reaching Past it; Replaying
+		# Diffs Already in the Snapshot is Harmless (Levels Carry Absolute Sizes)
+		diffs = [d for d in self.recent if d[1] >= seq]
+		if seq < self.seq and (not diffs or diffs[0][0] > seq + 1): return True
+
+		ref = OrderBook(self.venue, self.asset, self.depth, history=0)
+		ref._load_side('bids', bids)
+		ref._load_side('asks', asks)
+		for _, _, diff_bids, diff_asks in diffs:
+			for px, sz in diff_bids: ref._update_level('bids', float(px), float(sz))
+			for px, sz in diff_asks: ref._update_level('asks', float(px), float(sz))
+
+		for side in ('bids', 'asks'):
+			k = min(levels, ref.n[side], self.n[side])
+			if ref.n[side] and not self.n[side]: return False
+			if not (np.allclose(ref.keys[side][:k], self.keys[side][:k]) and np.allclose(ref.sizes[side][:k], self.sizes[side][:k])):
+				return False
+
+		return True
+
+	def top(self, levels):
+
+		# Top Levels as Zero-Padded (levels, 2) Price/Size Arrays
+		out = {}
+		with self.lock:
+			for side in ('bids', 'asks'):
+				k = min(levels, self.n[side])
+				arr = np.zeros((levels, 2))
+				arr[:k, 0] = np.abs(self.keys[side][:k])
+				arr[:k, 1] = self.sizes[side][:k]
+				out[side] = arr
+		return out['bids'], out['asks']
+
+	def bbo(self):
+
+		# (bid, bid_qty, ask, ask_qty), None if Either Side Empty or Book Stale
+		with self.lock:
+			if self.stale or not self.n['bids'] or not self.n['asks']: return None
+			return -self.keys['bids'][0], self.sizes['bids'][0], self.keys['asks'][0], self.sizes['asks'][0]
+
+	def mid(self):
+		bbo = self.bbo()
+		if bbo is None: return None
+		return (bbo[0] + bbo[2]) / 2
+
+	def microprice(self):
+
+		# Size-Weighted Mid (Leans Toward the Thinner Side)
+		bbo = self.bbo()
+		if bbo is None: return None
+		bid, bid_qty, ask, ask_qty = bbo
+		return (bid * ask_qty + ask * bid_qty) / (bid_qty + ask_qty)
+
+	def vwap(self, side, qty):
+
+		# Depth-Weighted Price to Take qty from a Side -> (avg_px, fillable_qty)
+		with self.lock:
+			n = self.n[side]
+			if self.stale or not n: return None, 0
+
+			prices = np.abs(self.keys[side][:n])
+			sizes = self.sizes[side][:n]
+			cum = np.cumsum(sizes)
+
+			fillable = min(qty, cum[-1])
+			i = np.searchsorted(cum, fillable)
+			prev = cum[i - 1] if i else 0
+			cost = np.dot(prices[:i], sizes[:i]) + prices[i] * (fillable - prev)
+
+		return cost / fillable if fillable else None, fillable
+
+	def liquidity_within(self, side, bps):
+
+		# Total Size Resting Within bps of the Best Price on a Side
+		with self.lock:
+			n = self.n[side]
+			if self.stale or not n: return 0
+
+			keys = self.keys[side][:n]
+			best = abs(keys[0])
+			limit = -best * (1 - bps / 1e4) if side == 'bids' else best * (1 + bps / 1e4)
+			i = np.searchsorted(keys, limit, side='right')
+			return float(self.sizes[side][:i].sum())
+
+
+class BookManager:
+
+	# Books Keyed by (Venue, Asset), Fed by Client Depth Streams
+
+	def __init__(self, config, assets):
+		self.config = config
+		self.books = {(v, a): OrderBook(v, a, config['book_depth']) for v in ('binance', 'hl') for a in assets}
+
+	def get(self, venue, asset):
+		return self.books.get((venue, asset))
+
+	def add_listener(self, listener):
+
+		# Called with the Book After Every Applied Update
+		for book in self.books.values(): book.listeners.append(listener)
+		return
@@ -1,14 +1,18 @@
 import os
 import copy
-import ccxt
 import json
-import pandas as pd
-import requests as rq
+import threading
 from abc import ABC, abstractmethod
-from binance.um_futures import UMFutures
+
+from live.streams import StreamThread
+from live.metrics import rest_call
 
 class ExchangeClient(ABC):
 
+	# True if get_balances Cash Already Nets Out Position Notional (Equity = Cash + Pos x Px)
+	# False if it is a Wallet Balance (Equity = Cash + Unrealized PnL)
+	cash_nets_notional = False
+
 	@abstractmethod
 	def get_balances(self): pass
 
@@ -24,17 +28,43 @@ class ExchangeClient(ABC):
 	@abstractmethod
 	def cancel_order(self): pass
 
+	@abstractmethod
+	def start_user_stream(self): pass
+
+	@abstractmethod
+	def start_book_stream(self): pass
+
+	@abstractmethod
+	def submit_orders(self): pass
+
+	@abstractmethod
+	def cancel_orders(self): pass
+
+	@abstractmethod
+	def modify_orders(self): pass
+
 
 class HyperliquidClient(ExchangeClient):
-	def __init__(self, config):
+
+	# totalRawUsd Nets Out Position Notional
+	cash_nets_notional = True
+	venue = 'hl'
+
+	def __init__(self, config, markets=None):
 		self.config = copy.deepcopy(config)
 		
 		### Not Supported on HL Testnet **
-		self.config['assets'].remove('XRP')
+		if 'XRP' in self.config['assets']: self.config['assets'].remove('XRP')
 
+		# Credentials of the (Sub-)Account, env_prefix Selects Among Several
+		env = self.config.get('env_prefix', '')
+		self.wallet = os.getenv(env + 'HL_WALLET_ADDRESS')
+
+		# Venue SDKs Load with the Client (Replay / Offline Tools Never Pay for Them)
+		import ccxt
 		self.client = ccxt.hyperliquid({
-			"walletAddress": os.getenv('HL_API_WALLET_ADDRESS'),
-			"privateKey": os.getenv('HL_PRIVATE_KEY'),
+			"walletAddress": os.getenv(env + 'HL_API_WALLET_ADDRESS'),
+			"privateKey": os.getenv(env + 'HL_PRIVATE_KEY'),
 			"enableRateLimit": True,
 			"urls": {"api": {
 				"public": self.config['hl_url'],
@@ -45,18 +75,18 @@ class HyperliquidClient(ExchangeClient):
 		# For Testnet Configuration
 		self.client.setSandboxMode(True)
 
-		# Preload Markets
-		self.client.load_markets()
+		# Preload Markets (or Reuse Markets Another Client Already Loaded)
+		if markets: self.client.set_markets(markets)
+		else: self.client.load_markets()
 
 		# Get Contract Names
 		contract_names = {}
-		symbols = pd.Series(self.client.symbols)		
 		for asset in self.config['assets']:
-			matches = symbols[symbols.str.match(f'{asset}/')]
-			contract_names[asset] = matches.iloc[0]
+			contract_names[asset] = next(s for s in self.client.symbols if s.startswith(f'{asset}/'))
 		
 		self.contract_names = contract_names
 
+	@rest_call
 	def get_balances(self):
 
 		## ISSUE WITH CCXT self.client.fetch_open_orders
@@ -66,10 +96,10 @@ class HyperliquidClient(ExchangeClient):
 		headers = {"Content-Type": "application/json"}
 		payload = {
 			'type': "clearinghouseState",
-			'user': os.getenv('HL_WALLET_ADDRESS')
+			'user': self.wallet
 			}
 
-		r = rq.post(url=endpoint, headers=headers, data=json.dumps(payload))
+		r = self.client.session.post(url=endpoint, headers=headers, data=json.dumps(payload))
 		data = r.json()
 
 		positions = {}
@@ -82,6 +112,7 @@ class HyperliquidClient(ExchangeClient):
 		cash = float(r.json()['marginSummary']['totalRawUsd'])
 		return cash, positions
 
+	@rest_call
 	def get_market_data(self):
 
 		market_data = {}
@@ -95,6 +126,7 @@ class HyperliquidClient(ExchangeClient):
 
 		return market_data
 
+	@rest_call
 	def submit_order(self, order):
 
 		return self.client.createOrder(
@@ -105,6 +137,7 @@ class HyperliquidClient(ExchangeClient):
 				price=order['price']
 				)
 
+	@rest_call
 	def get_open_orders(self):
 
 		## ISSUE WITH CCXT self.client.fetch_open_orders
@@ -114,10 +147,10 @@ class HyperliquidClient(ExchangeClient):
 		headers = {"Content-Type": "application/json"}
 		payload = {
 			'type': "openOrders",
-			'user': os.getenv('HL_WALLET_ADDRESS')
+			'user': self.wallet
 			}
 
-		r = rq.post(url=endpoint, headers=headers, data=json.dumps(payload))
+		r = self.client.session.post(url=endpoint, headers=headers, data=json.dumps(payload))
 		
 		open_orders = {}
 		for order in r.json():
@@ -134,29 +167,163 @@ class HyperliquidClient(ExchangeClient):
 
 		return open_orders
 
+	@rest_call
 	def cancel_order(self, asset, order_id):
 		return self.client.cancelOrder(
 				id=order_id, 
 				symbol=self.contract_names[asset]
 				)
 
+	@rest_call
+	def submit_orders(self, orders):
+
+		# Single Exchange Action for All Orders
+		if not orders: return []
+		r = self.client.create_orders([{
+			'symbol': self.contract_names[order['asset']],
+			'type': order['type'],
+			'side': order['side'],
+			'amount': order['amount'],
+			'price': order['price']
+			} for order in orders])
+
+		return [{'id': o.get('id')} for o in r]
+
+	@rest_call
+	def cancel_orders(self, cancels):
+
+		# cancels: [(asset, order_id), ...]
+		if not cancels: return []
+		return self.client.cancel_orders_for_symbols([
+			{'id': str(oid), 'symbol': self.contract_names[asset]} for asset, oid in cancels
+			])
+
+	@rest_call
+	def modify_orders(self, orders):
+
+		# Native Batch Modify (Keeps Queue Semantics of HL Modify)
+		if not orders: return []
+		r = self.client.edit_orders([{
+			'id': str(order['oid']),
+			'symbol': self.contract_names[order['asset']],
+			'type': order['type'],
+			'side': order['side'],
+			'amount': order['amount'],
+			'price': order['price']
+			} for order in orders])
+
+		return [{'id': o.get('id')} for o in r]
+
+	def start_book_stream(self, books):
+
+		# HL Pushes Full (Top 20) Snapshots, so No Sequencing Needed
+		subscriptions = [
+			{'method': 'subscribe', 'subscription': {'type': 'l2Book', 'coin': asset}}
+			for asset in self.config['assets']
+			]
+
+		def on_message(msg):
+			if msg.get('channel') != 'l2Book': return
+			book = books.get('hl', msg['data']['coin'])
+			if book is None: return
+
+			bids, asks = msg['data']['levels']
+			book.apply_snapshot(
+				[[lvl['px'], lvl['sz']] for lvl in bids],
+				[[lvl['px'], lvl['sz']] for lvl in asks],
+				t=msg['data']['time']
+				)
+			return
+
+		self.book_stream = StreamThread(
+			'hl-book',
+			self.config['hl_ws_url'],
+			on_message,
+			subscriptions=subscriptions,
+			keepalive=lambda ws: ws.send(json.dumps({'method': 'ping'})),
+			strategy=self.config.get('strategy_name', 'main')
+			)
+		self.book_stream.start()
+
+		return
+
+	def start_user_stream(self, handler):
+
+		user = self.wallet
+		subscriptions = [
+			{'method': 'subscribe', 'subscription': {'type': 'orderUpdates', 'user': user}},
+			{'method': 'subscribe', 'subscription': {'type': 'userFills', 'user': user}}
+			]
+
+		def on_message(msg):
+
+			if msg.get('channel') == 'orderUpdates':
+				for update in msg['data']:
+					order = update['order']
+					if order['coin'] not in self.contract_names: continue
+
+					handler.on_order('hl', order['coin'], {
+						'oid': order['oid'],
+						'side': 'buy' if order['side'] == 'B' else 'sell',
+						'price': float(order['limitPx']),
+						'size': float(order['sz']),
+						'status': update['status']
+						})
+
+			elif msg.get('channel') == 'userFills':
+
+				# Initial Snapshot Replays Fills Already Reflected in Positions
+				if msg['data'].get('isSnapshot'): return
+
+				for fill in msg['data']['fills']:
+					if fill['coin'] not in self.contract_names: continue
+
+					handler.on_fill('hl', fill['coin'], {
+						'oid': fill['oid'],
+						'side': 'buy' if fill['side'] == 'B' else 'sell',
+						'price': float(fill['px']),
+						'size': float(fill['sz']),
+						't': fill['time']
+						})
+
+			return
+
+		# HL Drops Connections Idle for 60s
+		self.stream = StreamThread(
+			'hl-user',
+			self.config['hl_ws_url'],
+			on_message,
+			subscriptions=subscriptions,
+			keepalive=lambda ws: ws.send(json.dumps({'method': 'ping'})),
+			strategy=self.config.get('strategy_name', 'main')
+			)
+		self.stream.start()
+
+		return
+
 
 class BinanceClient(ExchangeClient):
+
+	venue = 'binance'
+
 	def __init__(self, config):
 		self.config = copy.deepcopy(config)
 		
 		### Not Supported on HL Testnet **
-		self.config['assets'].remove('XRP')
+		if 'XRP' in self.config['assets']: self.config['assets'].remove('XRP')
 
+		env = self.config.get('env_prefix', '')
+		from binance.um_futures import UMFutures
 		self.client = UMFutures(
-				key=os.getenv('BINANCE_API_KEY'),
-				secret=os.getenv('BINANCE_API_SECRET'),
+				key=os.getenv(env + 'BINANCE_API_KEY'),
+				secret=os.getenv(env + 'BINANCE_API_SECRET'),
 				base_url=self.config['binance_url']
 				)
 
 		# Set Contract Names
 		self.contract_names = {a: f"{a}USDT" for a in config['assets']}
 		
+	@rest_call
 	def get_balances(self):
 
 		account_data = self.client.account()
@@ -171,6 +338,7 @@ class BinanceClient(ExchangeClient):
 
 		return cash, positions
 
+	@rest_call
 	def get_market_data(self):
 
 		market_data = {}
@@ -179,13 +347,19 @@ class BinanceClient(ExchangeClient):
 			market_data[asset] = {
 				'ticker': self.client.book_ticker(symbol=contract),
 				'book': self.client.depth(symbol=contract, limit=10),
-				'funding': self.client.funding_rate(symbol=contract, limit=1) 
+				'funding': self.client.funding_rate(symbol=contract, limit=1),
+				'premium': self.client.mark_price(symbol=contract)
 			}
 
 		return market_data
 
+	@rest_call
 	def submit_order(self, order):
 
+		# Client Order ID Lets Stream Fills be Matched Before the REST Ack
+		params = {}
+		if 'client_id' in order: params['newClientOrderId'] = order['client_id']
+
 		if order['type'] == 'limit':
 			return self.client.new_order(
 				symbol=self.contract_names[order['asset']],
@@ -193,16 +367,19 @@ class BinanceClient(ExchangeClient):
 				side=order['side'].upper(),
 				quantity=order['amount'],
 				price=order['price'],
-				timeInForce="GTC"
+				timeInForce="GTC",
+				**params
 				)
 		elif order['type'] == 'market':
 			return self.client.new_order(
 				symbol=self.contract_names[order['asset']],
 				type=order['type'].upper(),
 				side=order['side'].upper(),
-				quantity=order['amount']
+				quantity=order['amount'],
+				**params
 				)
 
+	@rest_call
 	def get_open_orders(self):
 
 		open_orders = {}
@@ -224,8 +401,169 @@ class BinanceClient(ExchangeClient):
 
 		return open_orders
 
+	@rest_call
 	def cancel_order(self, asset, order_id):
 		return self.client.cancel_order(
 				symbol=self.contract_names[asset],
 				orderId=order_id
 				)
+
+	@rest_call
+	def submit_orders(self, orders):
+
+		# Binance Caps Batch Orders at 5 per Request
+		results = []
+		for i in range(0, len(orders), 5):
+			batch = []
+			for order in orders[i:i + 5]:
+				params = {
+					'symbol': self.contract_names[order['asset']],
+					'type': order['type'].upper(),
+					'side': order['side'].upper(),
+					'quantity': str(order['amount'])
+					}
+				if order['type'] == 'limit':
+					params['price'] = str(order['price'])
+					params['timeInForce'] = 'GTC'
+				if 'client_id' in order: params['newClientOrderId'] = order['client_id']
+				batch.append(params)
+
+			for r in self.client.new_batch_order(batchOrders=batch):
+				results.append({'id': str(r['orderId']) if 'orderId' in r else None})
+
+		return results
+
+	@rest_call
+	def cancel_orders(self, cancels):
+
+		# Grouped per Symbol, Binance Caps Batch Cancels at 10 per Request
+		by_asset = {}
+		for asset, oid in cancels: by_asset.setdefault(asset, []).append(int(oid))
+
+		results = []
+		for asset, oids in by_asset.items():
+			for i in range(0, len(oids), 10):
+				results.extend(self.client.cancel_batch_order(
+					symbol=self.contract_names[asset],
+					orderIdList=oids[i:i + 10],
+					origClientOrderIdList=None
+					))
+
+		return results
+
+	@rest_call
+	def modify_orders(self, orders):
+
+		# PUT /fapi/v1/batchOrders (Not Wrapped by Connector), 5 per Request
+		results = []
+		for i in range(0, len(orders), 5):
+			batch = [{
+				'symbol': self.contract_names[order['asset']],
+				'orderId': int(order['oid']),
+				'side': order['side'].upper(),
+				'quantity': str(order['amount']),
+				'price': str(order['price'])
+				} for order in orders[i:i + 5]]
+
+			for r in self.client.sign_request('PUT', '/fapi/v1/batchOrders', {'batchOrders': batch}, True):
+				results.append({'id': str(r['orderId']) if 'orderId' in r else None})
+
+		return results
+
+	def start_book_stream(self, books):
+
+		# Diff Depth Stream, Resynced from REST Snapshot on Sequence Gaps
+		streams = [f'{self.contract_names[a].lower()}@depth@100ms' for a in self.config['assets']]
+		subscriptions = [{'method': 'SUBSCRIBE', 'params': streams, 'id': 1}]
+		resyncing = set()
+
+		def resync(asset):
+			try:
+				# Retry at Once if a Buffered Diff Breaks the Fresh Snapshot
+				book = books.get('binance', asset)
+				for _ in range(3):
+					book.reset()
+					snap = self.client.depth(symbol=self.contract_names[asset], limit=1000)
+					if book.apply_snapshot(snap['bids'], snap['asks'], seq=snap['lastUpdateId'], t=snap['T']): break
+			finally:
+				resyncing.discard(asset)
+			return
+
+		def on_message(msg):
+			if msg.get('e') != 'depthUpdate': return
+			asset = msg['s'][:-4]
+			book = books.get('binance', asset)
+			if book is None: return
+
+			ok = book.apply_diff(msg['b'], msg['a'], msg['U'], msg['u'], msg['pu'], msg['T'])
+			if (not ok or book.seq is None) and asset not in resyncing:
+				resyncing.add(asset)
+				threading.Thread(target=resync, args=(asset,), daemon=True).start()
+			return
+
+		self.book_stream = StreamThread(
+			'binance-book',
+			self.config['binance_ws_url'],
+			on_message,
+			subscriptions=subscriptions,
+			strategy=self.config.get('strategy_name', 'main')
+			)
+		self.book_stream.start()
+
+		return
+
+	def start_user_stream(self, handler):
+
+		self.listen_key = None
+
+		def listen_url():
+			self.listen_key = self.client.new_listen_key()['listenKey']
+			return f"{self.config['binance_ws_url']}/{self.listen_key}"
+
+		def on_message(msg):
+
+			if msg.get('e') == 'ORDER_TRADE_UPDATE':
+				data = msg['o']
+				asset = data['s'][:-4]
+				if asset not in self.contract_names: return
+
+				if data['x'] == 'TRADE':
+					handler.on_fill('binance', asset, {
+						'oid': data['i'],
+						'cid': data['c'],
+						'side': data['S'].lower(),
+						'price': float(data['L']),
+						'size': float(data['l']),
+						't': msg['T']
+						})
+
+				handler.on_order('binance', asset, {
+					'oid': data['i'],
+					'side': data['S'].lower(),
+					'price': float(data['p']),
+					'size': float(data['q']) - float(data['z']),
+					'status': 'open' if data['X'] in ('NEW', 'PARTIALLY_FILLED') else data['X'].lower()
+					})
+
+			elif msg.get('e') == 'ACCOUNT_UPDATE':
+				for balance in msg['a']['B']:
+					if balance['a'] == 'USDT': handler.on_cash('binance', float(balance['wb']))
+
+			# Reconnect Fetches a Fresh Listen Key
+			elif msg.get('e') == 'listenKeyExpired':
+				self.stream.ws.close()
+
+			return
+
+		# Listen Keys Expire After 60 Minutes Without Renewal
+		self.stream = StreamThread(
+			'binance-user',
+			listen_url,
+			on_message,
+			keepalive=lambda ws: self.client.renew_listen_key(self.listen_key),
+			keepalive_interval=30 * 60,
+			strategy=self.config.get('strategy_name', 'main')
+			)
+		self.stream.start()
+
+		return
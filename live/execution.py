@@ -1,90 +1,124 @@
 import copy
-import json
-import pandas as pd
-
-from strategy.signal import generate_signals
-from strategy.sizing import compute_sizes
+import time
+import uuid
+import numpy as np
+
+from strategy.incremental import SignalEngine
+from strategy.forecast import FundingForecaster
+from live.order_state import OrderState
+from live.hedging import HedgeDispatcher
+from live.book import BookManager
+from live.scheduler import LoopScheduler
+from live.metrics import REGISTRY
 
 class Portfolio:
 
-	def __init__(self, name, config, cash, assets, positions):
+	def __init__(self, name, config, cash, assets, positions, cash_nets_notional=True):
 		self.name = name
 		self.config = config
 		self.cash = cash
 		self.assets = assets
 		self.positions = positions
+		self.cash_nets_notional = cash_nets_notional
 
 
 class Strategy:
-	def __init__(self, config, logger, bn_client, hl_client, risk_mgr):
+	def __init__(self, config, logger, bn_client, hl_client, risk_mgr, recorder=None, books=None):
 		self.config = copy.deepcopy(config)
 		self.logger = logger
 		self.bn_client = bn_client
 		self.hl_client = hl_client
 		self.risk_mgr = risk_mgr
+		self.recorder = recorder
 
 		### Not Supported on HL Testnet **
-		self.config['assets'].remove('XRP')
+		if 'XRP' in self.config['assets']: self.config['assets'].remove('XRP')
 
-		# Get Current Cash and Positions
-		bn_cash, bn_positions = self.bn_client.get_balances()
-		hl_cash, hl_positions = self.hl_client.get_balances()
+		# Assigned Before Any Stream Starts (Stream Fills Reach hedge_exposure)
+		self.market_data = None
+		self.orders = {}
 
-		# Add in Empty Positions
-		for asset in self.config['assets']:
-			if asset not in bn_positions: bn_positions[asset] = {'position': 0, 'cost_basis': 0}
-			if asset not in hl_positions: hl_positions[asset] = {'position': 0, 'cost_basis': 0}
+		# Exported Metric Handles (Looked Up Once)
+		name = self.config.get('strategy_name', 'main')
+		self.metrics = {
+			'submitted': REGISTRY.counter('orders_submitted_total', 'Orders acknowledged by the venue', venue='hl', kind='entry', strategy=name),
+			'rejected': REGISTRY.counter('orders_rejected_total', 'Orders the venue returned no id for', venue='hl', strategy=name),
+			'modified': REGISTRY.counter('orders_modified_total', 'Orders repriced by batch modify', venue='hl', strategy=name),
+			'canceled': {v: REGISTRY.counter('orders_canceled_total', 'Orders canceled', venue=v, strategy=name) for v in ('hl', 'binance')},
+			'errors': {site: REGISTRY.counter('swallowed_errors_total', 'Exceptions caught and not re-raised', site=site, strategy=name)
+				for site in ('cancel_orders', 'create_orders', 'manage_orders')},
+			'residual': {a: REGISTRY.gauge('residual_delta_usd', 'Unhedged notional incl. in-flight hedges', asset=a, strategy=name) for a in self.config['assets']}
+		}
 
-		# Initialize Portfolio Objects
-		self.bn_port = Portfolio('binance', config, bn_cash, self.config['assets'], bn_positions)
-		self.hl_port = Portfolio('hl', config, hl_cash, self.config['assets'], hl_positions)
-		self.logger.info(json.dumps({
+		# Order / Position State Kept Current by User-Data Streams
+		self.order_state = OrderState(self.config, self.config['assets'])
+		self.order_state.fill_handlers.append(self.on_fill)
+		self.order_state.fill_handlers.append(self.risk_mgr.on_fill)
+
+		# Hedges Sent but Not Yet Seen Filled {asset: {client_id: [signed_qty, t_sent]}}
+		self.hedges_inflight = {a: {} for a in self.config['assets']}
+
+		# Binance Hedges Submitted Asynchronously from the Main Loop
+		self.hedger = HedgeDispatcher(self.config, self.logger, self.bn_client, self.build_hedge, self.release_hedge)
+		if self.config['hedge_async']: self.hedger.start()
+
+		# Locally Maintained L2 Books per (Venue, Asset), Possibly Shared and Streamed by a Host
+		self.books = books or BookManager(self.config, self.config['assets'])
+		if self.recorder: self.books.add_listener(self.recorder.record_book)
+		if books is None:
+			self.bn_client.start_book_stream(self.books)
+			self.hl_client.start_book_stream(self.books)
+
+		# Subscribe Before Snapshotting so No Fills are Missed
+		self.bn_client.start_user_stream(self.order_state)
+		self.hl_client.start_user_stream(self.order_state)
+
+		# Get Current Cash, Positions and Open Orders
+		self.reconcile()
+
+		# Initialize Portfolio Objects (Positions Shared with Order State)
+		bn_positions = self.order_state.positions['binance']
+		hl_positions = self.order_state.positions['hl']
+		self.bn_port = Portfolio('binance', config, self.order_state.cash['binance'], self.config['assets'], bn_positions, self.bn_client.cash_nets_notional)
+		self.hl_port = Portfolio('hl', config, self.order_state.cash['hl'], self.config['assets'], hl_positions, self.hl_client.cash_nets_notional)
+		self.logger.info({
 			'event': 'position_snapshot',
 			'bn_cash': self.bn_port.cash,
 			'hl_cash': self.hl_port.cash,
-			'bn_positions': self.bn_port.positions,
-			'hl_positions': self.hl_port.positions
-		}))
+			'bn_positions': {a: dict(p) for a, p in self.bn_port.positions.items()},
+			'hl_positions': {a: dict(p) for a, p in self.hl_port.positions.items()}
+		})
 
-		self.market_data = None
-		self.orders = {}
+		# Incremental Signal / Sizing State
+		self.signal_engine = SignalEngine(self.config, self.config['assets'])
+		self.forecaster = FundingForecaster(self.config, self.config['assets'])
 
 	def cancel_orders(self):
 
-		# Get Open HL Orders and Cancel Them
-		hl_open_orders = self.hl_client.get_open_orders()
-		for asset in hl_open_orders:
-			for order in hl_open_orders[asset]:
-				try: 
-					self.hl_client.cancel_order(asset, order['oid'])
-					self.logger.info(json.dumps({
-						'event': 'order_cancel',
-						'asset': asset,
-						'exch': 'hl',
-						'order_data': order
-					}))
-				except: pass
-
-		# Get Open BN Orders and Cancel Them
-		bn_open_orders = self.bn_client.get_open_orders()
-		for asset in bn_open_orders:
-			for order in bn_open_orders[asset]:
-				try:
-					self.bn_client.cancel_order(asset, order['oid'])
-					self.logger.info(json.dumps({
-						'event': 'order_cancel',
-						'asset': asset,
-						'exch': 'binance',
-						'order_data': order
-					}))
-
-				except:
-					pass
-
-		self.logger.info(json.dumps({
+		# Get Open Orders and Cancel Them (One Batch Request per Venue)
+		for exch, client in (('hl', self.hl_client), ('binance', self.bn_client)):
+
+			open_orders = client.get_open_orders()
+			cancels = [(asset, order['oid']) for asset in open_orders for order in open_orders[asset]]
+
+			try:
+				client.cancel_orders(cancels)
+				self.metrics['canceled'][exch].inc(len(cancels))
+				for asset in open_orders:
+					for order in open_orders[asset]:
+						self.logger.info({
+							'event': 'order_cancel',
+							'asset': asset,
+							'exch': exch,
+							'order_data': order
+						})
+			except Exception:
+				self.metrics['errors']['cancel_orders'].inc()
+
+		self.logger.info({
 			'event': 'live_orders',
-			'order_data': self.orders
-		}))
+			'order_data': dict(self.orders)
+		})
 
 		return
 
@@ -95,56 +129,168 @@ class Strategy:
 			'hl': self.hl_client.get_market_data()
 		}
 
-		self.logger.info(json.dumps({
+		self.logger.info({
 			'event': 'market_data',
 			'binance': self.market_data['binance'],
 			'hl': self.market_data['hl']
-		}))
+		})
+
+		# Capture What the Live System Saw for Replay / Backtests
+		if self.recorder: self.recorder.record_market_data(self.market_data)
+
+		# Check Streamed Books Against REST Snapshots (Resync on Mismatch)
+		for asset in self.config['assets']:
+			rest_book = self.market_data['binance'][asset]['book']
+			book = self.books.get('binance', asset)
+			if not book.verify(rest_book['bids'], rest_book['asks'], rest_book['lastUpdateId']): book.reset()
 
 		return
 
-	def generate_signal_data(self):
+	def hl_bbo(self, asset):
+
+		# Prefer Streamed L2 Book, Fall Back to REST Snapshot
+		bbo = self.books.get('hl', asset).bbo()
+		if bbo is not None: return bbo[0], bbo[2]
+
+		# In Case of Empty Order Book
+		try:
+			bid = self.market_data['hl'][asset]['book']['bids'][0][0]
+			ask = self.market_data['hl'][asset]['book']['asks'][0][0]
+			return bid, ask
+		except:
+			return None, None
+
+	def update_signals(self):
 
 		# HACKY WAY TO MAKE SURE TIMESTAMPS ALIGNED
-		max_t = None
-		for asset in self.config['assets']:
-			t = float(self.market_data['binance'][asset]['ticker']['time'])
-			if not max_t or t > max_t: max_t = t
+		max_t = self.market_time()
+
+		# O(1) Update per Asset, Same Outputs as generate_signals / compute_sizes
+		if self.config['forecast_method'] == 'prev':
+			for asset in self.config['assets']:
+				bn_prev_funding = self.market_data['binance'][asset]['funding'][0]['fundingRate']
+				hl_prev_funding = self.market_data['hl'][asset]['funding'][0]['fundingRate']
+				self.signal_engine.update(asset, max_t, float(hl_prev_funding), float(bn_prev_funding))
+
+		# Online Funding Forecast Drives the Signal Instead
+		else:
+			self.update_forecast(max_t)
+			for asset, spread in zip(self.forecaster.assets, self.forecaster.forecast()):
+				self.signal_engine.update_spread(asset, max_t, spread)
+
+		return self.signal_engine.targets()
+
+	def update_forecast(self, t):
+
+		bn, hl = self.market_data['binance'], self.market_data['hl']
+		assets = self.forecaster.assets
+
+		# Binance Premium = Mid / Index - 1 (as in the Clean Tables)
+		bn_premium, bn_next = [], []
+		for asset in assets:
+			ticker, premium = bn[asset]['ticker'], bn[asset]['premium']
+			mid = (float(ticker['bidPrice']) + float(ticker['askPrice'])) / 2
+			index = float(premium['indexPrice'] or 0)
+			bn_premium.append(mid / index - 1 if index else float('nan'))
+			bn_next.append(int(premium['nextFundingTime']))
+
+		# HL Settles Hourly, Premium from Asset Context
+		hl_premium = [float(hl[a]['ticker']['info'].get('premium') or 'nan') for a in assets]
+		hl_next = (int(t) // 3600000 + 1) * 3600000
+
+		self.forecaster.update('binance', t, bn_premium, [float(bn[a]['funding'][0]['fundingRate']) for a in assets], np.array(bn_next))
+		self.forecaster.update('hl', t, hl_premium, [float(hl[a]['funding'][0]['fundingRate']) for a in assets], hl_next)
+		return
 
-		signal_data = {}
-		for asset in self.config['assets']:		
-			
-			bn_prev_funding = self.market_data['binance'][asset]['funding'][0]['fundingRate']
-			hl_prev_funding = self.market_data['hl'][asset]['funding'][0]['fundingRate']
-				
-			d = {'t': max_t, 
-				'binance_funding_prev': float(bn_prev_funding),
-				'hl_funding_prev': float(hl_prev_funding)}
-			signal_data[asset] = pd.DataFrame([d])
-				
-		return signal_data
+	def reconcile(self):
+
+		# Full REST Snapshot of Both Venues
+		bn_cash, bn_positions = self.bn_client.get_balances()
+		bn_open_orders = self.bn_client.get_open_orders()
+		hl_cash, hl_positions = self.hl_client.get_balances()
+		hl_open_orders = self.hl_client.get_open_orders()
+
+		with self.order_state.lock:
+			self.order_state.reconcile('binance', bn_cash, bn_positions, bn_open_orders)
+			self.order_state.reconcile('hl', hl_cash, hl_positions, hl_open_orders)
+
+			# Drop Hedges Whose Fills Never Arrived on the Stream
+			now = time.time()
+			for asset in self.hedges_inflight:
+				for cid in list(self.hedges_inflight[asset]):
+					if now - self.hedges_inflight[asset][cid][1] > self.config['hedge_timeout']:
+						del self.hedges_inflight[asset][cid]
+
+		return
 
 	def refresh_positions(self):
 
-		# Update Binance Positions
-		bn_cash, bn_positions = self.bn_client.get_balances()
-		self.bn_port.cash = bn_cash
-		for asset in bn_positions:
-			self.bn_port.positions[asset] = bn_positions[asset]
+		# Streams Keep Positions Current, Only Reconcile over REST Periodically
+		if self.order_state.reconcile_due():
+			self.reconcile()
+			with self.order_state.lock: self.risk_mgr.sync(self.bn_port, self.hl_port)
+
+		with self.order_state.lock:
+			self.bn_port.cash = self.order_state.cash['binance']
+			self.hl_port.cash = self.order_state.cash['hl']
+
+			# Feed Streaming Risk Trackers (Same Prices / Depth the Risk Checks See)
+			if self.market_data:
+				view = self.risk_mgr.view(self.market_data)
+				trackers = self.risk_mgr.trackers
+				equity = self.equity(view['px'])
+				trackers.update(self.market_time(), equity, view['px'][1], view['liquidity'])
+
+			self.logger.info({
+				'event': 'position_snapshot',
+				'bn_cash': self.bn_port.cash,
+				'hl_cash': self.hl_port.cash,
+				'bn_positions': {a: dict(p) for a, p in self.bn_port.positions.items()},
+				'hl_positions': {a: dict(p) for a, p in self.hl_port.positions.items()},
+				'risk': self.risk_mgr.trackers.snapshot()
+			})
 
-		# Update Hyperliquid Positions
-		hl_cash, hl_positions = self.hl_client.get_balances()
-		self.hl_port.cash = hl_cash
-		for asset in hl_positions:
-			self.hl_port.positions[asset] = hl_positions[asset]
+		return
 
-		self.logger.info(json.dumps({
-			'event': 'position_snapshot',
-			'bn_cash': self.bn_port.cash,
-			'hl_cash': self.hl_port.cash,
-			'bn_positions': self.bn_port.positions,
-			'hl_positions': self.hl_port.positions
-		}))
+	def equity(self, px):
+
+		# px Rows (Binance, HL) Ordered as risk_mgr.assets
+		equity = 0
+		for v, (port, client) in enumerate(((self.bn_port, self.bn_client), (self.hl_port, self.hl_client))):
+			equity += port.cash
+			for asset, pos in port.positions.items():
+				if asset not in self.risk_mgr.index: continue
+				mark = px[v, self.risk_mgr.index[asset]]
+				basis = 0 if client.cash_nets_notional else pos['cost_basis']
+				equity += pos['position'] * (mark - basis)
+		return equity
+
+	def market_time(self):
+
+		# Latest Binance Ticker Time (ms), Follows the Virtual Clock in Replays
+		return max(float(self.market_data['binance'][a]['ticker']['time']) for a in self.config['assets'])
+
+	def on_fill(self, exch, asset, fill):
+
+		# Called from Stream Threads with Order State Lock Held
+
+		# Hedge Fill Confirmed
+		if exch == 'binance':
+			hedge = self.hedges_inflight[asset].get(fill.get('cid'))
+			if hedge is None: return
+
+			hedge[0] -= fill['size'] if fill['side'] == 'buy' else -fill['size']
+			if abs(hedge[0]) < 1e-9: del self.hedges_inflight[asset][fill['cid']]
+
+		# Maker Fill -> Queue Hedge Immediately
+		elif exch == 'hl':
+			self.logger.info({
+				'event': 'order_fill',
+				'asset': asset,
+				'exch': 'hl',
+				'fill_data': fill
+			})
+			self.hedge_exposure([asset], time.perf_counter())
 
 		return
 
@@ -154,10 +300,8 @@ class Strategy:
 		# +1 -> Sell Hyperliquid, Buy Binance
 		# -1 -> Buy Hyperliquid, Sell Binance
 
-		self.refresh_positions()
-
 		intents = []
-		for asset, tgt in target_sizes.iloc[0].items():
+		for asset, tgt in target_sizes.items():
 
 			bn_pos = self.bn_port.positions[asset]['position']
 			bn_ticker_data = self.market_data['binance'][asset]['ticker']
@@ -172,27 +316,31 @@ class Strategy:
 			tgt_delta = tgt - bn_ntl
 			tgt_delta_units = tgt_delta / bn_mid
 
-			# Caping Size based on Top of Hedge Order Book
-			hedgeable_qty = float(bn_ticker_data['askQty']) if tgt > 0 else float(bn_ticker_data['bidQty'])
+			# Caping Size based on Hedge Book Depth (Top of Book if Stream Unavailable)
+			book = self.books.get('binance', asset)
+			hedgeable_qty = book.liquidity_within('asks' if tgt_delta > 0 else 'bids', self.config['hedge_depth_bps'])
+			if not hedgeable_qty:
+				hedgeable_qty = float(bn_ticker_data['askQty']) if tgt_delta > 0 else float(bn_ticker_data['bidQty'])
 			trade_size = min(abs(tgt_delta_units), hedgeable_qty)
 
 			# No Hedge Liquidity
 			if trade_size == 0: continue
 
-			side = 'sell' if tgt > 0 else 'buy'
+			side = 'sell' if tgt_delta > 0 else 'buy'
 			intents.append([asset, side, trade_size])
-			self.logger.info(json.dumps({
+			self.logger.info({
 				'event': 'order_intent',
 				'asset': asset,
 				'side': side,
 				'trade_size': trade_size
-			}))
+			})
 		
 		return intents
 
 	def create_orders(self, intents):
 
 		# Send out Non-Hedge Orders
+		orders = []
 		for intent in intents:
 
 			# Skip if actively working an order
@@ -202,91 +350,124 @@ class Strategy:
 			hl_ticker_data = self.market_data['hl'][intent[0]]['ticker']
 			hl_px = hl_ticker_data['last']
 
-			# In Case of Empty Order Book
-			try:
-				bid = self.market_data['hl'][intent[0]]['book']['bids'][0][0]
-				ask = self.market_data['hl'][intent[0]]['book']['asks'][0][0]			
-				hl_px = (bid + ask) / 2
-			except: pass			
+			bid, ask = self.hl_bbo(intent[0])
+			if bid is not None: hl_px = (bid + ask) / 2
 
-			order = {
+			orders.append({
 				'asset': intent[0],
 				'type': 'limit',
 				'side': intent[1],
 				'amount': intent[2],
 				'price': hl_px,
-			}
-
-			try:
-				r = self.hl_client.submit_order(order)
-				if intent[0] not in self.orders: self.orders[intent[0]] = {}
-				self.orders[intent[0]]['hl'] = {r['id']: order}
-				self.logger.info(json.dumps({
+			})
+
+		# Single Batch Request for All Assets
+		try:
+			results = self.hl_client.submit_orders(orders)
+			for order, r in zip(orders, results):
+				if r['id'] is None:
+					self.metrics['rejected'].inc()
+					continue
+
+				self.metrics['submitted'].inc()
+				self.orders[order['asset']] = {'hl': {r['id']: order}}
+				self.track_order(order['asset'], r['id'], order)
+				self.logger.info({
 					'event': 'order_submit',
-					'asset': asset,
+					'asset': order['asset'],
 					'exch': 'hl',
 					'order_data': order
-				}))
+				})
 
-			except:
-				pass
+		except Exception:
+			self.metrics['errors']['create_orders'].inc()
 
-		self.logger.info(json.dumps({
+		self.logger.info({
 			'event': 'live_orders',
-			'order_data': self.orders
-		}))
+			'order_data': dict(self.orders)
+		})
 
 		return
 
 
 
-	def hedge_exposure(self):
+	def track_order(self, asset, oid, order):
 
-		# Calculate Net Delta
-		deltas = {}
-		for asset in self.config['assets']:
-			bn_pos = self.bn_port.positions[asset]['position']
-			hl_pos = self.hl_port.positions[asset]['position']
-			residual = bn_pos + hl_pos
+		# Register Ack'd Order Until its Stream Update Arrives
+		self.order_state.on_order('hl', asset, {
+			'oid': int(oid),
+			'side': order['side'],
+			'price': order['price'],
+			'size': order['amount'],
+			'status': 'open'
+			})
 
-			bn_ticker_data = self.market_data['binance'][asset]['ticker']
-			bn_mid = (float(bn_ticker_data['bidPrice']) + float(bn_ticker_data['askPrice'])) / 2
-			residual_ntl = residual * bn_mid
+		return
 
-			if abs(residual_ntl) > self.config['hedge_threshold']:
-				# HACKY - Should store/query precision 
-				deltas[asset] = round(residual, 2)
+	def residual(self, asset):
 
-		# Send Hedge Orders
-		for asset in deltas:
-			
-			side = 'buy' if deltas[asset] < 0 else 'sell'
+		# Net Delta Including Hedges Sent but Not Yet Filled
+		bn_pos = self.bn_port.positions[asset]['position']
+		hl_pos = self.hl_port.positions[asset]['position']
+		inflight = sum(h[0] for h in self.hedges_inflight[asset].values())
+		residual = bn_pos + hl_pos + inflight
+
+		bn_ticker_data = self.market_data['binance'][asset]['ticker']
+		bn_mid = (float(bn_ticker_data['bidPrice']) + float(bn_ticker_data['askPrice'])) / 2
+		residual_ntl = residual * bn_mid
+		self.metrics['residual'][asset].set(residual_ntl)
+
+		if abs(residual_ntl) <= self.config['hedge_threshold']: return 0
+
+		# HACKY - Should store/query precision 
+		return round(residual, 2)
+
+	def build_hedge(self, asset):
+
+		# Called by Hedge Dispatcher Right Before Submitting
+		with self.order_state.lock:
+			delta = self.residual(asset)
+			if not delta: return None
+
+			side = 'buy' if delta < 0 else 'sell'
 			order = {
 				'asset': asset,
 				'type': 'market',
 				'side': side,
-				'amount': abs(deltas[asset]),
+				'amount': abs(delta),
+				'client_id': f'hedge_{uuid.uuid4().hex[:24]}'
 			}
 
-			# Assuming Guaranteed Exection of Taker Hedge
-			try:
-				self.bn_client.submit_order(order)
-				self.logger.info(json.dumps({
-					'event': 'execute_hedge',
-					'asset': asset,
-					'exch': 'binance',
-					'order_data': order
-				}))
+			# Register Before Sending so a Fast Stream Fill Can't Be Double Counted
+			self.hedges_inflight[asset][order['client_id']] = [-delta, time.time()]
+
+		return order
+
+	def release_hedge(self, order):
+
+		# Hedge Rejected -> Stop Counting it as In-Flight
+		with self.order_state.lock:
+			self.hedges_inflight[order['asset']].pop(order['client_id'], None)
+		return
+
+	def hedge_exposure(self, assets=None, t_detect=None):
+
+		# No Prices to Size Against Yet
+		if self.market_data is None: return
 
-			except:
-				pass
+		# Hand Residuals to Dispatcher (Assuming Guaranteed Exection of Taker Hedge)
+		with self.order_state.lock:
+			for asset in assets or self.config['assets']:
+				if self.residual(asset): self.hedger.dispatch(asset, t_detect)
 
 		return
 
 	def manage_orders(self):	
 
-		hl_open_orders = self.hl_client.get_open_orders()
+		# Open Orders Maintained by User-Data Stream (No REST Poll)
+		hl_open_orders = self.order_state.get_open_orders('hl')
 
+		reprices = []
 		for asset in self.config['assets']:
 			# Previously Sent Live Order
 			if asset in self.orders:
@@ -309,69 +490,77 @@ class Strategy:
 					hl_ticker_data = self.market_data['hl'][asset]['ticker']
 					px = hl_ticker_data['last']
 
-					# In Case of Empty Order Book
-					try:
-						bid = self.market_data['hl'][asset]['book']['bids'][0][0]
-						ask = self.market_data['hl'][asset]['book']['asks'][0][0]			
-						px = (bid + ask) / 2
-					except: pass	
+					# No Book to Reprice Against
+					bid, ask = self.hl_bbo(asset)
+					if bid is None: continue
+					px = (bid + ask) / 2
 
 					# Check if outside of BBO
 					A = side == 'sell' and price > ask
 					B = side == 'buy' and price < bid
 					if A or B:
-						
-						# Cancel Previous Order
-						self.hl_client.cancel_order(asset, oid)
-						self.orders[asset] = {}
-						self.logger.info(json.dumps({
-							'event': 'order_cancel',
+						order = {
 							'asset': asset,
-							'exch': 'hl',
-							'order_data': asset_order
-						}))
-
-						try:
-
-							order = {
-								'asset': asset,
-								'type': 'limit',
-								'side': side,
-								'amount': size,
-								'price': px,
-							}
-						
-							# Submit Order with Updated Price
-							r = self.hl_client.submit_order(order)
-							self.orders[asset]['hl'] = {r['id']: order}
-							self.logger.info(json.dumps({
-								'event': 'order_submit',
-								'asset': asset,
-								'exch': 'hl',
-								'order_data': order
-							}))
-
-						except:
-							pass
-
-		self.logger.info(json.dumps({
+							'type': 'limit',
+							'side': side,
+							'amount': size,
+							'price': px,
+						}
+						reprices.append([asset_order, order])
+
+		# Reprice All Stale Orders in One Batch Modify
+		try:
+			results = self.hl_client.modify_orders([{**order, 'oid': prev['oid']} for prev, order in reprices])
+			for (prev, order), r in zip(reprices, results):
+				if r['id'] is None:
+					self.metrics['rejected'].inc()
+					continue
+
+				self.metrics['modified'].inc()
+				asset = order['asset']
+				if int(r['id']) != prev['oid']:
+					self.order_state.on_order('hl', asset, {**prev, 'status': 'canceled'})
+				self.orders[asset] = {'hl': {r['id']: order}}
+				self.track_order(asset, r['id'], order)
+				self.logger.info({
+					'event': 'order_modify',
+					'asset': asset,
+					'exch': 'hl',
+					'prev_order_data': prev,
+					'order_data': order
+				})
+
+		except Exception:
+			self.metrics['errors']['manage_orders'].inc()
+
+		self.logger.info({
 			'event': 'live_orders',
-			'order_data': self.orders
-		}))
+			'order_data': dict(self.orders)
+		})
 		
 		return
 
 	def perform_checks(self, intents):
 
-		return self.risk_mgr.perform_checks(self.market_data, intents, self.bn_port, self.hl_port)
+		# Risk Position Cache is Moved by Stream Fills, Check Against a Consistent View
+		with self.order_state.lock:
+			return self.risk_mgr.perform_checks(self.market_data, intents, self.bn_port, self.hl_port)
 
 	def excess_risk(self):
 
-		return self.risk_mgr.excess_risk(self.market_data, self.bn_port, self.hl_port)
+		with self.order_state.lock:
+			return self.risk_mgr.excess_risk(self.market_data, self.bn_port, self.hl_port)
 
 
 	
-def execution_loop(strategy, config):
+def execution_loop(strategy, config, scheduler=None):
+	build_loop(strategy, config, scheduler).run()
+	return
+
+
+def build_loop(strategy, config, scheduler=None):
+
+	# Start-Up Actions, then Loop Stages Registered on a Scheduler (Run by the Caller)
 
 	# Cancel Any Live Orders from Previous Session
 	strategy.cancel_orders()
@@ -382,41 +571,64 @@ def execution_loop(strategy, config):
 	# Ensure Delta Neutrality at Initiation
 	strategy.hedge_exposure()
 
-	while True:
+	# Stages Run on Their Own Cadences Within Venue Rate Budgets
+	scheduler = scheduler or LoopScheduler(config, strategy.logger)
+	state = {'target_sizes': None}
+
+	def market_data():
 
 		# Pull Live Market Data
 		strategy.get_market_data()
 
-		# Extract Signal Data
-		signal_data = strategy.generate_signal_data()
+		# Mids Drive the Scheduler's Volatility Estimate
+		mids = {}
+		for asset in strategy.config['assets']:
+			bid, ask = strategy.hl_bbo(asset)
+			if bid and ask: mids[asset] = (bid + ask) / 2
+		scheduler.observe(mids)
+		return
 
-		# Generate Signals
-		signals = generate_signals(signal_data, config)
-		
-		# Compute Position Sizes
-		target_sizes = compute_sizes(signals, config)
+	def signal():
+
+		# Generate Signals and Compute Position Sizes (Logged for Backtest Reconciliation)
+		state['target_sizes'] = strategy.update_signals()
+		strategy.logger.info({'event': 'target_sizes', 'targets': state['target_sizes']})
+		return
+
+	def orders():
+
+		if state['target_sizes'] is None: return
 
 		# Determine Intended Trades
-		intents = strategy.get_trade_intents(target_sizes)
+		intents = strategy.get_trade_intents(state['target_sizes'])
 
 		# Assess Intents Against Portfolio
 		trades = strategy.perform_checks(intents)
 
 		# Create Maker Orders on HL
 		strategy.create_orders(trades)
+		return
 
-		# Update Positions
-		strategy.refresh_positions()
-
-		# Hedge Any Fills
-		strategy.hedge_exposure()
+	def risk():
 
 		# Determine if Any Risk Mitigation Necessary, if so Execute Orders
 		er_trades = strategy.excess_risk()
 		if er_trades: strategy.create_orders(er_trades)
+		return
 
-		# Manage Open Orders
-		strategy.manage_orders()
+	scheduler.add('market_data', market_data)
+	scheduler.add('signal', signal)
+	scheduler.add('orders', orders)
 
+	# Update Positions
+	scheduler.add('positions', strategy.refresh_positions)
 
-	return
+	# Sweep Residual Delta (Fills are Also Hedged as They Arrive)
+	scheduler.add('hedge', strategy.hedge_exposure)
+
+	scheduler.add('risk', risk)
+
+	# Manage Open Orders
+	scheduler.add('manage', strategy.manage_orders)
+
+	return scheduler
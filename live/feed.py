@@ -0,0 +1,170 @@
+import os
+import time
+import numpy as np
+
+from live.shm import SharedSnapshot, PID
+from live.scheduler import TokenBucket
+
+
+def pack(venue, market_data, records, index, levels):
+
+	# Venue REST Payloads (get_market_data Shapes) -> Fixed-Layout Records
+	for asset, data in market_data.items():
+		if asset not in index: continue
+		r = records[index[asset]]
+		ticker, book, funding = data['ticker'], data['book'], data['funding']
+
+		if venue == 'binance':
+			r['t'] = float(ticker['time'])
+			r['bid'], r['bid_qty'] = float(ticker['bidPrice']), float(ticker['bidQty'])
+			r['ask'], r['ask_qty'] = float(ticker['askPrice']), float(ticker['askQty'])
+			r['last'] = (r['bid'] + r['ask']) / 2
+			r['book_id'] = float(book['lastUpdateId'])
+			premium = data.get('premium')
+			if premium:
+				r['index_price'] = float(premium['indexPrice'] or 0)
+				r['next_funding_t'] = float(premium['nextFundingTime'])
+			if funding:
+				r['funding_rate'] = float(funding[0]['fundingRate'])
+				r['funding_t'] = float(funding[0]['fundingTime'])
+
+		else:
+			r['t'] = float(ticker['timestamp'])
+			r['last'] = float(ticker['last'])
+			r['bid'] = np.nan if ticker.get('bid') is None else float(ticker['bid'])
+			r['ask'] = np.nan if ticker.get('ask') is None else float(ticker['ask'])
+			r['bid_qty'] = float(book['bids'][0][1]) if book['bids'] else np.nan
+			r['ask_qty'] = float(book['asks'][0][1]) if book['asks'] else np.nan
+			r['book_t'] = float(book.get('timestamp') or 0)
+			premium = (ticker.get('info') or {}).get('premium')
+			r['premium'] = np.nan if premium is None else float(premium)
+			if funding:
+				r['funding_rate'] = float(funding[0]['fundingRate'])
+				r['funding_t'] = float(funding[0]['timestamp'])
+
+		bids, asks = book['bids'][:levels], book['asks'][:levels]
+		r['n_bids'], r['n_asks'] = len(bids), len(asks)
+		if bids: r['bids'][:len(bids)] = np.array(bids, dtype=float)
+		if asks: r['asks'][:len(asks)] = np.array(asks, dtype=float)
+		r['valid'] = 1
+
+	return
+
+
+def unpack(venue, records, assets):
+
+	# Fixed-Layout Records -> Same Payload Shapes the Clients Return
+	market_data = {}
+	for asset, r in zip(assets, records.tolist()):
+		(valid, t, bid, bid_qty, ask, ask_qty, last, book_id, book_t, n_bids, n_asks,
+			funding_rate, funding_t, index_price, next_funding_t, premium, bids, asks) = r
+		if not valid: continue
+		bids, asks = [list(l) for l in bids[:n_bids]], [list(l) for l in asks[:n_asks]]
+		funding = [] if np.isnan(funding_rate) else [{'fundingRate': funding_rate}]
+
+		if venue == 'binance':
+			if funding: funding[0]['fundingTime'] = to_int(funding_t)
+			market_data[asset] = {
+				'ticker': {'bidPrice': str(bid), 'bidQty': str(bid_qty), 'askPrice': str(ask), 'askQty': str(ask_qty), 'time': to_int(t)},
+				'book': {'lastUpdateId': to_int(book_id), 'bids': [[str(p), str(q)] for p, q in bids], 'asks': [[str(p), str(q)] for p, q in asks]},
+				'funding': funding,
+				'premium': {'indexPrice': str(0 if np.isnan(index_price) else index_price), 'nextFundingTime': to_int(next_funding_t)}
+			}
+		else:
+			if funding: funding[0]['timestamp'] = to_int(funding_t)
+			market_data[asset] = {
+				'ticker': {'last': last, 'bid': None if np.isnan(bid) else bid, 'ask': None if np.isnan(ask) else ask, 'timestamp': to_int(t),
+					'info': {'premium': None if np.isnan(premium) else str(premium)}},
+				'book': {'bids': bids, 'asks': asks, 'timestamp': to_int(book_t)},
+				'funding': funding
+			}
+
+	return market_data
+
+
+def to_int(x):
+	return 0 if np.isnan(x) else int(x)
+
+
+def run_feed(venue, config, shm_name, factory, factory_args):
+
+	# Venue Market-Data Process: Poll REST on feed_interval_s, Publish to Shared Memory
+	# Requests are Paced by the Same Token Bucket / Weights the Loop Scheduler Uses
+	snapshot = SharedSnapshot(shm_name, config['assets'], config['feed_book_levels'])
+	snapshot.header[PID] = os.getpid()
+	client = factory(venue, config, *factory_args)
+
+	limit = config['rate_limits'][venue]
+	bucket = TokenBucket(limit['capacity'], limit['window'])
+	weight = (config['stage_weights'].get('market_data') or {}).get(venue, 0)
+	interval = config['feed_interval_s'][venue]
+
+	while True:
+		t0 = time.time()
+		time.sleep(bucket.wait_time(weight))
+		bucket.take(weight)
+		try:
+			market_data = client.get_market_data()
+			snapshot.write(lambda records: pack(venue, market_data, records, snapshot.index, snapshot.levels))
+		# Failed Polls Count as Errors but Leave the Heartbeat Alone, so a Feed that
+		# Keeps Failing Goes Stale and is Restarted by the Supervisor
+		except Exception:
+			snapshot.error()
+		time.sleep(max(interval - (time.time() - t0), 0))
+
+
+def make_client(venue, config):
+
+	# Default Factory: Real Venue Clients (Built Inside the Feed Process)
+	from live.clients import BinanceClient, HyperliquidClient
+	return BinanceClient(config) if venue == 'binance' else HyperliquidClient(config)
+
+
+class FeedClient:
+
+	# Execution-Side Client: Market Data Comes from the Venue's Feed Process,
+	# Everything Else (Orders, Balances, Streams) Goes to the Wrapped Client
+	# A Snapshot Older than max_age_s Raises, as a Failed REST Poll Would, Rather than
+	# Letting the Loop Quote and Hedge on Frozen Prices
+
+	def __init__(self, client, snapshot, venue, max_age_s):
+		self.client = client
+		self.snapshot = snapshot
+		self.venue = venue
+		self.max_age_ms = max_age_s * 1000
+
+	def __getattr__(self, name):
+		return getattr(self.client, name)
+
+	def get_market_data(self):
+
+		age = self.snapshot.age_ms()
+		if age > self.max_age_ms: raise TimeoutError(f'{self.venue} market data feed stale ({age} ms)')
+
+		# Decode Straight from the Shared View; Retry if the Writer Lapped Us
+		while True:
+			records, token = self.snapshot.view()
+			market_data = unpack(self.venue, records, self.snapshot.assets)
+			if self.snapshot.stable(token): return market_data
+
+
+def start_feeds(config, supervisor, factory=make_client, factory_args=()):
+
+	# One Shared Segment + Supervised Feed Process per Venue -> {venue: SharedSnapshot}
+	snapshots = {}
+	for venue in ('binance', 'hl'):
+		name = f"{config['feed_shm_prefix']}_{venue}_{os.getpid()}"
+		snapshots[venue] = SharedSnapshot(name, config['assets'], config['feed_book_levels'], create=True)
+		supervisor.add(f'feed_{venue}', run_feed, (venue, config, name, factory, factory_args), snapshots[venue])
+
+	return snapshots
+
+
+def wait_ready(snapshots, timeout):
+
+	# Block Until Every Feed has Published Once (Loop Stages Expect Every Asset Present)
+	deadline = time.time() + timeout
+	while any(s.stats()['writes'] == 0 for s in snapshots.values()):
+		if time.time() > deadline: raise TimeoutError('market data feeds not publishing')
+		time.sleep(0.05)
+	return
@@ -0,0 +1,144 @@
+import time
+import queue
+import threading
+import traceback
+from concurrent.futures import ThreadPoolExecutor
+
+from live.metrics import REGISTRY, LATENCY_BUCKETS
+
+
+class HedgeDispatcher(threading.Thread):
+
+	# Submits Binance Hedges Off the Main Loop
+	# One Hedge in Flight per Asset, Different Assets Hedged in Parallel
+	# Events for a Busy Asset are Coalesced and Re-Run Once its Hedge is Ack'd
+
+	def __init__(self, config, logger, bn_client, build_hedge, release_hedge):
+		super().__init__(name='hedge-dispatcher', daemon=True)
+		self.config = config
+		self.logger = logger
+		self.bn_client = bn_client
+		self.build_hedge = build_hedge
+		self.release_hedge = release_hedge
+
+		self.events = queue.Queue()
+		self.pool = ThreadPoolExecutor(max_workers=len(config['assets']), thread_name_prefix='hedge')
+		self.lock = threading.Lock()
+		self.busy = set()
+		self.pending = {}
+
+		# Fill-Detect -> Hedge-Submit -> Hedge-Ack Latency (ms), Exported via the Registry
+		# SLO Breaches are Counted Exactly Only if the SLO is a Bucket Bound
+		if config['hedge_latency_slo_ms'] not in LATENCY_BUCKETS:
+			raise ValueError(f"hedge_latency_slo_ms must be one of {LATENCY_BUCKETS}, got {config['hedge_latency_slo_ms']}")
+		name = config.get('strategy_name', 'main')
+		self.latency = {a: {leg: REGISTRY.histogram('hedge_latency_ms', 'Hedge latency by leg (ms)', asset=a, leg=leg, strategy=name)
+			for leg in ('detect_to_submit', 'submit_to_ack', 'detect_to_ack')} for a in config['assets']}
+		self.submitted = REGISTRY.counter('orders_submitted_total', 'Orders acknowledged by the venue', venue='binance', kind='hedge', strategy=name)
+		self.failed = REGISTRY.counter('swallowed_errors_total', 'Exceptions caught and not re-raised', site='hedge', strategy=name)
+		self.last_report = time.time()
+
+	def dispatch(self, asset, t_detect=None):
+
+		t_detect = t_detect or time.perf_counter()
+
+		# Inline Mode (hedge_async: false) for Deterministic Replays
+		if not self.config['hedge_async']:
+			with self.lock:
+				if asset in self.busy:
+					self.pending.setdefault(asset, t_detect)
+					return
+				self.busy.add(asset)
+			self._hedge(asset, t_detect)
+			self.maybe_report()
+			return
+
+		# Non-Blocking, Safe to Call from Stream Threads
+		self.events.put((asset, t_detect))
+		return
+
+	def run(self):
+
+		while True:
+
+			try: asset, t_detect = self.events.get(timeout=1)
+			except queue.Empty: asset = None
+
+			if asset is not None:
+				with self.lock:
+					# Keep Earliest Detect Time so Latency Covers the Whole Wait
+					if asset in self.busy:
+						self.pending.setdefault(asset, t_detect)
+						continue
+					self.busy.add(asset)
+				self.pool.submit(self._hedge, asset, t_detect)
+
+			self.maybe_report()
+
+	def _hedge(self, asset, t_detect):
+
+		order = None
+		try:
+			order = self.build_hedge(asset)
+			if order:
+				t_submit = time.perf_counter()
+				self.bn_client.submit_order(order)
+				t_ack = time.perf_counter()
+				self.submitted.inc()
+
+				hist = self.latency[asset]
+				hist['detect_to_submit'].observe((t_submit - t_detect) * 1000)
+				hist['submit_to_ack'].observe((t_ack - t_submit) * 1000)
+				hist['detect_to_ack'].observe((t_ack - t_detect) * 1000)
+
+				self.logger.info({
+					'event': 'execute_hedge',
+					'asset': asset,
+					'exch': 'binance',
+					'order_data': order,
+					'latency_ms': round((t_ack - t_detect) * 1000, 3)
+				})
+
+		except Exception as e:
+			self.failed.inc()
+			self.logger.error({
+				'event': 'hedge_error',
+				'asset': asset,
+				'exch': 'binance',
+				'order_data': order,
+				'error': repr(e),
+				'traceback': traceback.format_exc()
+			})
+			if order: self.release_hedge(order)
+
+		finally:
+			with self.lock:
+				self.busy.discard(asset)
+				t_pending = self.pending.pop(asset, None)
+			if t_pending is not None: self.dispatch(asset, t_pending)
+
+		return
+
+	def maybe_report(self):
+
+		# Periodically Publish Histograms (Dispatcher Thread, or the Caller When Inline)
+		if time.time() - self.last_report >= self.config['latency_report_interval']:
+			self.report_latency()
+		return
+
+	def report_latency(self):
+
+		slo = self.config['hedge_latency_slo_ms']
+		snapshot = {}
+		for asset, hists in self.latency.items():
+			snapshot[asset] = {k: h.snapshot() for k, h in hists.items()}
+			snapshot[asset]['slo_breaches'] = hists['detect_to_ack'].count_above(slo)
+
+		self.logger.info({
+			'event': 'hedge_latency',
+			'slo_ms': slo,
+			'latency': snapshot
+		})
+		self.last_report = time.time()
+
+		return snapshot
@@ -0,0 +1,212 @@
+import copy
+import time
+import threading
+import requests
+
+from live.book import BookManager
+from live.clients import BinanceClient, HyperliquidClient
+from live.execution import Strategy, build_loop
+from live.scheduler import LoopScheduler, TokenBucket
+from risk.manager import RiskManager
+
+VENUES = ('binance', 'hl')
+
+
+def strategy_config(config, spec, n):
+
+	# Host Config + One host_strategies Entry -> That Strategy's Config
+	# Rate Budgets: the Venue Limit Less the Shared Feed's Reserve, Split Evenly
+	# (Unless the Entry Sets Its Own rate_limits)
+	cfg = copy.deepcopy(config)
+	cfg.update(copy.deepcopy(spec.get('overrides') or {}))
+	cfg['strategy_name'] = spec['name']
+	cfg['env_prefix'] = spec.get('env_prefix') or ''
+
+	if not (spec.get('overrides') or {}).get('rate_limits'):
+		cfg['rate_limits'] = {}
+		for venue, limit in config['rate_limits'].items():
+			cfg['rate_limits'][venue] = {'capacity': (limit['capacity'] - feed_capacity(config, venue)) / n, 'window': limit['window']}
+
+	# The Host Feed Pays for Market Data
+	cfg['stage_weights'] = copy.deepcopy(cfg['stage_weights'])
+	cfg['stage_weights']['market_data'] = {}
+	return cfg
+
+
+def feed_capacity(config, venue):
+
+	# What the Feed Needs at feed_interval_s, Capped at host_feed_share of the Venue Limit
+	limit = config['rate_limits'][venue]
+	weight = (config['stage_weights'].get('market_data') or {}).get(venue, 0)
+	need = weight * limit['window'] / config['feed_interval_s'][venue]
+	return min(need, limit['capacity'] * config['host_feed_share'])
+
+
+class MarketDataHub:
+
+	# One Market-Data Poll per Venue per feed_interval_s, Served to Every Hosted Strategy
+	# Polls Draw on the Feed's Reserve of Each Venue Budget; When it is Exhausted the Last Data is Served
+
+	def __init__(self, config, clients, clock=time.time, recorder=None):
+		self.clients = clients
+		self.clock = clock
+		self.recorder = recorder
+		self.interval = config['feed_interval_s']
+		self.weights = config['stage_weights'].get('market_data') or {}
+		self.buckets = {v: TokenBucket(max(feed_capacity(config, v), self.weights.get(v, 0)), l['window'], clock) for v, l in config['rate_limits'].items()}
+
+		self.data = {v: None for v in VENUES}
+		self.fetched = {v: None for v in VENUES}
+		self.locks = {v: threading.Lock() for v in VENUES}
+		self.polls = {v: 0 for v in VENUES}
+		self.served = {v: 0 for v in VENUES}
+
+	def get(self, venue):
+
+		with self.locks[venue]:
+			now = self.clock()
+			fresh = self.fetched[venue] is not None and now - self.fetched[venue] < self.interval[venue]
+			weight = self.weights.get(venue, 0)
+
+			if not fresh and (self.data[venue] is None or self.buckets[venue].available(weight)):
+				self.buckets[venue].take(weight)
+				self.data[venue] = self.clients[venue].get_market_data()
+				self.fetched[venue] = now
+				self.polls[venue] += 1
+
+			self.served[venue] += 1
+			return self.data[venue]
+
+
+class HubClient:
+
+	# A Strategy's Own (Sub-Account) Client with get_market_data Served by the Hub
+
+	def __init__(self, client, hub, venue):
+		self.client = client
+		self.hub = hub
+		self.venue = venue
+
+	def __getattr__(self, name):
+		return getattr(self.client, name)
+
+	def get_market_data(self):
+		return self.hub.get(self.venue)
+
+
+class StrategyLogger:
+
+	# Tags Every Dict Event with the Hosted Strategy's Name
+
+	def __init__(self, logger, name):
+		self.logger = logger
+		self.name = name
+
+	def info(self, msg, *args, **kwargs):
+		if isinstance(msg, dict): msg = {**msg, 'strategy': self.name}
+		return self.logger.info(msg, *args, **kwargs)
+
+	def __getattr__(self, name):
+		return getattr(self.logger, name)
+
+
+class VenuePool:
+
+	# One HTTP Connection Pool per Venue and One HL Market Load for Every Hosted Account
+	# (Sessions Stay per Client as Binance Keys Live in Session Headers)
+
+	def __init__(self, config):
+		self.adapters = {v: requests.adapters.HTTPAdapter(pool_connections=4, pool_maxsize=config['host_pool_size']) for v in VENUES}
+		self.hl_markets = None
+
+	def binance(self, config):
+		client = BinanceClient(config)
+		client.client.session.mount('https://', self.adapters['binance'])
+		return client
+
+	def hl(self, config):
+		client = HyperliquidClient(config, markets=self.hl_markets)
+		client.client.session.mount('https://', self.adapters['hl'])
+		self.hl_markets = self.hl_markets or client.client.markets
+		return client
+
+
+class StrategyHost:
+
+	# Many Strategy Instances over One Feed and One Connection Pool per Venue
+	# Each Strategy Keeps its Own Account Clients, User Streams, Risk Manager and Rate Budget;
+	# Book Streams and Market Data are Shared. Loop Stages of All Strategies Run on One Thread,
+	# Strategies Taken in Rotating Order Each Pass so None is Always First
+
+	def __init__(self, config, logger, hub, books, make_clients, clock=time.time, sleep=time.sleep, recorder=None):
+		self.config = config
+		self.logger = logger
+		self.hub = hub
+		self.books = books
+		self.make_clients = make_clients
+		self.clock = clock
+		self.sleep = sleep
+		self.recorder = recorder
+		self.strategies = []
+		self.schedulers = []
+		self.turn = 0
+
+	def add(self, spec, n):
+
+		cfg = strategy_config(self.config, spec, n)
+		logger = StrategyLogger(self.logger, spec['name'])
+		bn_client, hl_client = self.make_clients(cfg)
+		bn_client, hl_client = HubClient(bn_client, self.hub, 'binance'), HubClient(hl_client, self.hub, 'hl')
+
+		# Only the First Strategy Records (Market Data and Books are Shared)
+		recorder = self.recorder if not self.strategies else None
+		strategy = Strategy(cfg, logger, bn_client, hl_client, RiskManager(cfg), recorder, books=self.books)
+		scheduler = LoopScheduler(cfg, logger, clock=self.clock, sleep=self.sleep)
+		build_loop(strategy, cfg, scheduler)
+
+		self.strategies.append(strategy)
+		self.schedulers.append(scheduler)
+		return strategy
+
+	def run_once(self):
+
+		n = len(self.schedulers)
+		for k in range(n):
+			scheduler = self.schedulers[(self.turn + k) % n]
+			if self.clock() >= min(s.next_run for s in scheduler.stages): scheduler.run_once()
+		self.turn = (self.turn + 1) % n
+
+		return min(s.next_run for scheduler in self.schedulers for s in scheduler.stages)
+
+	def run(self):
+		while True:
+			delay = self.run_once() - self.clock()
+			if delay > 0: self.sleep(delay)
+
+	def cancel_orders(self):
+		for strategy in self.strategies: strategy.cancel_orders()
+		return
+
+	def stats(self):
+		return {
+			'polls': dict(self.hub.polls),
+			'served': dict(self.hub.served),
+			'strategies': {s.config['strategy_name']: {st.name: st.runtime_hist.count for st in sch.stages} for s, sch in zip(self.strategies, self.schedulers)}
+		}
+
+
+def start_host(config, logger, recorder=None):
+
+	# Live Host: Market Data and Book Streams on the Base Account, One Client Pair per Entry
+	# Hosted Asset Lists Must be Subsets of config['assets'] (What the Feed Covers)
+	pool = VenuePool(config)
+	feed_clients = {'binance': pool.binance(config), 'hl': pool.hl(config)}
+	hub = MarketDataHub(config, feed_clients)
+
+	books = BookManager(config, config['assets'])
+	for client in feed_clients.values(): client.start_book_stream(books)
+
+	host = StrategyHost(config, logger, hub, books, lambda cfg: (pool.binance(cfg), pool.hl(cfg)), recorder=recorder)
+	specs = config['host_strategies']
+	for spec in specs: host.add(spec, len(specs))
+	return host
@@ -0,0 +1,245 @@
+import json
+import time
+import queue
+import itertools
+import logging
+import logging.handlers
+
+
+class EventFilter(logging.Filter):
+
+	# Route Records by Event Type (include=True Keeps Only Listed Events)
+
+	def __init__(self, events, include):
+		super().__init__()
+		self.events = set(events)
+		self.include = include
+
+	def filter(self, record):
+		evt = record.msg.get('event') if isinstance(record.msg, dict) else None
+		return (evt in self.events) == self.include
+
+
+class JsonFormatter(logging.Formatter):
+
+	# Serializes Dict Payloads on the Listener Thread
+	# t (ms) and seq Order Events Across production.log and market_data.log
+
+	def format(self, record):
+		if isinstance(record.msg, dict):
+			record = logging.makeLogRecord(record.__dict__)
+			stamp = {'t': int(record.created * 1000), 'seq': getattr(record, 'seq', None)}
+			record.msg = json.dumps({**stamp, **record.msg}, separators=(',', ':'), default=str)
+		return super().format(record)
+
+
+class MarketDataFormatter(logging.Formatter):
+
+	# Compact Record: {t, seq, venue: {asset: [bid, bid_qty, ask, ask_qty, funding, premium]}}
+
+	def format(self, record):
+		if isinstance(record.msg, dict):
+			compact = {'event': 'market_data', 't': int(record.created * 1000), 'seq': getattr(record, 'seq', None)}
+			for venue in ('binance', 'hl'):
+				compact[venue] = {a: compact_quote(venue, d) for a, d in record.msg.get(venue, {}).items()}
+			record = logging.makeLogRecord(record.__dict__)
+			record.msg = json.dumps(compact, separators=(',', ':'))
+		return super().format(record)
+
+
+def compact_quote(venue, data):
+
+	try:
+		if venue == 'binance':
+			ticker = data['ticker']
+			bid, ask = float(ticker['bidPrice']), float(ticker['askPrice'])
+			index = float((data.get('premium') or {}).get('indexPrice') or 0)
+			return [
+				bid, float(ticker['bidQty']),
+				ask, float(ticker['askQty']),
+				float(data['funding'][0]['fundingRate']),
+				(bid + ask) / 2 / index - 1 if index else None
+				]
+
+		bids, asks = data['book']['bids'], data['book']['asks']
+		premium = (data['ticker'].get('info') or {}).get('premium')
+		return [
+			bids[0][0] if bids else None, bids[0][1] if bids else None,
+			asks[0][0] if asks else None, asks[0][1] if asks else None,
+			float(data['funding'][0]['fundingRate']),
+			None if premium is None else float(premium)
+			]
+
+	except (KeyError, IndexError, TypeError):
+		return None
+
+
+class AsyncHandler(logging.handlers.QueueHandler):
+
+	# Hot-Path Side of the Pipeline: Sample / Rate Limit, then Enqueue Unformatted
+	# A Full Queue Drops the Record Instead of Blocking the Trading Thread
+	# Rate Buckets Run on Each Record's Own Creation Time; State Events (coalesce) are Never
+	# Lost Outright: the Latest Suppressed One is Held and Emitted Once a Token Frees Up
+	# Sampling, Buckets and Held Records are Kept per (Event, Strategy) so Hosted
+	# Strategies Sharing the Handler Do Not Crowd Each Other Out
+
+	def __init__(self, log_queue, config):
+		super().__init__(log_queue)
+		self.policy = config.get('log_policy') or {}
+		self.stats_interval = config['log_stats_interval']
+
+		self.seen = {}
+		self.buckets = {}
+		self.held = {}
+		self.sampled = {}
+		self.limited = {}
+		self.coalesced = {}
+		self.dropped = 0
+		self.enqueued = 0
+		self.seq = itertools.count()
+		self.last_stats = time.time()
+
+	def admit(self, key, policy, record):
+
+		# Keep 1 of Every N
+		evt = key[0]
+		n = self.seen.get(key, 0) + 1
+		self.seen[key] = n
+		if n % policy.get('sample', 1):
+			self.sampled[evt] = self.sampled.get(evt, 0) + 1
+			return False
+
+		# Token Bucket of `rate` Records per Second
+		rate = policy.get('rate')
+		coalesce = policy.get('coalesce')
+		if rate and not self.take(key, rate, record.created):
+			if not coalesce:
+				self.limited[evt] = self.limited.get(evt, 0) + 1
+				return False
+			if key in self.held: self.coalesced[evt] = self.coalesced.get(evt, 0) + 1
+			self.held[key] = record
+			return False
+
+		# A Newer State Record Supersedes the Held One
+		if coalesce and self.held.pop(key, None) is not None: self.coalesced[evt] = self.coalesced.get(evt, 0) + 1
+		return True
+
+	def take(self, key, rate, now):
+		tokens, last = self.buckets.get(key, (rate, now))
+		tokens = min(rate, tokens + max(now - last, 0) * rate)
+		if tokens < 1:
+			self.buckets[key] = (tokens, now)
+			return False
+		self.buckets[key] = (tokens - 1, now)
+		return True
+
+	def release_held(self, now, skip):
+
+		# Held State Records Whose Bucket Has Refilled (Checked as Other Records Arrive)
+		for key, record in list(self.held.items()):
+			if key == skip or not self.take(key, self.policy[key[0]]['rate'], now): continue
+			del self.held[key]
+			self.forward(record)
+		return
+
+	def flush(self):
+
+		# Shutdown: Held State Records Go Out Regardless of Rate
+		for record in self.held.values(): self.forward(record)
+		self.held.clear()
+		return
+
+	def prepare(self, record):
+
+		# Leave Serialization to the Listener Thread
+		return record
+
+	def enqueue(self, record):
+		try:
+			self.queue.put_nowait(record)
+			self.enqueued += 1
+		except queue.Full:
+			self.dropped += 1
+		return
+
+	def forward(self, record):
+		record.seq = next(self.seq)
+		super().emit(record)
+		return
+
+	def emit(self, record):
+
+		evt, strategy = (record.msg.get('event'), record.msg.get('strategy')) if isinstance(record.msg, dict) else (None, None)
+		key = (evt, strategy)
+		if self.held: self.release_held(record.created, key)
+		policy = self.policy.get(evt)
+		if not policy or self.admit(key, policy, record): self.forward(record)
+
+		if time.time() - self.last_stats >= self.stats_interval:
+			self.last_stats = time.time()
+			stats = logging.LogRecord(record.name, logging.INFO, __file__, 0, self.stats(), None, None)
+			self.enqueue(stats)
+
+		return
+
+	def stats(self):
+		return {
+			'event': 'log_stats',
+			'queue_depth': self.queue.qsize(),
+			'enqueued': self.enqueued,
+			'dropped': self.dropped,
+			'sampled_out': dict(self.sampled),
+			'rate_limited': dict(self.limited),
+			'coalesced': dict(self.coalesced)
+		}
+
+
+class LogListener(logging.handlers.QueueListener):
+
+	# Stopping Flushes the Hot-Path Handler First so Held State Records Reach the Files
+
+	def __init__(self, source, log_queue, *handlers, **kwargs):
+		super().__init__(log_queue, *handlers, **kwargs)
+		self.source = source
+
+	def stop(self):
+		self.source.flush()
+		super().stop()
+		return
+
+
+def setup_logging(config, log_dir):
+
+	# production.log Gets Everything but Market Data, market_data.log Gets Compact Quotes
+	# Both Rotate; Formatting and File I/O Run on the QueueListener Thread
+
+	fmt = "%(asctime)s %(levelname)-8s %(message)s"
+	datefmt = "%Y-%m-%dT%H:%M:%S"
+
+	prod_handler = logging.handlers.RotatingFileHandler(
+		log_dir / "production.log",
+		maxBytes=config['log_max_bytes'],
+		backupCount=config['log_backup_count']
+		)
+	prod_handler.setFormatter(JsonFormatter(fmt, datefmt))
+	prod_handler.addFilter(EventFilter(['market_data'], include=False))
+
+	md_handler = logging.handlers.RotatingFileHandler(
+		log_dir / "market_data.log",
+		maxBytes=config['log_max_bytes'],
+		backupCount=config['log_backup_count']
+		)
+	md_handler.setFormatter(MarketDataFormatter(fmt, datefmt))
+	md_handler.addFilter(EventFilter(['market_data'], include=True))
+
+	log_queue = queue.Queue(maxsize=config['log_queue_size'])
+	handler = AsyncHandler(log_queue, config)
+	listener = LogListener(handler, log_queue, prod_handler, md_handler, respect_handler_level=True)
+	listener.start()
+
+	logger = logging.getLogger('live')
+	logger.setLevel(logging.INFO)
+	logger.propagate = False
+	logger.addHandler(handler)
+
+	return logger, listener
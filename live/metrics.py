@@ -0,0 +1,203 @@
+import time
+import bisect
+import functools
+import threading
+import http.server
+
+
+# Millisecond Buckets for Network Round Trips
+LATENCY_BUCKETS = [1, 2, 5, 10, 20, 50, 100, 200, 500, 1000, 2000, 5000]
+
+
+class Histogram:
+
+	# Fixed-Bucket Histogram (Bucket i Counts Values <= buckets[i], Last Bucket is Overflow)
+
+	def __init__(self, buckets=LATENCY_BUCKETS):
+		self.buckets = list(buckets)
+		self.counts = [0] * (len(self.buckets) + 1)
+		self.sum = 0
+		self.count = 0
+		self.lock = threading.Lock()
+
+	def observe(self, value):
+		i = bisect.bisect_left(self.buckets, value)
+		with self.lock:
+			self.counts[i] += 1
+			self.sum += value
+			self.count += 1
+		return
+
+	def quantile(self, q):
+
+		# Upper Bound of Bucket Containing the q-th Observation
+		# (Overflow Bucket Reported at the Last Bound)
+		if not self.count: return None
+		rank = q * self.count
+		cum = 0
+		for i, c in enumerate(self.counts):
+			cum += c
+			if cum >= rank and c: break
+		return self.buckets[min(i, len(self.buckets) - 1)]
+
+	def count_above(self, bound):
+
+		# Observations > bound; Exact Only at a Bucket Bound (a Bucket Straddling Any
+		# Other Value Can't be Split), so Anything Else is Rejected
+		if bound not in self.buckets: raise ValueError(f'{bound} is not a bucket bound of {self.buckets}')
+		i = self.buckets.index(bound)
+		with self.lock: return sum(self.counts[i + 1:])
+
+	def snapshot(self):
+		with self.lock:
+			return {
+				'count': self.count,
+				'mean': self.sum / self.count if self.count else None,
+				'p50': self.quantile(0.5),
+				'p90': self.quantile(0.9),
+				'p99': self.quantile(0.99),
+				'buckets': self.buckets,
+				'counts': list(self.counts)
+			}
+
+
+class Counter:
+
+	def __init__(self):
+		self.value = 0
+		self.lock = threading.Lock()
+
+	def inc(self, n=1):
+		with self.lock: self.value += n
+		return
+
+
+class Gauge:
+
+	# Last Value Wins (Single Assignment, No Lock Needed)
+
+	def __init__(self):
+		self.value = 0
+
+	def set(self, value):
+		self.value = value
+		return
+
+
+class Registry:
+
+	# Named Metric Families, One Child per Label Set
+	# Call Sites Look Children Up Once and Keep the Handle, so an Observation is
+	# Just the Metric's Own Update (~0.5 us for a Histogram)
+
+	def __init__(self):
+		self.families = {}
+		self.lock = threading.Lock()
+
+	def get(self, kind, name, help, labels, make):
+		key = tuple(sorted(labels.items()))
+		with self.lock:
+			family = self.families.setdefault(name, {'kind': kind, 'help': help, 'children': {}})
+			child = family['children'].get(key)
+			if child is None: child = family['children'][key] = make()
+		return child
+
+	def counter(self, name, help='', **labels):
+		return self.get('counter', name, help, labels, Counter)
+
+	def gauge(self, name, help='', **labels):
+		return self.get('gauge', name, help, labels, Gauge)
+
+	def histogram(self, name, help='', buckets=LATENCY_BUCKETS, **labels):
+		return self.get('histogram', name, help, labels, lambda: Histogram(buckets))
+
+	def render(self):
+
+		# Prometheus Text Exposition Format (0.0.4)
+		lines = []
+		with self.lock: families = [(n, f['kind'], f['help'], list(f['children'].items())) for n, f in self.families.items()]
+
+		for name, kind, help, children in families:
+			if help: lines.append(f'# HELP {name} {help}')
+			lines.append(f'# TYPE {name} {kind}')
+
+			for key, child in children:
+				if kind != 'histogram':
+					lines.append(f'{name}{label_str(key)} {child.value}')
+					continue
+
+				with child.lock: counts, total, count = list(child.counts), child.sum, child.count
+				cum = 0
+				for bound, c in zip(child.buckets + ['+Inf'], counts):
+					cum += c
+					lines.append(f'{name}_bucket{label_str(key + (("le", bound),))} {cum}')
+				lines.append(f'{name}_sum{label_str(key)} {total}')
+				lines.append(f'{name}_count{label_str(key)} {count}')
+
+		return '\n'.join(lines) + '\n'
+
+
+def label_str(key):
+	if not key: return ''
+	return '{' + ','.join(f'{k}="{v}"' for k, v in key) + '}'
+
+
+# Process-Wide Registry Used by the Live System
+REGISTRY = Registry()
+
+
+def rest_call(fn):
+
+	# Per-Venue REST Latency / Error Counts for Exchange Client Methods (Reads self.venue)
+	# Errors are Counted Here and Re-Raised so Callers Keep Their Handling
+	# Handles are Looked Up Once per Venue and Cached in the Closure (a Dict Read per Call)
+	handles = {}
+
+	def lookup(venue):
+		handles[venue] = (
+			REGISTRY.counter('rest_errors_total', 'REST calls that raised', venue=venue, method=fn.__name__),
+			REGISTRY.histogram('rest_latency_ms', 'REST round trip (ms)', venue=venue, method=fn.__name__)
+			)
+		return handles[venue]
+
+	@functools.wraps(fn)
+	def wrapper(self, *args, **kwargs):
+		errors, latency = handles.get(self.venue) or lookup(self.venue)
+		t0 = time.perf_counter()
+		try:
+			return fn(self, *args, **kwargs)
+		except Exception:
+			errors.inc()
+			raise
+		finally:
+			latency.observe((time.perf_counter() - t0) * 1000)
+	return wrapper
+
+
+class MetricsHandler(http.server.BaseHTTPRequestHandler):
+
+	registry = REGISTRY
+
+	def do_GET(self):
+		if self.path.split('?')[0] != '/metrics':
+			self.send_error(404)
+			return
+		body = self.registry.render().encode()
+		self.send_response(200)
+		self.send_header('Content-Type', 'text/plain; version=0.0.4; charset=utf-8')
+		self.send_header('Content-Length', str(len(body)))
+		self.end_headers()
+		self.wfile.write(body)
+		return
+
+	def log_message(self, format, *args):
+		return
+
+
+def start_metrics_server(host, port, registry=REGISTRY):
+
+	# Sidecar /metrics Endpoint on a Daemon Thread of the Trading Process
+	handler = type('Handler', (MetricsHandler,), {'registry': registry})
+	server = http.server.ThreadingHTTPServer((host, port), handler)
+	threading.Thread(target=server.serve_forever, name='metrics', daemon=True).start()
+	return server
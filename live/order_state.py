@@ -0,0 +1,101 @@
+import time
+import threading
+
+
+def apply_fill(position, side, qty, px):
+
+	# Incremental Position / Average Cost Update for a Single Fill
+	pos = position['position']
+	cost_basis = position['cost_basis']
+	signed_qty = qty if side == 'buy' else -qty
+	new_pos = pos + signed_qty
+
+	# Adding to (or Opening) Position
+	if pos == 0 or (pos > 0) == (signed_qty > 0):
+		position['cost_basis'] = ((pos * cost_basis) + (signed_qty * px)) / new_pos
+
+	# Flipping Directional Exposure
+	elif abs(signed_qty) > abs(pos):
+		position['cost_basis'] = px
+
+	# Fully Closed
+	if abs(new_pos) < 1e-12:
+		new_pos = 0
+		position['cost_basis'] = 0
+
+	position['position'] = new_pos
+	return
+
+
+class OrderState:
+
+	# In-Memory View of Our Own Orders, Positions and Cash per Venue
+	# Kept Current by User-Data Streams, Periodically Reconciled over REST
+
+	def __init__(self, config, assets):
+		self.config = config
+		self.assets = assets
+		self.lock = threading.RLock()
+
+		self.cash = {'binance': 0, 'hl': 0}
+		self.positions = {exch: {a: {'position': 0, 'cost_basis': 0} for a in assets} for exch in ('binance', 'hl')}
+		self.open_orders = {exch: {a: {} for a in assets} for exch in ('binance', 'hl')}
+
+		# Closed Order IDs Since Last Reconcile (Late 'open' Updates are Ignored)
+		self.closed = {'binance': set(), 'hl': set()}
+
+		self.fill_handlers = []
+		self.last_reconcile = 0
+
+	def on_order(self, exch, asset, order):
+
+		with self.lock:
+			if asset not in self.assets: return
+			if order['status'] == 'open':
+				if order['oid'] in self.closed[exch]: return
+				self.open_orders[exch][asset][order['oid']] = order
+			else:
+				self.closed[exch].add(order['oid'])
+				self.open_orders[exch][asset].pop(order['oid'], None)
+
+		return
+
+	def on_fill(self, exch, asset, fill):
+
+		# Position Update and Handlers Run Under One Lock so Residuals are Never Half-Applied
+		with self.lock:
+			if asset not in self.assets: return
+			apply_fill(self.positions[exch][asset], fill['side'], fill['size'], fill['price'])
+			for handler in self.fill_handlers: handler(exch, asset, fill)
+
+		return
+
+	def on_cash(self, exch, cash):
+
+		with self.lock: self.cash[exch] = cash
+		return
+
+	def reconcile(self, exch, cash, positions, open_orders):
+
+		with self.lock:
+			self.cash[exch] = cash
+			self.closed[exch] = set()
+			for asset in self.assets:
+				pos = positions.get(asset, {'position': 0, 'cost_basis': 0})
+				self.positions[exch][asset].update(pos)
+
+				orders = open_orders.get(asset, [])
+				self.open_orders[exch][asset] = {o['oid']: o for o in orders}
+
+			self.last_reconcile = time.time()
+
+		return
+
+	def reconcile_due(self):
+		return time.time() - self.last_reconcile >= self.config['reconcile_interval']
+
+	def get_open_orders(self, exch):
+
+		# Same Shape as ExchangeClient.get_open_orders
+		with self.lock:
+			return {a: list(o.values()) for a, o in self.open_orders[exch].items() if o}
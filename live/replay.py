@@ -0,0 +1,581 @@
+import os
+import copy
+import time
+import threading
+import numpy as np
+import pandas as pd
+from pathlib import Path
+
+from live.clients import ExchangeClient
+from live.execution import Strategy, execution_loop
+from live.order_state import apply_fill
+from live.logs import setup_logging
+from live.scheduler import LoopScheduler
+from live.supervisor import Supervisor
+from live.feed import FeedClient, start_feeds, wait_ready
+from live.host import MarketDataHub, StrategyHost
+from live.book import BookManager
+from risk.manager import RiskManager
+from data.ticks import read_ticks
+
+
+class ReplayFinished(Exception):
+	pass
+
+
+class VirtualClock:
+
+	# Simulated Time (ms) Advanced by the Replay, Not the Wall Clock
+
+	def __init__(self, t):
+		self.t = int(t)
+
+	def now(self):
+		return self.t
+
+	def set(self, t):
+		self.t = int(t)
+		return
+
+
+def load_historical(config, base_dir, assets, start=None, end=None):
+
+	# Minute Grid from Clean Asset Tables, Top of Book Synthesized Around Perp Price
+	frames = {}
+	for asset in assets:
+		f = os.path.join(base_dir, 'data', 'historical', 'clean', asset, f'{asset}.csv')
+		frames[asset] = pd.read_csv(f).drop_duplicates('t').set_index('t')
+
+	t = frames[assets[0]].index
+	for asset in assets[1:]: t = t.intersection(frames[asset].index)
+	t = t.sort_values()
+	if start is not None: t = t[t >= start]
+	if end is not None: t = t[t < end]
+
+	half_spread = config['replay_spread_bps'] / 1e4 / 2
+	data = {'t': t.values, 'assets': assets}
+	for venue in ('binance', 'hl'):
+		px = np.column_stack([frames[a].loc[t, f'{venue}_perp_price'].values for a in assets])
+		vlm = np.column_stack([frames[a].loc[t, f'{venue}_perp_volume'].values for a in assets])
+		rate = np.column_stack([frames[a].loc[t, f'{venue}_funding_prev'].values for a in assets])
+		premium = np.column_stack([frames[a].loc[t, f'{venue}_premium'].values for a in assets])
+		next_time = np.column_stack([frames[a].loc[t, f'{venue}_funding_time'].values for a in assets])
+
+		# Last Settlement = Previous Value of the (Forward-Looking) Funding Time
+		settle = []
+		for a in assets:
+			ft = frames[a].loc[t, f'{venue}_funding_time']
+			settle.append(ft.shift().where(ft.ne(ft.shift())).ffill().fillna(0).values)
+
+		data[venue] = {
+			'bid': px * (1 - half_spread),
+			'ask': px * (1 + half_spread),
+			'bid_qty': vlm * config['replay_depth_frac'],
+			'ask_qty': vlm * config['replay_depth_frac'],
+			'volume': vlm,
+			'funding_rate': rate,
+			'funding_time': np.column_stack(settle).astype('int64'),
+			'premium': premium,
+			'next_funding_time': np.nan_to_num(next_time).astype('int64')
+		}
+
+	return data
+
+
+def load_ticks(config, tick_dir, assets, start, end):
+
+	# Fixed Step Grid over Recorded Ticks (Last Quote at or Before Each Step)
+	step = config['replay_step_ms']
+	t = np.arange(start, end, step, dtype='int64')
+	data = {'t': t, 'assets': assets}
+
+	for venue in ('binance', 'hl'):
+		cols = {k: np.full((len(t), len(assets)), np.nan) for k in ('bid', 'ask', 'bid_qty', 'ask_qty', 'volume', 'funding_rate')}
+		cols['funding_time'] = np.zeros((len(t), len(assets)), dtype='int64')
+
+		# Premium is Not Recorded; Settlements on the Venue's Fixed Schedule
+		cols['premium'] = np.full((len(t), len(assets)), np.nan)
+		interval = config['funding_interval_h'][venue] * 3600000
+		cols['next_funding_time'] = np.repeat(((t // interval + 1) * interval)[:, None], len(assets), axis=1)
+
+		for j, asset in enumerate(assets):
+			bbo = read_ticks(tick_dir, venue, asset, 'bbo', start * 10 ** 6, end * 10 ** 6)
+			if len(bbo):
+				i = np.searchsorted(bbo['t'] // 10 ** 6, t, side='right') - 1
+				ok = i >= 0
+				for k in ('bid', 'ask', 'bid_qty', 'ask_qty'): cols[k][ok, j] = bbo[k][i[ok]]
+
+				# Traded Volume Proxy: Displayed Size Consumed at an Unchanged Best Price
+				depleted = np.zeros(len(bbo))
+				same_bid = bbo['bid'][1:] == bbo['bid'][:-1]
+				same_ask = bbo['ask'][1:] == bbo['ask'][:-1]
+				depleted[1:] += np.where(same_bid, np.maximum(bbo['bid_qty'][:-1] - bbo['bid_qty'][1:], 0), 0)
+				depleted[1:] += np.where(same_ask, np.maximum(bbo['ask_qty'][:-1] - bbo['ask_qty'][1:], 0), 0)
+				cum = np.concatenate([[0], np.cumsum(depleted)])
+				cols['volume'][:, j] = np.diff(np.concatenate([[0], cum[i + 1]]))
+
+			funding = read_ticks(tick_dir, venue, asset, 'funding', 0, end * 10 ** 6)
+			if len(funding):
+				i = np.searchsorted(funding['t'] // 10 ** 6, t, side='right') - 1
+				ok = i >= 0
+				cols['funding_rate'][ok, j] = funding['rate'][i[ok]]
+				cols['funding_time'][ok, j] = funding['funding_time'][i[ok]]
+
+		# Carry Quotes Forward over Gaps
+		for k in ('bid', 'ask', 'bid_qty', 'ask_qty', 'funding_rate'):
+			cols[k] = pd.DataFrame(cols[k]).ffill().bfill().values
+		cols['volume'] = np.nan_to_num(cols['volume'])
+		data[venue] = cols
+
+	return data
+
+
+class ReplaySession:
+
+	# Shared Clock / Step Index for Both Simulated Venues
+	# The Step Advances When a Venue Pulls Market Data it has Already Seen
+
+	def __init__(self, config, data):
+		self.config = config
+		self.data = data
+		self.t = data['t']
+		self.assets = list(data['assets'])
+		self.i = 0
+		self.consumed = set()
+		self.venues = []
+		self.clock = VirtualClock(self.t[0])
+
+	def step_for(self, venue):
+		if venue in self.consumed: self.advance()
+		self.consumed.add(venue)
+		return
+
+	def advance(self):
+
+		if self.i + 1 >= len(self.t): raise ReplayFinished()
+		self.i += 1
+		self.consumed = set()
+		self.clock.set(self.t[self.i])
+
+		for exch in self.venues: exch.on_step()
+		return
+
+	def sleep(self, seconds):
+
+		# Scheduler Waits Move the Virtual Clock Forward
+		target = self.clock.now() + seconds * 1000
+		while self.clock.now() < target: self.advance()
+		return
+
+	def quote(self, venue, asset):
+		cols = self.data[venue]
+		j = self.assets.index(asset)
+		return {k: cols[k][self.i, j] for k in cols}
+
+
+class PacedSession(ReplaySession):
+
+	# Stand-In Venue Time for Multi-Process Runs: the Step Follows the Wall Clock
+	# (speed x Real Time from wall_t0), so Separate Processes Agree on the Current Step
+
+	def __init__(self, config, data, wall_t0, speed):
+		super().__init__(config, data)
+		self.wall_t0 = wall_t0
+		self.speed = speed
+
+	def sync(self):
+		target = self.t[0] + max(time.time() - self.wall_t0, 0) * 1000 * self.speed
+		while self.i + 1 < len(self.t) and self.t[self.i + 1] <= target: self.advance()
+		if self.i + 1 >= len(self.t) and target > self.t[-1]: raise ReplayFinished()
+		return
+
+	def step_for(self, venue):
+		self.sync()
+		return
+
+	def sleep(self, seconds):
+		time.sleep(seconds / self.speed)
+		self.sync()
+		return
+
+
+def paced_client(venue, config, base_dir, start, end, wall_t0, speed):
+
+	# Feed Process Factory: a Replay Venue on its Own Paced Session
+	data = load_historical(config, base_dir, config['assets'], start, end)
+	return ReplayExchange(PacedSession(config, data, wall_t0, speed), venue, config)
+
+
+class ReplayExchange(ExchangeClient):
+
+	# Simulated Venue Implementing the ExchangeClient Interface
+	# Limit Orders Rest with a Queue Position: Size Displayed Ahead at Entry is
+	# Consumed by Opposite-Side Flow (Half the Step's Volume) Before Filling Us;
+	# Prices Trading Through the Order Fill it Outright. Market Orders Fill at the Touch.
+
+	cash_nets_notional = True
+
+	def __init__(self, session, venue, config):
+		self.session = session
+		self.venue = venue
+		self.config = copy.deepcopy(config)
+		session.venues.append(self)
+
+		### Not Supported on HL Testnet **
+		if 'XRP' in self.config['assets']: self.config['assets'].remove('XRP')
+		self.contract_names = {a: a for a in self.config['assets']}
+
+		self.cash = config['starting_capital'] / 2
+		self.positions = {a: {'position': 0, 'cost_basis': 0} for a in self.config['assets']}
+		self.last_settle = {a: None for a in self.config['assets']}
+		self.orders = {}
+		self.next_oid = 1
+		self.fills = 0
+
+		self.handler = None
+		self.books = None
+
+	def _fill(self, oid, order, qty, px, cid=None):
+
+		asset, side = order['asset'], order['side']
+		drc = 1 if side == 'buy' else -1
+		apply_fill(self.positions[asset], side, qty, px)
+		self.cash -= drc * qty * px + qty * px * self.config['fees'][self.venue]
+		self.fills += 1
+
+		if self.handler:
+			self.handler.on_fill(self.venue, asset, {
+				'oid': oid, 'cid': cid, 'side': side,
+				'price': px, 'size': qty, 't': self.session.clock.now()
+				})
+			self.handler.on_cash(self.venue, self.cash)
+		return
+
+	def _emit_order(self, oid, order, status):
+		if self.handler:
+			self.handler.on_order(self.venue, order['asset'], {
+				'oid': oid, 'side': order['side'], 'price': order['price'],
+				'size': order['size'], 'status': status
+				})
+		return
+
+	def _queue_ahead(self, order, q):
+
+		# Size Ahead of Us at Entry (None = Behind the Touch)
+		if order['side'] == 'buy':
+			if order['price'] > q['bid']: return 0
+			return q['bid_qty'] if order['price'] == q['bid'] else None
+		if order['price'] < q['ask']: return 0
+		return q['ask_qty'] if order['price'] == q['ask'] else None
+
+	def on_step(self):
+
+		for asset in self.config['assets']:
+			q = self.session.quote(self.venue, asset)
+
+			# Funding Settlement
+			if self.last_settle[asset] is not None and q['funding_time'] != self.last_settle[asset]:
+				position = self.positions[asset]['position']
+				mark_px = (q['bid'] + q['ask']) / 2
+				mod = 1 / 8 if self.venue == 'hl' else 1
+				self.cash -= position * mark_px * q['funding_rate'] * mod
+			self.last_settle[asset] = q['funding_time']
+
+		# Match Resting Orders Against the New Step
+		for oid in list(self.orders):
+			order = self.orders[oid]
+			q = self.session.quote(self.venue, order['asset'])
+			buy = order['side'] == 'buy'
+
+			# Traded Through
+			if (buy and q['ask'] <= order['price']) or (not buy and q['bid'] >= order['price']):
+				fill_qty = order['size']
+
+			else:
+				if order['queue'] is None: order['queue'] = self._queue_ahead(order, q)
+				if order['queue'] is None: continue
+
+				flow = q['volume'] / 2
+				ahead = min(order['queue'], flow)
+				order['queue'] -= ahead
+				fill_qty = min(order['size'], flow - ahead)
+
+			if fill_qty <= 0: continue
+			order['size'] -= fill_qty
+			self._fill(oid, order, fill_qty, order['price'], order.get('client_id'))
+
+			if order['size'] <= 1e-12:
+				del self.orders[oid]
+				self._emit_order(oid, order, 'filled')
+			else:
+				self._emit_order(oid, order, 'open')
+
+		# Push Top of Book to Subscribed Books
+		if self.books:
+			for asset in self.config['assets']:
+				book = self.books.get(self.venue, asset)
+				if book is None: continue
+				q = self.session.quote(self.venue, asset)
+				book.apply_snapshot([[q['bid'], q['bid_qty']]], [[q['ask'], q['ask_qty']]], seq=self.session.i, t=self.session.clock.now())
+
+		return
+
+	def get_balances(self):
+		return self.cash, copy.deepcopy(self.positions)
+
+	def get_market_data(self):
+
+		self.session.step_for(self.venue)
+		now = self.session.clock.now()
+
+		market_data = {}
+		for asset in self.config['assets']:
+			q = self.session.quote(self.venue, asset)
+			bids = [[q['bid'], q['bid_qty']]]
+			asks = [[q['ask'], q['ask_qty']]]
+
+			# Same Payload Shapes as the Real Clients
+			if self.venue == 'binance':
+				market_data[asset] = {
+					'ticker': {
+						'bidPrice': str(q['bid']), 'bidQty': str(q['bid_qty']),
+						'askPrice': str(q['ask']), 'askQty': str(q['ask_qty']),
+						'time': now},
+					'book': {
+						'lastUpdateId': self.session.i,
+						'bids': [[str(p), str(s)] for p, s in bids],
+						'asks': [[str(p), str(s)] for p, s in asks]},
+					'funding': [{'fundingRate': str(q['funding_rate']), 'fundingTime': int(q['funding_time'])}],
+					'premium': {
+						'indexPrice': str((q['bid'] + q['ask']) / 2 / (1 + q['premium'])) if not np.isnan(q['premium']) else '0',
+						'nextFundingTime': int(q['next_funding_time'])}
+				}
+			else:
+				market_data[asset] = {
+					'ticker': {'last': (q['bid'] + q['ask']) / 2, 'bid': q['bid'], 'ask': q['ask'], 'timestamp': now,
+						'info': {'premium': None if np.isnan(q['premium']) else str(q['premium'])}},
+					'book': {'bids': bids, 'asks': asks, 'timestamp': now},
+					'funding': [{'fundingRate': q['funding_rate'], 'timestamp': int(q['funding_time'])}]
+				}
+
+		return market_data
+
+	def submit_order(self, order):
+
+		oid = self.next_oid
+		self.next_oid += 1
+		q = self.session.quote(self.venue, order['asset'])
+		buy = order['side'] == 'buy'
+
+		# Market / Marketable Orders Take the Touch
+		marketable = order['type'] == 'market' or (buy and order['price'] >= q['ask']) or (not buy and order['price'] <= q['bid'])
+		if marketable:
+			px = q['ask'] if buy else q['bid']
+			self._fill(oid, {**order, 'price': px}, order['amount'], px, order.get('client_id'))
+			self._emit_order(oid, {**order, 'price': px, 'size': 0}, 'filled')
+
+		else:
+			resting = {**order, 'size': order['amount'], 'queue': None}
+			resting['queue'] = self._queue_ahead(resting, q)
+			self.orders[oid] = resting
+			self._emit_order(oid, resting, 'open')
+
+		return {'id': str(oid), 'orderId': oid}
+
+	def get_open_orders(self):
+
+		open_orders = {}
+		for oid, order in self.orders.items():
+			open_orders.setdefault(order['asset'], []).append({
+				'oid': oid, 'side': order['side'], 'price': order['price'], 'size': order['size']
+				})
+		return open_orders
+
+	def cancel_order(self, asset, order_id):
+
+		order = self.orders.pop(int(order_id), None)
+		if order: self._emit_order(int(order_id), order, 'canceled')
+		return {'id': str(order_id)}
+
+	def submit_orders(self, orders):
+		return [{'id': self.submit_order(order)['id']} for order in orders]
+
+	def cancel_orders(self, cancels):
+		return [self.cancel_order(asset, oid) for asset, oid in cancels]
+
+	def modify_orders(self, orders):
+
+		# Reprice in Place (New Price Loses Queue Position)
+		results = []
+		for order in orders:
+			resting = self.orders.get(int(order['oid']))
+			if resting is None:
+				results.append({'id': None})
+				continue
+			resting.update({'price': order['price'], 'size': order['amount'], 'side': order['side']})
+			resting['queue'] = self._queue_ahead(resting, self.session.quote(self.venue, order['asset']))
+			self._emit_order(int(order['oid']), resting, 'open')
+			results.append({'id': str(order['oid'])})
+
+		return results
+
+	def start_user_stream(self, handler):
+
+		# Events are Delivered Synchronously as the Replay Steps
+		self.handler = handler
+		return
+
+	def start_book_stream(self, books):
+		self.books = books
+		return
+
+	def equity(self):
+		q = {a: self.session.quote(self.venue, a) for a in self.config['assets']}
+		return self.cash + sum(p['position'] * (q[a]['bid'] + q[a]['ask']) / 2 for a, p in self.positions.items())
+
+
+def replay_processes(config, base_dir, start=None, end=None, speed=60, kill_after=None):
+
+	# End-to-End Run of the Multi-Process Layout Against Stand-In Venues:
+	# Supervised Feed Processes Publish Paced Replay Market Data to Shared Memory,
+	# This Process Trades on Its Own Paced Copy of the Venues Reading Those Snapshots
+	# kill_after (s) Kills the HL Feed Once to Exercise the Supervisor
+	config = copy.deepcopy(config)
+	config['hedge_async'] = False
+	config['reconcile_interval'] = float('inf')
+	config['log_policy'] = {}
+	config['stage_weights']['market_data'] = {}
+
+	data = load_historical(config, base_dir, config['assets'], start, end)
+	wall_t0 = time.time() + config['feed_startup_s']
+
+	log_dir = Path(base_dir) / 'logs' / 'replay'
+	if not os.path.exists(log_dir): os.makedirs(log_dir)
+	logger, listener = setup_logging(config, log_dir)
+
+	supervisor = Supervisor(config, logger)
+	snapshots = start_feeds(config, supervisor, paced_client, (str(base_dir), start, end, wall_t0, speed))
+	supervisor.start()
+
+	session = PacedSession(config, data, wall_t0, speed)
+	bn_client = FeedClient(ReplayExchange(session, 'binance', config), snapshots['binance'], 'binance', config['supervisor_stale_s'])
+	hl_client = FeedClient(ReplayExchange(session, 'hl', config), snapshots['hl'], 'hl', config['supervisor_stale_s'])
+
+	# Wait for First Publishes Before Trading
+	wait_ready(snapshots, config['feed_ready_timeout_s'])
+	if kill_after:
+		feed = next(c for c in supervisor.components if c.name == 'feed_hl')
+		threading.Timer(kill_after, lambda: feed.proc.kill()).start()
+
+	strategy = Strategy(config, logger, bn_client, hl_client, RiskManager(config))
+	scheduler = LoopScheduler(config, logger, clock=lambda: session.clock.now() / 1000, sleep=session.sleep)
+
+	wall_start = time.perf_counter()
+	try:
+		execution_loop(strategy, config, scheduler)
+	except ReplayFinished:
+		pass
+	finally:
+		supervisor.stop()
+		listener.stop()
+		feeds = supervisor.stats()
+		for s in snapshots.values(): s.close()
+	wall = time.perf_counter() - wall_start
+
+	return {
+		'steps': session.i + 1,
+		'wall_seconds': wall,
+		'fills': {'binance': bn_client.fills, 'hl': hl_client.fills},
+		'equity': float(bn_client.equity() + hl_client.equity()),
+		'feeds': feeds
+	}
+
+
+def replay_host(config, base_dir, start=None, end=None):
+
+	# host_strategies on One Replay Session: Shared Feed / Books, a Venue Pair per Strategy
+	config = copy.deepcopy(config)
+	config['hedge_async'] = False
+	config['reconcile_interval'] = float('inf')
+	config['log_policy'] = {}
+
+	data = load_historical(config, base_dir, config['assets'], start, end)
+	session = ReplaySession(config, data)
+	clock = lambda: session.clock.now() / 1000
+
+	log_dir = Path(base_dir) / 'logs' / 'replay'
+	if not os.path.exists(log_dir): os.makedirs(log_dir)
+	logger, listener = setup_logging(config, log_dir)
+
+	feed_clients = {v: ReplayExchange(session, v, config) for v in ('binance', 'hl')}
+	hub = MarketDataHub(config, feed_clients, clock)
+	books = BookManager(config, config['assets'])
+	for client in feed_clients.values(): client.start_book_stream(books)
+
+	make_clients = lambda cfg: (ReplayExchange(session, 'binance', cfg), ReplayExchange(session, 'hl', cfg))
+	host = StrategyHost(config, logger, hub, books, make_clients, clock=clock, sleep=session.sleep)
+	specs = config['host_strategies']
+	for spec in specs: host.add(spec, len(specs))
+
+	wall_start = time.perf_counter()
+	try:
+		host.run()
+	except ReplayFinished:
+		pass
+	finally:
+		listener.stop()
+	wall = time.perf_counter() - wall_start
+
+	return {
+		'steps': session.i + 1,
+		'wall_seconds': wall,
+		**host.stats(),
+		'fills': {s.config['strategy_name']: {'binance': s.bn_client.fills, 'hl': s.hl_client.fills} for s in host.strategies},
+		'equity': {s.config['strategy_name']: float(s.bn_client.equity() + s.hl_client.equity()) for s in host.strategies}
+	}
+
+
+def replay(config, base_dir, source='historical', start=None, end=None):
+
+	# Deterministic Settings for Simulated Runs (Log Rate Limits Would Run on Wall Time)
+	config = copy.deepcopy(config)
+	config['hedge_async'] = False
+	config['reconcile_interval'] = float('inf')
+	config['log_policy'] = {}
+
+	if source == 'ticks':
+		data = load_ticks(config, os.path.join(base_dir, config['tick_dir']), config['assets'], start, end)
+	else:
+		data = load_historical(config, base_dir, config['assets'], start, end)
+
+	session = ReplaySession(config, data)
+	bn_client = ReplayExchange(session, 'binance', config)
+	hl_client = ReplayExchange(session, 'hl', config)
+
+	log_dir = Path(base_dir) / 'logs' / 'replay'
+	if not os.path.exists(log_dir): os.makedirs(log_dir)
+	logger, listener = setup_logging(config, log_dir)
+
+	strategy = Strategy(config, logger, bn_client, hl_client, RiskManager(config))
+
+	# Stage Cadences and Rate Budgets Follow Simulated Time
+	scheduler = LoopScheduler(config, logger, clock=lambda: session.clock.now() / 1000, sleep=session.sleep)
+
+	wall_start = time.perf_counter()
+	try:
+		execution_loop(strategy, config, scheduler)
+	except ReplayFinished:
+		pass
+	finally:
+		listener.stop()
+	wall = time.perf_counter() - wall_start
+
+	sim = float(session.t[session.i] - session.t[0]) / 1000
+	return {
+		'steps': session.i + 1,
+		'sim_seconds': sim,
+		'wall_seconds': wall,
+		'speedup': sim / wall if wall else None,
+		'fills': {'binance': bn_client.fills, 'hl': hl_client.fills},
+		'equity': float(bn_client.equity() + hl_client.equity())
+	}
@@ -0,0 +1,198 @@
+import time
+import math
+
+from live.metrics import REGISTRY
+
+
+class TokenBucket:
+
+	# Venue Request-Weight Budget: `capacity` Weight Refilled Evenly over `window` Seconds
+
+	def __init__(self, capacity, window, clock=time.monotonic):
+		self.capacity = capacity
+		self.rate = capacity / window
+		self.clock = clock
+		self.tokens = capacity
+		self.last = clock()
+
+	def refill(self):
+		now = self.clock()
+		self.tokens = min(self.capacity, self.tokens + (now - self.last) * self.rate)
+		self.last = now
+		return
+
+	def available(self, weight):
+		self.refill()
+		return self.tokens >= weight
+
+	def take(self, weight):
+		self.refill()
+		self.tokens -= weight
+		return
+
+	def wait_time(self, weight):
+
+		# Seconds Until `weight` Tokens are Available
+		self.refill()
+		return max(0, (weight - self.tokens) / self.rate)
+
+
+class Stage:
+
+	def __init__(self, name, fn, interval, weights, strategy='main'):
+		self.name = name
+		self.fn = fn
+		self.interval = interval
+		self.weights = weights
+		self.next_run = 0
+
+		self.runs = 0
+		self.skipped = 0
+		self.throttled = 0
+		self.overruns = 0
+		self.runtime_total = 0
+		self.runtime_max = 0
+
+		# Cumulative Exported Metrics (stats() Counters Reset Every Report)
+		self.runtime_hist = REGISTRY.histogram('loop_stage_ms', 'Execution loop stage runtime (ms)', stage=name, strategy=strategy)
+		self.overrun_count = REGISTRY.counter('loop_stage_overruns_total', 'Stage runs longer than their interval', stage=name, strategy=strategy)
+		self.throttle_count = REGISTRY.counter('loop_stage_throttled_total', 'Stage runs deferred for rate-limit budget', stage=name, strategy=strategy)
+
+	def stats(self):
+		stats = {
+			'runs': self.runs,
+			'skipped': self.skipped,
+			'throttled': self.throttled,
+			'overruns': self.overruns,
+			'avg_ms': round(self.runtime_total / self.runs * 1000, 3) if self.runs else None,
+			'max_ms': round(self.runtime_max * 1000, 3)
+		}
+		self.runs = self.skipped = self.throttled = self.overruns = 0
+		self.runtime_total = self.runtime_max = 0
+		return stats
+
+
+class LoopScheduler:
+
+	# Runs Loop Stages on Their Own Cadences Instead of Back-to-Back
+	# A Due Stage Only Runs if Every Venue it Touches has Budget, Otherwise it Waits for Tokens
+	# Cadences Tighten (x loop_fast_scale) Near Funding Settlement or When Prices are Moving
+
+	def __init__(self, config, logger, clock=time.time, sleep=time.sleep):
+		self.config = config
+		self.logger = logger
+		self.clock = clock
+		self.sleep = sleep
+
+		self.buckets = {v: TokenBucket(l['capacity'], l['window'], clock) for v, l in config['rate_limits'].items()}
+		self.stages = []
+
+		# EWMA Variance of Mid Log Returns per Second, by Asset
+		self.last_mid = {}
+		self.var = {}
+		self.last_report = clock()
+
+	def add(self, name, fn):
+		cadence = self.config['loop_cadence'][name]
+		weights = self.config['stage_weights'].get(name) or {}
+		self.stages.append(Stage(name, fn, cadence, weights, self.config.get('strategy_name', 'main')))
+		return
+
+	def observe(self, mids, t=None):
+
+		# Fed with Mids After Each Market Data Pull
+		t = t or self.clock()
+		alpha = self.config['vol_alpha']
+		for asset, mid in mids.items():
+			if not mid: continue
+			if asset in self.last_mid:
+				prev_mid, prev_t = self.last_mid[asset]
+				dt = t - prev_t
+				if dt > 0:
+					r2 = math.log(mid / prev_mid) ** 2 / dt
+					self.var[asset] = r2 if asset not in self.var else alpha * r2 + (1 - alpha) * self.var[asset]
+			self.last_mid[asset] = (mid, t)
+		return
+
+	def vol_bps(self):
+		if not self.var: return 0
+		return math.sqrt(max(self.var.values())) * 1e4
+
+	def seconds_to_funding(self, now):
+		interval = self.config['funding_interval_s']
+		return interval - now % interval
+
+	def scale(self, now):
+
+		# Urgent Periods Run Every Stage on a Tighter Cadence
+		near_funding = self.seconds_to_funding(now) <= self.config['funding_window_s']
+		volatile = self.vol_bps() >= self.config['vol_fast_bps']
+		return self.config['loop_fast_scale'] if near_funding or volatile else 1
+
+	def run_stage(self, stage, now, scale):
+
+		interval = stage.interval * scale
+
+		# Whole Periods Missed Since the Deadline Count as Skipped Cycles
+		if stage.next_run: stage.skipped += int((now - stage.next_run) // interval)
+
+		# Not Enough Budget on Some Venue -> Retry When Tokens Refill
+		wait = max([self.buckets[v].wait_time(w) for v, w in stage.weights.items()] + [0])
+		if wait > 0:
+			stage.throttled += 1
+			stage.throttle_count.inc()
+			stage.next_run = now + wait
+			return
+
+		for v, w in stage.weights.items(): self.buckets[v].take(w)
+
+		t0 = time.perf_counter()
+		stage.fn()
+		runtime = time.perf_counter() - t0
+
+		stage.runs += 1
+		stage.runtime_total += runtime
+		stage.runtime_max = max(stage.runtime_max, runtime)
+		stage.runtime_hist.observe(runtime * 1000)
+		if runtime > interval:
+			stage.overruns += 1
+			stage.overrun_count.inc()
+
+		stage.next_run = now + interval
+		return
+
+	def run_once(self):
+
+		now = self.clock()
+		scale = self.scale(now)
+
+		# Stages Run in Registration Order so Data Flows Downstream Within a Cycle
+		for stage in self.stages:
+			if now >= stage.next_run:
+				self.run_stage(stage, now, scale)
+				now = self.clock()
+
+		if now - self.last_report >= self.config['loop_report_interval']: self.report(now, scale)
+
+		return min(s.next_run for s in self.stages)
+
+	def run(self):
+
+		while True:
+			next_run = self.run_once()
+			delay = next_run - self.clock()
+			if delay > 0: self.sleep(delay)
+
+	def report(self, now, scale):
+
+		self.logger.info({
+			'event': 'loop_stats',
+			'scale': scale,
+			'vol_bps': round(self.vol_bps(), 3),
+			'seconds_to_funding': round(self.seconds_to_funding(now), 3),
+			'budget': {v: round(b.tokens, 1) for v, b in self.buckets.items()},
+			'stages': {s.name: s.stats() for s in self.stages}
+		})
+		self.last_report = now
+
+		return
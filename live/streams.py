@@ -0,0 +1,82 @@
+import json
+import time
+import logging
+import threading
+import traceback
+import websocket
+
+from live.metrics import REGISTRY
+
+
+class StreamThread(threading.Thread):
+
+	# Websocket Connection Running on a Background Thread
+	# Reconnects on Drop and Resends Subscriptions on Every Open
+	# Handler Exceptions (Fills / Order Updates, Which Trigger Hedges) are Logged with
+	# Traceback to the 'live' Logger Tagged with the Owning Strategy, and Counted
+
+	def __init__(self, name, url, on_message, subscriptions=None, keepalive=None, keepalive_interval=30, strategy='main'):
+		super().__init__(name=name, daemon=True)
+		self.url = url
+		self.on_message = on_message
+		self.subscriptions = subscriptions or []
+		self.keepalive = keepalive
+		self.keepalive_interval = keepalive_interval
+		self.ws = None
+		self.running = True
+		self.strategy = strategy
+		self.logger = logging.getLogger('live')
+		self.errors = REGISTRY.counter('swallowed_errors_total', 'Exceptions caught and not re-raised', site='stream', strategy=strategy)
+
+	def run(self):
+
+		# Periodic Keepalive (Pings / Listen Key Renewal)
+		if self.keepalive:
+			threading.Thread(target=self._keepalive_loop, name=f'{self.name}-keepalive', daemon=True).start()
+
+		while self.running:
+			self.ws = websocket.WebSocketApp(
+				self.url() if callable(self.url) else self.url,
+				on_open=self._on_open,
+				on_message=self._on_message
+				)
+			self.ws.run_forever()
+
+			# Back Off Before Reconnecting
+			if self.running: time.sleep(1)
+
+		return
+
+	def _on_open(self, ws):
+		for sub in self.subscriptions:
+			ws.send(json.dumps(sub))
+		return
+
+	def _on_message(self, ws, message):
+		try: self.on_message(json.loads(message))
+		except Exception as e:
+			self.errors.inc()
+			self.logger.error({
+				'event': 'stream_error',
+				'stream': self.name,
+				'strategy': self.strategy,
+				'error': repr(e),
+				'traceback': traceback.format_exc()
+			})
+		return
+
+	def _keepalive_loop(self):
+		while self.running:
+			time.sleep(self.keepalive_interval)
+			try: self.keepalive(self.ws)
+			except Exception: pass
+		return
+
+	def send(self, msg):
+		self.ws.send(json.dumps(msg))
+		return
+
+	def stop(self):
+		self.running = False
+		if self.ws: self.ws.close()
+		return
@@ -0,0 +1,102 @@
+import time
+import threading
+import multiprocessing as mp
+
+
+class Component:
+
+	def __init__(self, name, target, args, snapshot=None):
+		self.name = name
+		self.target = target
+		self.args = args
+		self.snapshot = snapshot
+		self.proc = None
+		self.started = 0
+		self.restarts = 0
+		self.failures = 0
+		self.next_start = 0
+
+
+class Supervisor(threading.Thread):
+
+	# Starts Component Processes and Restarts Any That Exit or Stop Heartbeating
+	# (Snapshot Older than supervisor_stale_s), with Exponential Backoff Between Attempts
+	# Processes are Spawned (Not Forked) so They Don't Inherit the Parent's Threads / Sockets
+
+	def __init__(self, config, logger, ctx=None):
+		super().__init__(name='supervisor', daemon=True)
+		self.config = config
+		self.logger = logger
+		self.ctx = ctx or mp.get_context('spawn')
+		self.components = []
+		self.stop_event = threading.Event()
+
+	def add(self, name, target, args, snapshot=None):
+		self.components.append(Component(name, target, args, snapshot))
+		return
+
+	def launch(self, c):
+		c.proc = self.ctx.Process(target=c.target, args=c.args, name=c.name, daemon=True)
+		c.proc.start()
+		c.started = time.time()
+		return
+
+	def check(self):
+
+		now = time.time()
+		stale_ms = self.config['supervisor_stale_s'] * 1000
+		for c in self.components:
+			alive = c.proc is not None and c.proc.is_alive()
+
+			# Hung: Alive but No Heartbeat Since Start-Up Grace Ran Out
+			if alive and c.snapshot is not None and now - c.started > self.config['supervisor_stale_s'] and c.snapshot.age_ms() > stale_ms:
+				c.proc.terminate()
+				c.proc.join(5)
+				if c.proc.is_alive(): c.proc.kill()
+				alive = False
+
+			if alive or now < c.next_start: continue
+
+			if c.proc is not None:
+				# Healthy Long Enough -> Forget Earlier Failures
+				if now - c.started > self.config['supervisor_backoff_max_s']: c.failures = 0
+				c.failures += 1
+				c.restarts += 1
+				delay = min(self.config['supervisor_backoff_s'] * 2 ** (c.failures - 1), self.config['supervisor_backoff_max_s'])
+				self.logger.info({
+					'event': 'component_restart',
+					'component': c.name,
+					'exitcode': c.proc.exitcode,
+					'restarts': c.restarts,
+					'backoff_s': delay
+				})
+				c.proc = None
+				c.next_start = now + delay
+				continue
+
+			self.launch(c)
+
+		return
+
+	def run(self):
+		while not self.stop_event.is_set():
+			self.check()
+			self.stop_event.wait(self.config['supervisor_interval_s'])
+		return
+
+	def start(self):
+		for c in self.components: self.launch(c)
+		super().start()
+		return
+
+	def stop(self):
+		self.stop_event.set()
+		for c in self.components:
+			if c.proc is not None and c.proc.is_alive():
+				c.proc.terminate()
+				c.proc.join(5)
+		return
+
+	def stats(self):
+		return {c.name: {'restarts': c.restarts, 'alive': c.proc is not None and c.proc.is_alive(),
+			**(c.snapshot.stats() if c.snapshot is not None else {})} for c in self.components}
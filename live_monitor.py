@@ -1,3 +1,4 @@
+import sys
 import yaml
 import uvicorn
 from pathlib import Path
@@ -5,7 +6,7 @@ from dotenv import load_dotenv, find_dotenv
 
 from monitoring.app import app
 
-def main():
+def main(args):
 
 	# Load Config
 	BASE_DIR = Path(__file__).resolve().parent
@@ -21,4 +22,4 @@ def main():
 	return
 
 if __name__ == '__main__':
-	main()
\ No newline at end of file
+	main(sys.argv)
\ No newline at end of file
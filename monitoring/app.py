@@ -1,103 +1,110 @@
-import json
 import yaml
+import asyncio
 from pathlib import Path
-from collections import deque
-from fastapi import FastAPI, Response
+from contextlib import asynccontextmanager
+from fastapi import FastAPI, Request, Response
+from fastapi.responses import StreamingResponse
+
+from monitoring.follower import MonitorState, LogFollower
+from monitoring.stream import Broadcaster
+from monitoring.timeseries import TimeSeriesStore
 
 # Load Config
 BASE_DIR = Path(__file__).resolve().parent.parent
 with open(BASE_DIR / "config.yaml", "r") as f: config = yaml.safe_load(f)
 
-# Load Log File
+# Follow the Log File in the Background; Requests Read the In-Memory State
 LOGFILE = Path(__file__).parent.parent / "logs" / "production.log"
+monitor_state = MonitorState()
+follower = LogFollower(LOGFILE, monitor_state, config["monitor_poll_s"], config["monitor_bootstrap_bytes"])
+history = TimeSeriesStore(config["ts_levels"], config["ts_max_points"])
+monitor_state.listeners.append(history.on_event)
+broadcaster = Broadcaster(monitor_state, config["monitor_client_queue"], config["monitor_heartbeat_s"])
+
+@asynccontextmanager
+async def lifespan(app):
+	broadcaster.attach(asyncio.get_running_loop())
+	follower.start()
+	yield
+	follower.stop()
+
+
+app = FastAPI(lifespan=lifespan)
 
-def tail_log_entries():
-	with LOGFILE.open("r", encoding="utf-8") as f:
-		last_lines = deque(f, maxlen=config["tail_lines"])
-	return list(last_lines)
-
-def parse_entries(lines):
-	entries = []
-	for line in lines:
-		try:
-			ts, level, payload = line.strip().split(' ', 2)
-			data = json.loads(payload)
-			data["timestamp"] = ts
-			data["level"] = level
-			entries.append(data)
-		except Exception:
-			continue
-	return entries
-
-def aggregate_state(entries):
-
-	state = {"positions": {}, "live_orders": {}}
-	for e in entries:
-		evt = e.get("event")
-		if evt == "position_snapshot":
-			state["positions"] = {
-				"bn_cash": e["bn_cash"],
-				"hl_cash": e["hl_cash"],
-				"bn_positions": e["bn_positions"],
-				"hl_positions": e["hl_positions"]
-			}
-		elif evt == "live_orders":
-			state["live_orders"] = e["order_data"]
-	return state
-
-
-app = FastAPI()
+# Client: Tables are Filled by the Snapshot Event and Patched by Row Deltas
+SCRIPT = """
+const seen = {v: -1};
+function patch(msg) {
+	if (msg.reset) seen.v = msg.v; else if (msg.v <= seen.v) return; else seen.v = msg.v;
+	for (const [name, d] of Object.entries(msg.tables)) {
+		const body = document.getElementById(name);
+		if (msg.reset) body.replaceChildren();
+		for (const k of d.remove) document.getElementById(name + '/' + k)?.remove();
+		for (const [k, row] of Object.entries(d.upsert)) {
+			let tr = document.getElementById(name + '/' + k);
+			if (!tr) { tr = document.createElement('tr'); tr.id = name + '/' + k; body.appendChild(tr); }
+			tr.replaceChildren(...row.map(x => { const td = document.createElement('td'); td.textContent = x; return td; }));
+		}
+	}
+	if (msg.meta) document.getElementById('slo').textContent = msg.meta.slo;
+}
+const es = new EventSource('stream');
+es.addEventListener('snapshot', e => patch(JSON.parse(e.data)));
+es.addEventListener('delta', e => patch(JSON.parse(e.data)));
+"""
 
 @app.get('/')
 async def home():
 
-	lines = tail_log_entries()
-	entries = parse_entries(lines)
-	state = aggregate_state(entries)
-
-	# build HTML
+	# Static Shell; Live Content Arrives over /stream
 	html = [
 		"<html><head>",
-		'<meta http-equiv="refresh" content="2">',
 		"<style>table,th,td{border:1px solid #ccc;border-collapse:collapse;padding:4px}</style>",
 		"</head><body>"
 	]
 
 	# Positions table
 	html.append(
-		"<h2>Positions</h2><table><tr>"
-		"<th>Exchange</th><th>Asset</th><th>Size</th><th>Cost Basis</th></tr>"
+		"<h2>Positions</h2><table><thead><tr>"
+		"<th>Strategy</th><th>Exchange</th><th>Asset</th><th>Size</th><th>Cost Basis</th></tr></thead>"
+		'<tbody id="positions"></tbody></table>'
 	)
-	for exch in ("bn_positions","hl_positions"):
-		for asset, pos in state["positions"].get(exch, {}).items():
-			
-			size = pos["position"]
-			cb = pos.get("cost_basis","—")
-			html.append(
-				f"<tr><td>{exch[:2].upper()}</td><td>{asset}</td>"
-				f"<td>{size}</td><td>{cb}</td></tr>"
-			)
-	html.append("</table>")
 	html.append("</br>")
 
 	# Open orders table
 	html.append(
-		"<h2>Open Orders</h2><table>"
-		"<tr><th>Asset</th><th>Side</th><th>Amount</th><th>Price</th>"
+		"<h2>Open Orders</h2><table><thead>"
+		"<tr><th>Strategy</th><th>Asset</th><th>Side</th><th>Amount</th><th>Price</th></tr></thead>"
+		'<tbody id="orders"></tbody></table>'
 	)
+	html.append("</br>")
 
-	# print(state['live_orders'])
-	for asset in state["live_orders"]:
-		for oid in state["live_orders"][asset]['hl']:
-			html.append(
-				"<tr>"
-				f"<td>{asset}</td>"
-				f"<td>{state['live_orders'][asset]['hl'][oid].get('side')}</td>"
-				f"<td>{state['live_orders'][asset]['hl'][oid].get('amount')}</td>"
-				f"<td>{state['live_orders'][asset]['hl'][oid].get('price')}</td>"
-				
-				"</tr>"
-			)
-	html.append("</table>")
+	# Hedge latency table (fill-detect -> hedge-ack)
+	html.append(
+		'<h2>Hedge Latency (SLO <span id="slo"></span> ms)</h2><table><thead>'
+		"<tr><th>Strategy</th><th>Asset</th><th>Count</th><th>p50 (ms)</th><th>p99 (ms)</th><th>SLO Breaches</th></tr></thead>"
+		'<tbody id="latency"></tbody></table>'
+	)
+	html.append(f"<script>{SCRIPT}</script>")
 	html.append("</body></html>")
-	return Response(content="".join(html), media_type="text/html")
\ No newline at end of file
+	return Response(content="".join(html), media_type="text/html")
+
+
+@app.get('/stream')
+async def stream(request: Request):
+
+	# Server-Sent Events: Full Snapshot on Connect, then Position / Order / Latency Row Deltas
+	return StreamingResponse(broadcaster.events(request), media_type="text/event-stream",
+		headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"})
+
+
+@app.get('/series')
+async def series(names: str = "", start: float = None, end: float = None, points: int = None):
+
+	# History of position_snapshot Series (equity, cash, <asset>.net_position, ...) over [start, end] ms,
+	# Prefixed <strategy>. for Hosted Strategies
+	# Defaults to the Last Day; Omitting names Lists What is Available
+	if not names: return {"names": history.names()}
+	end = end if end is not None else history.latest() or 0
+	start = start if start is not None else end - 86400000
+	return history.query(names.split(","), start, end, points)
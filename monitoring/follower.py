@@ -0,0 +1,174 @@
+import os
+import json
+import threading
+
+# Name of the Single Strategy Run by run_live.py (Its Events Carry No strategy Tag)
+STRATEGY = "main"
+
+
+def parse_line(line):
+
+	# "<ts> <LEVEL> <json>" -> Dict, None for Anything Unparseable
+	try:
+		ts, level, payload = line.strip().split(' ', 2)
+		data = json.loads(payload)
+		data["timestamp"] = ts
+		data["level"] = level
+		return data
+	except Exception:
+		return None
+
+
+class MonitorState:
+
+	# Latest Value per Tracked Event and Strategy, Folded in as Lines Arrive
+	# (Hosted Strategies Share One Log and Tag Events with `strategy`; Untagged is STRATEGY)
+	# version Bumps on Every Change; Listeners are Called (on the Follower Thread) with the Entry
+
+	def __init__(self):
+		self.lock = threading.Lock()
+		self.positions = {}
+		self.live_orders = {}
+		self.hedge_latency = {}
+		self.version = 0
+		self.lines = 0
+		self.updated = None
+		self.listeners = []
+
+	def apply(self, e):
+
+		evt = e.get("event")
+		strategy = e.get("strategy", STRATEGY)
+		if evt == "position_snapshot":
+			positions = {
+				"bn_cash": e["bn_cash"],
+				"hl_cash": e["hl_cash"],
+				"bn_positions": e["bn_positions"],
+				"hl_positions": e["hl_positions"]
+			}
+			with self.lock: self.positions = {**self.positions, strategy: positions}
+		elif evt == "live_orders":
+			with self.lock: self.live_orders = {**self.live_orders, strategy: e["order_data"]}
+		elif evt == "hedge_latency":
+			with self.lock: self.hedge_latency = {**self.hedge_latency, strategy: e}
+		else:
+			return False
+
+		with self.lock:
+			self.version += 1
+			self.updated = e["timestamp"]
+		for fn in self.listeners: fn(e)
+		return True
+
+	def snapshot(self):
+
+		# Shallow Copy Under the Lock; Event Payloads are Replaced, Never Mutated
+		with self.lock:
+			return {
+				"positions": self.positions,
+				"live_orders": self.live_orders,
+				"hedge_latency": self.hedge_latency,
+				"version": self.version,
+				"updated": self.updated
+			}
+
+
+class LogFollower:
+
+	# Background Tail of production.log: Tracks the Byte Offset and Parses Only New Lines
+	# Rotation (RotatingFileHandler Renames the File) is Detected by Inode / Truncation;
+	# the Old Handle is Drained Before Switching so No Lines are Lost Across the Rename
+	# Start-Up Reads Only the Last bootstrap_bytes Instead of the Whole File
+
+	def __init__(self, path, state, poll_interval, bootstrap_bytes, chunk_size=1 << 20):
+		self.path = str(path)
+		self.state = state
+		self.poll_interval = poll_interval
+		self.bootstrap_bytes = bootstrap_bytes
+		self.chunk_size = chunk_size
+
+		self.f = None
+		self.inode = None
+		self.offset = 0
+		self.partial = b""
+		self.stop_event = threading.Event()
+		self.thread = None
+
+	def open(self, bootstrap):
+		try:
+			f = open(self.path, "rb")
+		except FileNotFoundError:
+			return False
+
+		st = os.fstat(f.fileno())
+		self.f, self.inode, self.partial = f, st.st_ino, b""
+		self.offset = max(st.st_size - self.bootstrap_bytes, 0) if bootstrap else 0
+		f.seek(self.offset)
+
+		# Mid-File Start: Drop the First (Partial) Line
+		if self.offset: self.offset += len(f.readline())
+		return True
+
+	def close(self):
+		if self.f: self.f.close()
+		self.f = None
+		return
+
+	def drain(self):
+
+		# Read to EOF from the Current Offset, Folding Complete Lines into State
+		n = 0
+		while True:
+			chunk = self.f.read(self.chunk_size)
+			if not chunk: break
+			self.offset += len(chunk)
+
+			lines = (self.partial + chunk).split(b"\n")
+			self.partial = lines.pop()
+			for line in lines:
+				e = parse_line(line.decode("utf-8", errors="replace"))
+				if e is not None: self.state.apply(e)
+			n += len(lines)
+
+		self.state.lines += n
+		return n
+
+	def poll(self):
+
+		if self.f is None and not self.open(bootstrap=self.inode is None): return 0
+		n = self.drain()
+
+		try:
+			st = os.stat(self.path)
+		except FileNotFoundError:
+			return n
+
+		# Rotated (New Inode) or Truncated in Place -> Reopen from the Start
+		if st.st_ino != self.inode or st.st_size < self.offset:
+			n += self.drain()
+			self.close()
+			if self.open(bootstrap=False): n += self.drain()
+
+		return n
+
+	def run(self):
+		while not self.stop_event.is_set():
+			try:
+				self.poll()
+			except OSError:
+				self.close()
+			self.stop_event.wait(self.poll_interval)
+		self.close()
+		return
+
+	def start(self):
+		if self.thread and self.thread.is_alive(): return
+		self.stop_event.clear()
+		self.thread = threading.Thread(target=self.run, name="log_follower", daemon=True)
+		self.thread.start()
+		return
+
+	def stop(self):
+		self.stop_event.set()
+		if self.thread: self.thread.join()
+		return
@@ -0,0 +1,134 @@
+import json
+import asyncio
+import threading
+
+
+def fmt(value):
+	return "—" if value is None else value
+
+
+def flatten(evt, state):
+
+	# One Dashboard Table per Event, as {row_key: [cells]}, Rows of Every Strategy
+	if evt == "position_snapshot":
+		rows = {}
+		for strategy, positions in state["positions"].items():
+			for exch in ("bn_positions", "hl_positions"):
+				for asset, pos in positions.get(exch, {}).items():
+					ex = exch[:2].upper()
+					rows[f"{strategy}:{ex}:{asset}"] = [strategy, ex, asset, pos["position"], fmt(pos.get("cost_basis"))]
+		return "positions", rows
+
+	if evt == "live_orders":
+		rows = {}
+		for strategy, live_orders in state["live_orders"].items():
+			for asset, orders in live_orders.items():
+				for oid, o in orders.get("hl", {}).items():
+					rows[f"{strategy}:{asset}:{oid}"] = [strategy, asset, o.get("side"), o.get("amount"), o.get("price")]
+		return "orders", rows
+
+	if evt == "hedge_latency":
+		rows = {}
+		for strategy, latency in state["hedge_latency"].items():
+			for asset, lat in latency.get("latency", {}).items():
+				hist = lat["detect_to_ack"]
+				rows[f"{strategy}:{asset}"] = [strategy, asset, hist["count"], hist["p50"], hist["p99"], lat["slo_breaches"]]
+		return "latency", rows
+
+	return None, None
+
+
+def diff(prev, cur):
+	upsert = {k: row for k, row in cur.items() if prev.get(k) != row}
+	remove = [k for k in prev if k not in cur]
+	return upsert, remove
+
+
+def sse(event, data):
+	return f"event: {event}\ndata: {json.dumps(data, separators=(',', ':'), default=str)}\n\n"
+
+
+class Client:
+
+	def __init__(self, queue_size):
+		self.queue = asyncio.Queue(maxsize=queue_size)
+		self.resync = False
+
+
+class Broadcaster:
+
+	# Turns State Changes into Row Deltas Once, then Fans the Same Encoded Message Out
+	# Work per Event is Independent of the Number of Clients Beyond a Queue Put Each
+	# A Client Whose Queue Fills (Slow Reader) is Flagged and Sent a Fresh Snapshot Instead
+
+	def __init__(self, state, queue_size, heartbeat_s):
+		self.state = state
+		self.queue_size = queue_size
+		self.heartbeat_s = heartbeat_s
+		self.lock = threading.Lock()
+		self.tables = {"positions": {}, "orders": {}, "latency": {}}
+		self.meta = {"slo": None}
+		self.version = 0
+		self.clients = set()
+		self.loop = None
+		state.listeners.append(self.on_change)
+
+	def attach(self, loop):
+		self.loop = loop
+		return
+
+	def on_change(self, e):
+
+		# Follower Thread: Diff Only the Table the Event Touches
+		state = self.state.snapshot()
+		name, rows = flatten(e["event"], state)
+		if name is None: return
+
+		with self.lock:
+			upsert, remove = diff(self.tables[name], rows)
+			self.tables[name] = rows
+			meta = {"slo": next((h.get("slo_ms") for h in state["hedge_latency"].values()), None)}
+			meta_changed = meta != self.meta
+			self.meta = meta
+			self.version = state["version"]
+			if not (upsert or remove or meta_changed): return
+			msg = {"v": self.version, "tables": {name: {"upsert": upsert, "remove": remove}}}
+			if meta_changed: msg["meta"] = meta
+
+		if self.loop is not None and self.clients:
+			self.loop.call_soon_threadsafe(self.fanout, sse("delta", msg))
+		return
+
+	def fanout(self, msg):
+		for client in self.clients:
+			if client.resync: continue
+			try:
+				client.queue.put_nowait(msg)
+			except asyncio.QueueFull:
+				client.resync = True
+		return
+
+	def snapshot(self):
+		with self.lock:
+			tables = {name: {"upsert": dict(rows), "remove": []} for name, rows in self.tables.items()}
+			return sse("snapshot", {"v": self.version, "reset": True, "tables": tables, "meta": self.meta})
+
+	async def events(self, request):
+
+		client = Client(self.queue_size)
+		self.clients.add(client)
+		try:
+			yield self.snapshot()
+			while not await request.is_disconnected():
+				if client.resync:
+					while not client.queue.empty(): client.queue.get_nowait()
+					client.resync = False
+					yield self.snapshot()
+					continue
+				try:
+					yield await asyncio.wait_for(client.queue.get(), self.heartbeat_s)
+				except asyncio.TimeoutError:
+					yield ": keepalive\n\n"
+		finally:
+			self.clients.discard(client)
+		return
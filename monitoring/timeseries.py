@@ -0,0 +1,174 @@
+import threading
+import numpy as np
+from datetime import datetime
+
+
+def snapshot_values(e):
+
+	# position_snapshot -> (t_ms, {series: value})
+	risk = e.get("risk") or {}
+	t = risk.get("t")
+	if t is None: t = e.get("t")
+	if t is None: t = datetime.fromisoformat(e["timestamp"]).timestamp() * 1000
+
+	values = {"bn_cash": e["bn_cash"], "hl_cash": e["hl_cash"]}
+	if risk.get("equity") is not None:
+		values["equity"] = risk["equity"]
+		values["drawdown"] = risk["drawdown"]
+
+	assets = set(e["bn_positions"]) | set(e["hl_positions"])
+	for asset in assets:
+		bn = e["bn_positions"].get(asset, {}).get("position", 0)
+		hl = e["hl_positions"].get(asset, {}).get("position", 0)
+		values[f"{asset}.bn_position"] = bn
+		values[f"{asset}.hl_position"] = hl
+		values[f"{asset}.net_position"] = bn + hl
+
+	return t, values
+
+
+class Ring:
+
+	# Fixed-Capacity Ring of Buckets, One Column per Series
+	# resolution 0 Keeps Every Sample; Otherwise Samples in the Same Bucket Fold into min / max / last
+
+	def __init__(self, resolution_s, capacity):
+		self.resolution = resolution_s * 1000
+		self.capacity = capacity
+		self.t = np.zeros(capacity)
+		self.min = np.full((capacity, 0), np.nan)
+		self.max = np.full((capacity, 0), np.nan)
+		self.last = np.full((capacity, 0), np.nan)
+		self.head = 0
+		self.size = 0
+		self.bucket = None
+		self.first = None
+
+	def widen(self, m):
+		pad = np.full((self.capacity, m - self.min.shape[1]), np.nan)
+		self.min = np.hstack([self.min, pad])
+		self.max = np.hstack([self.max, pad])
+		self.last = np.hstack([self.last, pad])
+		return
+
+	def add(self, t, x):
+
+		if x.shape[0] > self.min.shape[1]: self.widen(x.shape[0])
+		bucket = t // self.resolution if self.resolution else None
+
+		# Same Bucket -> Fold In (Late Samples Fold into the Open Bucket Too)
+		if self.resolution and self.size and bucket <= self.bucket:
+			i = (self.head - 1) % self.capacity
+			self.min[i] = np.fmin(self.min[i], x)
+			self.max[i] = np.fmax(self.max[i], x)
+			self.last[i] = np.where(np.isnan(x), self.last[i], x)
+			return
+
+		if self.first is None: self.first = t
+		i = self.head
+		self.t[i] = bucket * self.resolution if self.resolution else t
+		self.min[i] = self.max[i] = self.last[i] = x
+		self.head = (self.head + 1) % self.capacity
+		self.size = min(self.size + 1, self.capacity)
+		self.bucket = bucket
+		return
+
+	def ordered(self):
+		return (self.head - self.size + np.arange(self.size)) % self.capacity
+
+	def start(self):
+		return self.t[(self.head - self.size) % self.capacity] if self.size else None
+
+	def oldest(self):
+
+		# Time of the Oldest Retained Sample (Bucket Starts Only Once Wrapped)
+		return self.first if self.size < self.capacity else self.start()
+
+
+class TimeSeriesStore:
+
+	# position_snapshot History at Several Resolutions (raw, 1m, 15m, 1h by Default)
+	# Memory is Bounded by the Ring Capacities; Queries Pick the Finest Level Covering
+	# the Window and Merge Adjacent Buckets Down to max_points
+
+	def __init__(self, levels, max_points):
+		self.levels = {name: Ring(res, cap) for name, (res, cap) in levels.items()}
+		self.max_points = max_points
+		self.columns = {}
+		self.lock = threading.Lock()
+
+	def on_event(self, e):
+
+		# Hosted Strategies' Series are Prefixed with Their Name so Accounts Never Mix
+		if e.get("event") != "position_snapshot": return
+		t, values = snapshot_values(e)
+		strategy = e.get("strategy")
+		if strategy: values = {f"{strategy}.{k}": v for k, v in values.items()}
+		self.add(t, values)
+		return
+
+	def add(self, t, values):
+		with self.lock:
+			for name in values:
+				if name not in self.columns: self.columns[name] = len(self.columns)
+			x = np.full(len(self.columns), np.nan)
+			for name, v in values.items(): x[self.columns[name]] = np.nan if v is None else v
+			for ring in self.levels.values(): ring.add(t, x)
+		return
+
+	def names(self):
+		with self.lock: return list(self.columns)
+
+	def latest(self):
+		with self.lock:
+			ring = next(iter(self.levels.values()))
+			return ring.t[(ring.head - 1) % ring.capacity] if ring.size else None
+
+	def choose(self, start):
+
+		# Finest Level Whose Retained History Reaches Back to start
+		# (or as Far Back as Any Level Does, e.g. Shortly After Start-Up)
+		oldest = [ring.oldest() for ring in self.levels.values() if ring.size]
+		start = max(start, min(oldest)) if oldest else start
+		for name, ring in self.levels.items():
+			if ring.size and ring.oldest() <= start: return name
+		return name
+
+	def query(self, names, start, end, max_points=None):
+
+		max_points = min(max_points or self.max_points, self.max_points)
+		with self.lock:
+			level = self.choose(start)
+			ring = self.levels[level]
+			idx = ring.ordered()
+			t = ring.t[idx]
+			lo, hi = np.searchsorted(t, start, side="left"), np.searchsorted(t, end, side="right")
+			idx, t = idx[lo:hi], t[lo:hi]
+			names = [n for n in names if n in self.columns]
+			cols = [self.columns[n] for n in names]
+			mn, mx, last = ring.min[idx][:, cols], ring.max[idx][:, cols], ring.last[idx][:, cols]
+
+		# Merge Runs of k Buckets: min of Mins, max of Maxes, Last Non-NaN Last
+		k = -(-len(t) // max_points) if len(t) > max_points else 1
+		if k > 1:
+			starts = np.arange(0, len(t), k)
+			t = t[starts]
+			mn = np.fmin.reduceat(mn, starts, axis=0)
+			mx = np.fmax.reduceat(mx, starts, axis=0)
+			filled = np.where(np.isnan(last), -1, np.arange(len(last))[:, None])
+			pos = np.maximum.reduceat(filled, starts, axis=0)
+			last = np.where(pos >= 0, last[np.maximum(pos, 0), np.arange(last.shape[1])], np.nan)
+
+		series = {}
+		for j, name in enumerate(names):
+			series[name] = {
+				"min": to_list(mn[:, j]),
+				"max": to_list(mx[:, j]),
+				"last": to_list(last[:, j])
+			}
+
+		return {"level": level, "bucket": k, "t": t.astype(np.int64).tolist(), "series": series}
+
+
+def to_list(x):
+	return [None if np.isnan(v) else v for v in x.tolist()]
@@ -1,39 +1,285 @@
 import copy
+import time
+import numpy as np
+
+from risk.trackers import RiskTrackers
+
+VENUES = ('binance', 'hl')
 
-# UNIMPLEMENTED MODULE
 
 class RiskManager:
-    def __init__(self, config):
-        self.config = copy.deepcopy(config)
 
-    # Vetting Trade Intents against Portfolios
-    def perform_checks(self, state, intents, bn_port, hl_port):
+	# Vectorized Checks over Arrays of Intents and Positions
+	# Limits are Precomputed per Asset; Positions (for Margin / Exposure) are Cached
+	# and Moved Incrementally by on_fill, Re-Synced from the Portfolios on Reconcile
+	# Intents are Expressed as a Signed HL Quantity, the Binance Hedge is the Opposite Leg
+
+	def __init__(self, config):
+		self.config = copy.deepcopy(config)
+		self.assets = list(config['assets'])
+		self.index = {a: i for i, a in enumerate(self.assets)}
+
+		# Precomputed Limit Tables
+		overrides = config['risk_asset_limits'] or {}
+		self.position_limit = np.array([overrides.get(a, config['max_position_size']) for a in self.assets], dtype=float)
+		self.gross_limit = config['max_gross_exposure']
+		self.basis_limit = config['max_basis_bps'] / 1e4
+		self.margin_rate = np.array([1 / config['leverage'][v] for v in VENUES])
+		self.max_margin_ratio = config['max_margin_ratio']
+		self.max_concentration = config['max_concentration']
+		self.liquidity_frac = config['risk_liquidity_frac']
+		self.derisk_frac = config['derisk_frac']
+
+		# Backtest Row Columns Read by view()
+		self.view_cols = ['binance_mark_price', 'hl_mark_price', 'binance_perp_volume', 'hl_perp_volume', 'binance_perp_price', 'hl_perp_price']
+		self.tables = {}
+
+		# Streaming Drawdown / PnL / Volatility / Liquidity State (Fed by the Caller)
+		self.trackers = RiskTrackers(config, self.assets)
+		self.max_drawdown = config['max_drawdown']
+		self.max_pnl_shock = config['max_pnl_shock']
+		self.vol_spike_mult = config['vol_spike_mult']
+		self.liquidity_drop_frac = config['liquidity_drop_frac']
+		self.liquidity_drop_backtest = config['liquidity_drop_backtest']
+		self.tracker_warmup = config['tracker_warmup']
+
+		# Assets Where excess_risk Found a Breach Take No New Risk
+		self.blocked = np.zeros(len(self.assets), dtype=bool)
+
+		# Margin Cache: Positions and Cost Basis per (Venue, Asset); Venues Whose Cash is a
+		# Wallet Balance (cash_nets_notional False) Mark Equity as Cash + Unrealized PnL
+		self.positions = np.zeros((len(VENUES), len(self.assets)))
+		self.basis = np.zeros((len(VENUES), len(self.assets)))
+		self.nets = np.ones(len(VENUES), dtype=bool)
+		self.cash = 0
+		self.synced = False
+
+		# Per-Call Latency Against Budget
+		self.budget = config['risk_latency_budget_us'] / 1e6
+		self.calls = 0
+		self.overruns = 0
+		self.max_latency = 0
+
+	def sync(self, bn_port, hl_port):
+
+		# Full Reload (Start-Up and After REST Reconciles)
+		for v, port in enumerate((bn_port, hl_port)):
+			self.nets[v] = port.cash_nets_notional
+			for asset, pos in port.positions.items():
+				if asset not in self.index: continue
+				self.positions[v, self.index[asset]] = pos['position']
+				self.basis[v, self.index[asset]] = pos['cost_basis']
+		self.synced = True
+		return
+
+	def on_fill(self, exch, asset, fill):
+
+		# Fill Handler Signature Shared with OrderState
+		if asset not in self.index: return
+		v, i = VENUES.index(exch), self.index[asset]
+		pos = self.positions[v, i]
+		qty = fill['size'] if fill['side'] == 'buy' else -fill['size']
+		new_pos = pos + qty
+
+		# Average Cost (Same Rules as the Portfolios): Adding Re-Averages, Flipping Resets
+		if abs(new_pos) < 1e-12: self.basis[v, i] = 0
+		elif pos == 0 or (pos > 0) == (qty > 0): self.basis[v, i] = (pos * self.basis[v, i] + qty * fill['price']) / new_pos
+		elif abs(qty) > abs(pos): self.basis[v, i] = fill['price']
+
+		self.positions[v, i] = new_pos
+		return
+
+	def load(self, historical_data):
+
+		# Backtest Only: Precompute the Columns view() Reads, Indexed by Row Label
+		# (State Rows are Slices of These Frames, so Their Label is the Table Row)
+		import pandas as pd
+		self.tables = {}
+		for asset, df in historical_data.items():
+			if asset in self.index and isinstance(df.index, pd.RangeIndex) and df.index.start == 0 and df.index.step == 1:
+				self.tables[asset] = df[self.view_cols].to_numpy(dtype=float)
+		return
+
+	def view(self, state):
+
+		# Rows: Binance Price, HL Price, Tradeable Liquidity, Basis
+		# Live State is Venue-Keyed Market Data, Backtest State is Asset-Keyed Rows
+		v = np.zeros((4, len(self.assets)))
+
+		if 'binance' in state:
+			for asset, data in state['binance'].items():
+				if asset not in self.index or asset not in state['hl']: continue
+				i = self.index[asset]
+				ticker = data['ticker']
+				bn_px = (float(ticker['bidPrice']) + float(ticker['askPrice'])) / 2
+
+				hl_ticker = state['hl'][asset]['ticker']
+				bid, ask = hl_ticker.get('bid'), hl_ticker.get('ask')
+				hl_px = (bid + ask) / 2 if bid and ask else hl_ticker['last']
+
+				# Hedge Leg Depth (Either Side, Whichever is Thinner)
+				book = data['book']
+				depth = min(sum(float(q) for _, q in book['bids']), sum(float(q) for _, q in book['asks']))
+				v[:, i] = bn_px, hl_px, depth, hl_px / bn_px - 1
+
+		else:
+			for asset, df in state.items():
+				if asset not in self.index or df.empty: continue
+				table = self.tables.get(asset)
+				row = table[df.index[0]] if table is not None else df[self.view_cols].to_numpy(dtype=float)[0]
+				bn_mark, hl_mark, bn_vlm, hl_vlm, bn_px, hl_px = row
+				v[:, self.index[asset]] = bn_mark, hl_mark, min(bn_vlm, hl_vlm) * self.config['max_pov'], hl_px / bn_px - 1
+
+		v = np.nan_to_num(v)
+		return {'px': v[:2], 'liquidity': v[2] * self.liquidity_frac, 'basis': v[3]}
+
+	def exposure(self, px):
+
+		# Gross Notional, Margin Used and Equity from the Cached Positions
+		ntl = np.abs(self.positions) * px
+		gross = ntl.sum()
+		margin = ntl.sum(axis=1) @ self.margin_rate
+		equity = self.cash + (self.positions * (px - np.where(self.nets[:, None], 0, self.basis))).sum()
+		return ntl, gross, margin, equity
+
+	def check(self, idx, q, view):
+
+		px = view['px'][:, idx]
+		pos = self.positions[:, idx]
+		hl_pos = pos[1]
+
+		# Check Individual Position Limits (Reducing Trades Always Allowed)
+		lim_qty = np.divide(self.position_limit[idx], px[1], out=np.zeros(len(idx)), where=px[1] > 0)
+		allowed = np.clip(hl_pos + q, -lim_qty, lim_qty) - hl_pos
+		q = np.where(allowed * q > 0, np.sign(q) * np.minimum(np.abs(allowed), np.abs(q)), 0)
+
+		# Check Liquidity across Books (the Reducing Part of a Trade is Never Clipped;
+		# Fills are Still Capped by Venue Volume / Hedge Depth Downstream)
+		reducible = np.where(hl_pos * q < 0, np.abs(hl_pos), 0)
+		q = np.sign(q) * np.minimum(np.abs(q), np.maximum(view['liquidity'][idx], reducible))
+
+		# Check Cross-Exchange Basis Risk (No Adding Where Venues Disagree)
+		increasing = np.abs(hl_pos + q) > np.abs(hl_pos)
+		q = np.where(increasing & (np.abs(view['basis'][idx]) > self.basis_limit), 0, q)
+
+		# No Adding While excess_risk is De-Risking an Asset
+		q = np.where(increasing & self.blocked[idx], 0, q)
+
+		ntl, gross, margin, equity = self.exposure(view['px'])
+
+		# Check Portfolio Position Exposure (Both Legs), Headroom Shared Pro-Rata
+		add_hl = (np.abs(hl_pos + q) - np.abs(hl_pos)) * px[1]
+		add_bn = (np.abs(pos[0] - q) - np.abs(pos[0])) * px[0]
+		added = np.maximum(add_hl + add_bn, 0)
+		headroom = self.gross_limit - gross
+		if added.sum() > max(headroom, 0):
+			scale = max(headroom, 0) / added.sum()
+			q = np.where(added > 0, q * scale, q)
+			add_hl, add_bn = add_hl * np.where(added > 0, scale, 1), add_bn * np.where(added > 0, scale, 1)
+
+		# Check Pre-Trade/Post-Trade Margin Risk
+		added_margin = np.maximum(add_hl * self.margin_rate[1] + add_bn * self.margin_rate[0], 0)
+		headroom = self.max_margin_ratio * equity - margin
+		if added_margin.sum() > max(headroom, 0):
+			scale = max(headroom, 0) / added_margin.sum()
+			q = np.where(added_margin > 0, q * scale, q)
+
+		return q
+
+	# Vetting Trade Intents against Portfolios
+	def perform_checks(self, state, intents, bn_port, hl_port):
+
+		t0 = time.perf_counter()
+		if not intents: return []
+		if not self.synced: self.sync(bn_port, hl_port)
+		self.cash = bn_port.cash + hl_port.cash
+
+		# Backtest Intents: [[asset, qty], [buy_exch, 'buy'], [sell_exch, 'sell']]
+		# Live Intents: [asset, hl_side, size]
+		live = not isinstance(intents[0][0], list)
+		if live:
+			assets = [i[0] for i in intents]
+			q = np.array([i[2] if i[1] == 'buy' else -i[2] for i in intents], dtype=float)
+		else:
+			assets = [i[0][0] for i in intents]
+			q = np.array([i[0][1] if i[1][0] == 'hl' else -i[0][1] for i in intents], dtype=float)
+
+		known = [a in self.index for a in assets]
+		idx = np.array([self.index.get(a, 0) for a in assets])
+		q = np.where(known, self.check(idx, q, self.view(state)), 0)
+
+		trades = []
+		for intent, qty in zip(intents, np.abs(q).tolist()):
+			if qty <= 1e-12: continue
+			if live: trades.append([intent[0], intent[1], qty])
+			else: trades.append([[intent[0][0], qty], intent[1], intent[2]])
+
+		self.record_latency(time.perf_counter() - t0)
+		return trades
+
+	# Evaluating Portfolio for Risk
+	def excess_risk(self, state, bn_port, hl_port):
+
+		t0 = time.perf_counter()
+		if not self.synced: self.sync(bn_port, hl_port)
+		self.cash = bn_port.cash + hl_port.cash
+
+		view = self.view(state)
+		ntl, gross, margin, equity = self.exposure(view['px'])
+		hl_pos = self.positions[1]
+		cut = np.zeros(len(self.assets))
+		trk = self.trackers
+
+		if trk.t is not None:
+
+			# Check if Drawdown Limit Breached
+			if trk.drawdown.drawdown > self.max_drawdown: cut[:] = self.derisk_frac
+
+			# Check for Realized PnL Shocks (Any Lookback Losing More than max_pnl_shock of Peak)
+			if trk.drawdown.peak and np.nanmin(np.append(trk.pnl.pnl, 0)) < -self.max_pnl_shock * trk.drawdown.peak:
+				cut[:] = self.derisk_frac
+
+			# Check for Spike in Volatility (Fast vs Slow EWMA)
+			warm = trk.vol_slow.count >= self.tracker_warmup
+			spike = warm & (trk.vol_fast.vol() > self.vol_spike_mult * trk.vol_slow.vol())
 
-        trades = []
-        for intent in intents:
-            # Check Individual Position Limits
-            # Check Portfolio Position Exposure
-            # Check Cross-Exchange Basis Risk
-            # Check Pre-Trade/Post-Trade Margin Risk
-            # Check Liquidity across Books
-            trades.append(intent)
+			# Check for Liquidity Drop (Smoothed Depth vs Its Own Average) on Live Book Depth;
+			# Backtest Bar Volume is Too Noisy a Proxy so it is Off There Unless Enabled
+			check = 'binance' in state or self.liquidity_drop_backtest
+			drop = check & (trk.liquidity.count >= self.tracker_warmup) & (trk.liquidity.ratio < self.liquidity_drop_frac)
+			cut = np.where(spike | drop, np.maximum(cut, self.derisk_frac), cut)
 
-        return intents
+		# Check Margin Ratio / Leverage Limit -> Cut Every Position
+		if equity > 0 and margin / equity > self.max_margin_ratio: cut[:] = self.derisk_frac
 
-    # Evaluating Portfolio for Risk 
-    def excess_risk(self, state, bn_port, hl_port):
-        
-        excess_risk_orders = []
+		# Check for Excess Concentration -> Cut the Offending Assets
+		if gross > 0:
+			concentration = ntl.sum(axis=0) / gross
+			cut = np.where(concentration > self.max_concentration, np.maximum(cut, self.derisk_frac), cut)
 
-        # Check if Drawdown Limit Breached
-        # Check for Realized PnL Shocks
-        # Check Margin Ratio / Leverage Limit
-        # Check for Excess Concentration
-        # Check for Spike in Volatility
-        # Check for Liquidity Drop
+		self.blocked = cut > 0
+		excess_risk_orders = self.reduce_orders(state, -hl_pos * cut)
+		self.record_latency(time.perf_counter() - t0)
+		return excess_risk_orders
 
-        return excess_risk_orders
-        
+	def reduce_orders(self, state, q):
 
+		# Signed HL Quantities -> Orders in the Caller's Intent Format
+		live = 'binance' in state
+		orders = []
+		for asset, qty in zip(self.assets, q.tolist()):
+			if abs(qty) <= 1e-12: continue
+			if live:
+				orders.append([asset, 'buy' if qty > 0 else 'sell', abs(qty)])
+			elif qty > 0:
+				orders.append([[asset, qty], ['hl', 'buy'], ['binance', 'sell']])
+			else:
+				orders.append([[asset, -qty], ['binance', 'buy'], ['hl', 'sell']])
 
+		return orders
 
+	def record_latency(self, latency):
+		self.calls += 1
+		self.max_latency = max(self.max_latency, latency)
+		if latency > self.budget: self.overruns += 1
+		return
@@ -0,0 +1,172 @@
+import numpy as np
+
+
+# Streaming Estimators with a Common update(t, x) / snapshot() Interface
+# Every Update is O(1) in History Length (O(assets) for Per-Asset Trackers); t in ms
+
+
+class DrawdownTracker:
+
+	# Running Peak Equity and Drawdown from it
+
+	def __init__(self):
+		self.peak = None
+		self.drawdown = 0
+		self.max_drawdown = 0
+
+	def update(self, t, equity):
+		if self.peak is None or equity > self.peak: self.peak = equity
+		self.drawdown = 1 - equity / self.peak if self.peak > 0 else 0
+		self.max_drawdown = max(self.max_drawdown, self.drawdown)
+		return self.drawdown
+
+	def snapshot(self):
+		return {'peak': self.peak, 'drawdown': self.drawdown, 'max_drawdown': self.max_drawdown}
+
+
+class EwmaVolTracker:
+
+	# EWMA Variance of Log Returns per Asset, Normalized per Second
+	# Decay Scales with Elapsed Time so Irregular Updates Weigh Correctly
+
+	def __init__(self, n, halflife_s):
+		self.halflife = halflife_s * 1000
+		self.var = np.zeros(n)
+		self.last_px = np.full(n, np.nan)
+		self.last_t = np.full(n, np.nan)
+		self.count = np.zeros(n, dtype=np.int64)
+
+	def update(self, t, prices):
+
+		prices = np.asarray(prices, dtype=float)
+		valid = (prices > 0) & (self.last_px > 0) & (t > self.last_t)
+		dt = np.where(valid, t - self.last_t, 1)
+
+		r2 = np.where(valid, np.log(np.where(valid, prices / self.last_px, 1)) ** 2 / (dt / 1000), 0)
+		alpha = 1 - 0.5 ** (dt / self.halflife)
+		self.var = np.where(valid, alpha * r2 + (1 - alpha) * self.var, self.var)
+		self.count += valid
+
+		seen = prices > 0
+		self.last_px = np.where(seen, prices, self.last_px)
+		self.last_t = np.where(seen, t, self.last_t)
+		return self.vol()
+
+	def vol(self):
+		return np.sqrt(self.var)
+
+	def snapshot(self):
+		return {'vol': self.vol().tolist()}
+
+
+class RollingPnLTracker:
+
+	# Equity Sampled into a Ring Buffer of resolution_s Buckets
+	# PnL over Each Lookback is Current Equity Minus One Buffered Sample
+
+	def __init__(self, windows_s, resolution_s):
+		self.resolution = resolution_s * 1000
+		self.lags = [int(w // resolution_s) for w in windows_s]
+		self.windows = list(windows_s)
+		self.size = max(self.lags) + 1
+
+		self.equity = np.zeros(self.size)
+		self.bucket = np.full(self.size, -1, dtype=np.int64)
+		self.last_bucket = None
+		self.pnl = np.full(len(self.lags), np.nan)
+
+	def update(self, t, equity):
+
+		b = int(t // self.resolution)
+
+		# Carry the Last Sample Across Skipped Buckets (At Most One Lap)
+		if self.last_bucket is not None and b > self.last_bucket + 1:
+			prev = self.equity[self.last_bucket % self.size]
+			for k in range(max(self.last_bucket + 1, b - self.size + 1), b):
+				self.equity[k % self.size] = prev
+				self.bucket[k % self.size] = k
+
+		self.equity[b % self.size] = equity
+		self.bucket[b % self.size] = b
+		self.last_bucket = b if self.last_bucket is None else max(self.last_bucket, b)
+
+		for j, lag in enumerate(self.lags):
+			slot = (b - lag) % self.size
+			self.pnl[j] = equity - self.equity[slot] if self.bucket[slot] == b - lag else np.nan
+
+		return self.pnl
+
+	def snapshot(self):
+		return {'pnl': {str(w): (None if np.isnan(p) else float(p)) for w, p in zip(self.windows, self.pnl)}}
+
+
+class LiquidityTracker:
+
+	# Fast and Slow EWMAs of Visible Depth per Asset; the Ratio Compares Smoothed Depth
+	# with Its Own Longer Average so Sample-to-Sample Noise Does Not Read as a Drop
+
+	def __init__(self, n, halflife_s, fast_halflife_s):
+		self.halflife = halflife_s * 1000
+		self.fast_halflife = fast_halflife_s * 1000
+		self.avg = np.full(n, np.nan)
+		self.fast = np.full(n, np.nan)
+		self.last_t = np.full(n, np.nan)
+		self.ratio = np.ones(n)
+		self.count = np.zeros(n, dtype=np.int64)
+
+	def update(self, t, depth):
+
+		depth = np.asarray(depth, dtype=float)
+		seen = depth > 0
+		first = np.isnan(self.avg)
+		dt = np.maximum(np.where(first, 0, t - self.last_t), 0)
+		alpha = 1 - 0.5 ** (dt / self.halflife)
+		alpha_fast = 1 - 0.5 ** (dt / self.fast_halflife)
+
+		self.avg = np.where(seen, np.where(first, depth, alpha * depth + (1 - alpha) * self.avg), self.avg)
+		self.fast = np.where(seen, np.where(first, depth, alpha_fast * depth + (1 - alpha_fast) * self.fast), self.fast)
+		self.ratio = np.where(seen, self.fast / np.where(seen, self.avg, 1), self.ratio)
+		self.last_t = np.where(seen, t, self.last_t)
+		self.count += seen
+		return self.ratio
+
+	def snapshot(self):
+		return {'liquidity_ratio': self.ratio.tolist()}
+
+
+class RiskTrackers:
+
+	# Bundle Fed from Backtest mark_to_market and Live refresh_positions
+	# Arrays are Ordered as self.assets
+
+	def __init__(self, config, assets):
+		self.assets = list(assets)
+		self.index = {a: i for i, a in enumerate(self.assets)}
+		n = len(self.assets)
+
+		self.drawdown = DrawdownTracker()
+		self.vol_fast = EwmaVolTracker(n, config['vol_fast_halflife_s'])
+		self.vol_slow = EwmaVolTracker(n, config['vol_slow_halflife_s'])
+		self.pnl = RollingPnLTracker(config['pnl_windows_s'], config['pnl_resolution_s'])
+		self.liquidity = LiquidityTracker(n, config['liquidity_halflife_s'], config['liquidity_fast_halflife_s'])
+		self.equity = None
+		self.t = None
+
+	def update(self, t, equity, prices, depth):
+		self.t = t
+		self.equity = equity
+		self.drawdown.update(t, equity)
+		self.pnl.update(t, equity)
+		self.vol_fast.update(t, prices)
+		self.vol_slow.update(t, prices)
+		self.liquidity.update(t, depth)
+		return
+
+	def snapshot(self):
+		snapshot = {'t': self.t, 'equity': self.equity}
+		snapshot.update(self.drawdown.snapshot())
+		snapshot.update(self.pnl.snapshot())
+		snapshot['vol_fast'] = dict(zip(self.assets, self.vol_fast.vol().tolist()))
+		snapshot['vol_slow'] = dict(zip(self.assets, self.vol_slow.vol().tolist()))
+		snapshot['liquidity_ratio'] = dict(zip(self.assets, self.liquidity.ratio.tolist()))
+		return snapshot
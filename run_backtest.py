@@ -6,31 +6,55 @@ import pandas as pd
 from pathlib import Path
 from dotenv import load_dotenv, find_dotenv
 
-from data.cex_data import get_cex_data
-from data.hl_data import get_hl_data
-from data.aggregate import clean_data
-from strategy.signal import generate_signals
+from strategy.signal import funding_spread, generate_signals
 from strategy.sizing import compute_sizes
 from risk.manager import RiskManager
 from backtest.engine import backtest_strategy
-from backtest.report import export_summary
+from backtest.books import BookStore, BookFillModel
+from backtest.report import export_summary, load_results
 
+# Module Imports are What a Plain Backtest Uses; Downloaders (ccxt / boto3 / lz4) Load
+# Inside Their Stages and matplotlib Once the Report Draws
+BASE_DIR = Path(__file__).resolve().parent
 
-def main(args):
 
-	# Load Config
-	BASE_DIR = Path(__file__).resolve().parent
+def load_config():
+
 	with open(BASE_DIR / "config.yaml", "r") as f:
 		config = yaml.safe_load(f)
 
 	# Load Environment Variables
 	load_dotenv(find_dotenv())
 
+	return config
+
+
+def download(args):
+
 	# Download Historical Data
-	if len(sys.argv) > 1 and sys.argv[1] == '-d':
-		get_cex_data(config)
-		get_hl_data(config)
-		clean_data(config)
+	from data.cex_data import get_cex_data
+	from data.hl_data import get_hl_data, get_hl_books
+
+	config = load_config()
+	get_cex_data(config)
+	get_hl_data(config)
+	if config['execution_model'] == 'book': get_hl_books(config, BASE_DIR / config['tick_dir'])
+
+	return
+
+
+def clean(args):
+
+	# Merge Raw Downloads into Clean Per-Asset Tables
+	from data.aggregate import clean_data
+
+	clean_data(load_config())
+	return
+
+
+def backtest(args):
+
+	config = load_config()
 
 	# Load Historical Data
 	historical_data = {}
@@ -38,15 +62,22 @@ def main(args):
 		f = os.path.join(BASE_DIR, 'data', 'historical', 'clean', asset, f'{asset}.csv')
 		historical_data[asset] = pd.read_csv(f)
 
-	# Generate Signals and Sizes
-	signals = generate_signals(historical_data, config)
-	sizes = compute_sizes(signals, config)
+	# Generate Signals and Sizes (Spread Computed Once for Both)
+	spread = funding_spread(historical_data, config)
+	signals = generate_signals(historical_data, config, spread)
+	sizes = compute_sizes(signals, config, spread)
 
 	# Initialize Risk Manager
 	risk_mgr = RiskManager(config)
 
+	# Optional Book-Aware Fills from Recorded / Historical L2 Snapshots
+	fill_model = None
+	if config['execution_model'] == 'book':
+		store = BookStore(BASE_DIR / config['tick_dir'], config['assets'], signals.index, config['book_max_age_ms'])
+		fill_model = BookFillModel(config, store)
+
 	# Run Backtest Engine
-	result = backtest_strategy(historical_data, signals, sizes, risk_mgr, config)
+	result = backtest_strategy(historical_data, signals, sizes, risk_mgr, config, fill_model=fill_model)
 
 	# Produce Report
 	outpath = os.path.join(os.getcwd(), 'results')
@@ -56,6 +87,24 @@ def main(args):
 	return
 
 
+def report(args):
+
+	# Rebuild Summary / Plots / Attribution from results/results.npz Without Re-Running
+	outpath = os.path.join(os.getcwd(), 'results')
+	export_summary(load_results(outpath), outpath, load_config())
+	return
+
+
+def main(args):
+
+	# Download and Clean Historical Data First with -d
+	if len(args) > 1 and args[1] == '-d':
+		download(args)
+		clean(args)
+
+	backtest(args)
+	return
+
+
 if __name__ == '__main__':
 	main(sys.argv)
-
@@ -0,0 +1,50 @@
+import os
+import sys
+import yaml
+from pathlib import Path
+from dotenv import load_dotenv, find_dotenv
+
+from live.logs import setup_logging
+from live.metrics import start_metrics_server
+from data.ticks import TickRecorder
+from live.host import start_host
+
+
+def main(args):
+
+	# Load Config
+	BASE_DIR = Path(__file__).resolve().parent
+	with open(BASE_DIR / "config.yaml", "r") as f: config = yaml.safe_load(f)
+
+	# Load Environment Variables (Hosted Accounts Read <env_prefix>API_KEY etc.)
+	load_dotenv(find_dotenv())
+
+	# Initialize Logger (Events Tagged with the Hosted Strategy's Name)
+	if not os.path.exists(BASE_DIR / "logs"): os.makedirs(BASE_DIR / "logs")
+	logger, listener = setup_logging(config, BASE_DIR / "logs")
+
+	# Prometheus /metrics Sidecar (Series Labelled per Strategy)
+	if config['metrics_port']: start_metrics_server(config['metrics_host'], config['metrics_port'])
+
+	# Record Live Ticks to Binary Files (Shared Feed, Recorded Once)
+	recorder = TickRecorder(BASE_DIR / config['tick_dir']) if config['record_ticks'] else None
+
+	# One Feed, Book Streams and Connection Pool per Venue; One Strategy per host_strategies Entry
+	host = start_host(config, logger, recorder)
+
+	# Run Every Strategy's Loop Stages on This Thread
+	try:
+		host.run()
+	except Exception as e:
+		print(e)
+	finally:
+		print('Cancelling All Open Orders')
+		host.cancel_orders()
+		if recorder: recorder.flush()
+		listener.stop()
+
+	return
+
+
+if __name__ == '__main__':
+	main(sys.argv)
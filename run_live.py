@@ -1,15 +1,20 @@
 import os
+import sys
 import yaml
-import logging
 from pathlib import Path
 from dotenv import load_dotenv, find_dotenv
 
 from risk.manager import RiskManager
+from live.logs import setup_logging
+from live.metrics import start_metrics_server
+from data.ticks import TickRecorder
 from live.clients import BinanceClient, HyperliquidClient
 from live.execution import Strategy, execution_loop
+from live.supervisor import Supervisor
+from live.feed import FeedClient, start_feeds, wait_ready
 
 
-def main():
+def main(args):
 
 	# Load Config
 	BASE_DIR = Path(__file__).resolve().parent
@@ -18,23 +23,35 @@ def main():
 	# Load Environment Variables
 	load_dotenv(find_dotenv())
 
-	# Initialize Logger
+	# Initialize Logger (Serialization and File I/O off the Trading Thread)
 	if not os.path.exists(BASE_DIR / "logs"): os.makedirs(BASE_DIR / "logs")
-	logging.basicConfig(
-		filename=BASE_DIR / "logs"/ "production.log",
-		level=logging.INFO,
-		format="%(asctime)s %(levelname)-8s %(message)s",
-		datefmt="%Y-%m-%dT%H:%M:%S"
-		)
-	logger = logging.getLogger()
+	logger, listener = setup_logging(config, BASE_DIR / "logs")
+
+	# Prometheus /metrics Sidecar (Loop Stages, REST Latency / Errors, Orders, Hedges)
+	if config['metrics_port']: start_metrics_server(config['metrics_host'], config['metrics_port'])
 
     # Initialize Trading Clients
 	bn_client = BinanceClient(config)
 	hl_client = HyperliquidClient(config)
 	risk_mgr = RiskManager(config)
 
+	# Market Data in Supervised per-Venue Processes, Read from Shared Memory
+	# (Feeds Spend the Market-Data Request Budget, Not the Loop)
+	supervisor, snapshots = None, {}
+	if config['live_processes']:
+		supervisor = Supervisor(config, logger)
+		snapshots = start_feeds(config, supervisor)
+		supervisor.start()
+		wait_ready(snapshots, config['feed_ready_timeout_s'])
+		bn_client = FeedClient(bn_client, snapshots['binance'], 'binance', config['supervisor_stale_s'])
+		hl_client = FeedClient(hl_client, snapshots['hl'], 'hl', config['supervisor_stale_s'])
+		config['stage_weights']['market_data'] = {}
+
+	# Record Live Ticks to Binary Files
+	recorder = TickRecorder(BASE_DIR / config['tick_dir']) if config['record_ticks'] else None
+
 	# Initialize Strategy Object
-	strategy = Strategy(config, logger, bn_client, hl_client, risk_mgr)
+	strategy = Strategy(config, logger, bn_client, hl_client, risk_mgr, recorder)
 
 	# Run Execution Loop
 	try:
@@ -44,9 +61,13 @@ def main():
 	finally:
 		print('Cancelling All Open Orders')
 		strategy.cancel_orders()
+		if recorder: recorder.flush()
+		if supervisor: supervisor.stop()
+		for snapshot in snapshots.values(): snapshot.close()
+		listener.stop()
 
 	return
 
 
 if __name__ == '__main__':
-	main()
\ No newline at end of file
+	main(sys.argv)
\ No newline at end of file
@@ -0,0 +1,35 @@
+import sys
+import yaml
+import argparse
+from pathlib import Path
+
+from live.replay import replay, replay_processes, replay_host
+
+
+def main(args):
+
+	# Load Config
+	BASE_DIR = Path(__file__).resolve().parent
+	with open(BASE_DIR / "config.yaml", "r") as f: config = yaml.safe_load(f)
+
+	parser = argparse.ArgumentParser(description='Replay execution_loop against simulated venues')
+	parser.add_argument('-s', '--source', choices=['historical', 'ticks'], default='historical')
+	parser.add_argument('--start', type=int, default=None, help='Start time (ms)')
+	parser.add_argument('--end', type=int, default=None, help='End time (ms)')
+	parser.add_argument('-p', '--processes', action='store_true', help='Multi-process layout on wall-clock paced venues')
+	parser.add_argument('-H', '--host', action='store_true', help='Run host_strategies on one shared feed')
+	parser.add_argument('--speed', type=float, default=60, help='Simulated seconds per wall second (with -p)')
+	parser.add_argument('--kill-after', type=float, default=None, help='Kill the HL feed once after N seconds (with -p)')
+	opts = parser.parse_args(args[1:])
+
+	# Run Live Strategy on Virtual Clock (or Paced Wall Clock Across Processes)
+	if opts.host: result = replay_host(config, BASE_DIR, opts.start, opts.end)
+	elif opts.processes: result = replay_processes(config, BASE_DIR, opts.start, opts.end, opts.speed, opts.kill_after)
+	else: result = replay(config, BASE_DIR, opts.source, opts.start, opts.end)
+	for k, v in result.items(): print(f'{k}: {v}')
+
+	return
+
+
+if __name__ == '__main__':
+	main(sys.argv)
@@ -0,0 +1,44 @@
+import os
+import sys
+import yaml
+import argparse
+import pandas as pd
+
+from pathlib import Path
+
+from backtest.scenarios import run_scenarios, export_scenarios
+
+
+def main(args):
+
+	# Load Config
+	BASE_DIR = Path(__file__).resolve().parent
+	with open(BASE_DIR / "config.yaml", "r") as f:
+		config = yaml.safe_load(f)
+
+	parser = argparse.ArgumentParser(description='Run the backtest across shocked / resampled paths')
+	parser.add_argument('-n', '--paths', type=int, default=None)
+	parser.add_argument('-w', '--workers', type=int, default=None)
+	parser.add_argument('--seed', type=int, default=0)
+	opts = parser.parse_args(args[1:])
+
+	# Load Historical Data
+	historical_data = {}
+	for asset in config['assets']:
+		f = os.path.join(BASE_DIR, 'data', 'historical', 'clean', asset, f'{asset}.csv')
+		historical_data[asset] = pd.read_csv(f)
+
+	# Run Paths in Parallel
+	results = run_scenarios(historical_data, config, opts.paths, opts.workers, opts.seed)
+
+	# Produce Report
+	outpath = os.path.join(os.getcwd(), 'results')
+	if not os.path.exists(outpath): os.makedirs(outpath)
+	summary = export_scenarios(results, outpath, config)
+	print(summary.to_string(index=False))
+
+	return
+
+
+if __name__ == '__main__':
+	main(sys.argv)
@@ -0,0 +1,42 @@
+import os
+import sys
+import yaml
+import argparse
+import pandas as pd
+
+from pathlib import Path
+
+from backtest.sweep import run_sweep, export_sweep
+
+
+def main(args):
+
+	# Load Config
+	BASE_DIR = Path(__file__).resolve().parent
+	with open(BASE_DIR / "config.yaml", "r") as f:
+		config = yaml.safe_load(f)
+
+	parser = argparse.ArgumentParser(description='Backtest every setting in sweep_params')
+	parser.add_argument('-w', '--workers', type=int, default=None)
+	opts = parser.parse_args(args[1:])
+
+	# Load Historical Data
+	historical_data = {}
+	for asset in config['assets']:
+		f = os.path.join(BASE_DIR, 'data', 'historical', 'clean', asset, f'{asset}.csv')
+		historical_data[asset] = pd.read_csv(f)
+
+	# Run Settings in Parallel
+	results = run_sweep(historical_data, config, opts.workers)
+
+	# Produce Report
+	outpath = os.path.join(os.getcwd(), 'results')
+	if not os.path.exists(outpath): os.makedirs(outpath)
+	results = export_sweep(results, outpath)
+	print(results.to_string(index=False))
+
+	return
+
+
+if __name__ == '__main__':
+	main(sys.argv)
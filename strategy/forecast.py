@@ -0,0 +1,188 @@
+import numpy as np
+
+
+# Funding Settles on the Average Premium Over the Interval Plus a Clamped Interest Term:
+#   F = P + clip(interest - P, -clamp, clamp)
+# Forecasts Estimate P for the Interval in Progress (ewma / kalman) or Regress the
+# Settled Rates on Their Previous Value (ar), Then Difference the Two Venues
+
+VENUES = ('binance', 'hl')
+HOUR_MS = 60 * 60 * 1000
+
+
+def kalman_gain(q, r):
+
+	# Steady-State Gain of a Local-Level Filter (Process Var q, Measurement Var r)
+	# At Steady State the Filter is an EWMA with alpha = K
+	p = (q + np.sqrt(q ** 2 + 4 * q * r)) / 2
+	return p / (p + r)
+
+
+def premium_alpha(config):
+
+	# Per-Minute Smoothing Weight for the Premium Level
+	if config['forecast_method'] == 'kalman': return kalman_gain(config['kalman_q'], config['kalman_r'])
+	return 1 - 0.5 ** (1 / config['forecast_halflife_min'])
+
+
+def structural_funding(premium_avg, venue, config):
+	interest, clamp = config['funding_interest'], config['funding_clamp']
+	rate = premium_avg + np.clip(interest - premium_avg, -clamp, clamp)
+	return rate * config['premium_funding_scale'][venue]
+
+
+def panel(historical_data, col):
+
+	# Time x Asset Matrix for One Column (pandas Loaded by the Batch Paths Only)
+	import pandas as pd
+	return pd.concat({a: df.set_index('t')[col] for a, df in historical_data.items()}, axis=1).sort_index()
+
+
+def premium_forecast(historical_data, venue, config):
+
+	# Expected Settlement from the Premium Seen So Far in the Interval plus the
+	# Smoothed Level for the Part Still to Come
+	import pandas as pd
+	premium = panel(historical_data, f'{venue}_premium').ffill()
+	funding_time = panel(historical_data, f'{venue}_funding_time').ffill()
+	t = premium.index.values.astype('int64')
+
+	level = premium.ewm(alpha=premium_alpha(config), adjust=False).mean().values
+	p = premium.fillna(0).values
+	ft = funding_time.values
+
+	# Running Mean Within Each Funding Interval (New Interval Wherever funding_time Changes)
+	cs = np.cumsum(p, axis=0)
+	n = np.cumsum(~np.isnan(premium.values), axis=0)
+	start = np.ones(ft.shape, dtype=bool)
+	start[1:] = ft[1:] != ft[:-1]
+	rows = np.where(start, np.arange(len(t))[:, None], 0)
+	first = np.maximum.accumulate(rows, axis=0)
+	cols = np.arange(p.shape[1])
+	prior_cs = np.where(first > 0, cs[first - 1, cols], 0)
+	prior_n = np.where(first > 0, n[first - 1, cols], 0)
+	count = n - prior_n
+	run_mean = np.divide(cs - prior_cs, count, out=np.zeros(p.shape), where=count > 0)
+
+	length = config['funding_interval_h'][venue] * HOUR_MS
+	elapsed = np.clip(1 - (ft - t[:, None]) / length, 0, 1)
+	premium_avg = elapsed * run_mean + (1 - elapsed) * level
+
+	forecast = structural_funding(premium_avg, venue, config)
+	return pd.DataFrame(forecast, index=premium.index, columns=premium.columns)
+
+
+def ar_forecast(historical_data, venue, config):
+
+	# Expanding AR(1) Fit on Settled Rates (No Look-Ahead): f_k+1 = a + b * f_k
+	import pandas as pd
+	prev = panel(historical_data, f'{venue}_funding_prev').ffill()
+	f = prev.values
+	x = prev.shift().values
+	settle = (f != x) & ~np.isnan(x) & ~np.isnan(f)
+
+	x = np.where(settle, x, 0)
+	y = np.where(settle, f, 0)
+	n = np.cumsum(settle, axis=0)
+	sx, sy = np.cumsum(x, axis=0), np.cumsum(y, axis=0)
+	sxx, sxy = np.cumsum(x * x, axis=0), np.cumsum(x * y, axis=0)
+
+	var = n * sxx - sx ** 2
+	b = np.divide(n * sxy - sx * sy, var, out=np.zeros(f.shape), where=var > 0)
+	a = np.divide(sy - b * sx, n, out=np.zeros(f.shape), where=n > 0)
+
+	# Persistence Until Enough Settlements to Fit
+	forecast = np.where(n >= config['ar_min_obs'], a + b * f, f)
+	return pd.DataFrame(forecast, index=prev.index, columns=prev.columns)
+
+
+def funding_forecast(historical_data, config):
+
+	# Forecast of hl_funding_next - binance_funding_next (Time x Asset)
+	method = config['forecast_method']
+	if method == 'prev':
+		forecasts = {v: panel(historical_data, f'{v}_funding_prev') for v in VENUES}
+	elif method == 'ar':
+		forecasts = {v: ar_forecast(historical_data, v, config) for v in VENUES}
+	else:
+		forecasts = {v: premium_forecast(historical_data, v, config) for v in VENUES}
+
+	return forecasts['hl'] - forecasts['binance']
+
+
+class FundingForecaster:
+
+	# Online Counterpart of funding_forecast for the Live Loop
+	# State per (Venue, Asset) in Arrays; Each Observation is an O(assets) Update
+
+	def __init__(self, config, assets):
+		self.config = config
+		self.assets = list(assets)
+		self.method = config['forecast_method']
+		self.alpha = premium_alpha(config)
+
+		n = len(self.assets)
+		self.state = {}
+		for venue in VENUES:
+			self.state[venue] = {
+				't': np.full(n, np.nan),
+				'level': np.full(n, np.nan),
+				'funding_time': np.zeros(n),
+				'run_sum': np.zeros(n),
+				'run_n': np.zeros(n),
+				'prev': np.full(n, np.nan),
+				'ar': np.zeros((5, n))
+			}
+
+	def update(self, venue, t, premium, funding_prev, funding_time):
+
+		# t / funding_time in ms; Arrays Ordered as self.assets, NaN Premium Skips the Level Update
+		s = self.state[venue]
+		premium = np.asarray(premium, dtype=float)
+		funding_prev = np.asarray(funding_prev, dtype=float)
+		seen = ~np.isnan(premium)
+
+		# Irregular Spacing: Decay Scales with Minutes Elapsed
+		dt = np.where(np.isnan(s['t']), 1, (t - s['t']) / 60000)
+		alpha = 1 - (1 - self.alpha) ** np.maximum(dt, 0)
+		level = np.where(np.isnan(s['level']), premium, alpha * premium + (1 - alpha) * s['level'])
+		s['level'] = np.where(seen, level, s['level'])
+		s['t'] = np.where(seen, t, s['t'])
+
+		# New Funding Interval Restarts the Running Mean
+		new = funding_time != s['funding_time']
+		s['run_sum'] = np.where(new, 0, s['run_sum']) + np.where(seen, premium, 0)
+		s['run_n'] = np.where(new, 0, s['run_n']) + seen
+		s['funding_time'] = np.where(new, funding_time, s['funding_time'])
+
+		# AR Sufficient Statistics [n, sx, sy, sxx, sxy] Updated on Each Settlement
+		settle = (funding_prev != s['prev']) & ~np.isnan(s['prev']) & ~np.isnan(funding_prev)
+		x, y = s['prev'], funding_prev
+		s['ar'] += np.where(settle, np.array([np.ones_like(y), x, y, x * x, x * y]), 0)
+		s['prev'] = np.where(np.isnan(funding_prev), s['prev'], funding_prev)
+
+		self.t = t
+		return
+
+	def venue_forecast(self, venue):
+
+		s = self.state[venue]
+		if self.method == 'prev': return s['prev']
+
+		if self.method == 'ar':
+			n, sx, sy, sxx, sxy = s['ar']
+			var = n * sxx - sx ** 2
+			b = np.divide(n * sxy - sx * sy, var, out=np.zeros(len(n)), where=var > 0)
+			a = np.divide(sy - b * sx, n, out=np.zeros(len(n)), where=n > 0)
+			return np.where(n >= self.config['ar_min_obs'], a + b * s['prev'], s['prev'])
+
+		length = self.config['funding_interval_h'][venue] * HOUR_MS
+		run_mean = np.divide(s['run_sum'], s['run_n'], out=np.zeros(len(s['run_n'])), where=s['run_n'] > 0)
+		elapsed = np.clip(1 - (s['funding_time'] - self.t) / length, 0, 1)
+		premium_avg = elapsed * run_mean + (1 - elapsed) * s['level']
+		return structural_funding(premium_avg, venue, self.config)
+
+	def forecast(self):
+
+		# Forecast Spread per Asset (Ordered as self.assets)
+		return self.venue_forecast('hl') - self.venue_forecast('binance')
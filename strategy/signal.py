@@ -1,21 +1,26 @@
+import numpy as np
 import pandas as pd
 
-def generate_signals(historical_data, config):
+from strategy.forecast import funding_forecast, panel
 
-	# Simply predicts next funding rate spread as equal to previous
+def funding_spread(historical_data, config):
 
-	signal_data = []
-	for asset in historical_data:
+	# Expected Next Funding Spread (hl - binance) as a Time x Asset Matrix
+	# forecast_method: prev Simply predicts next funding rate spread as equal to previous
+	if config['forecast_method'] == 'prev':
+		return panel(historical_data, 'hl_funding_prev') - panel(historical_data, 'binance_funding_prev')
+	return funding_forecast(historical_data, config)
 
-		df = historical_data[asset].set_index('t')
-		diff = df['hl_funding_prev'] - df['binance_funding_prev']
+def generate_signal_grid(spread, thresholds):
 
-		s = pd.Series(0, index=diff.index, name=asset)
-		s[diff >  config['edge_threshold']] = 1
-		s[diff < -config['edge_threshold']] = -1
+	# One Pass over the Spread Matrix for Every Threshold -> (param, time, asset) int8
+	# NaN Spreads Compare False and Give 0
+	s = np.asarray(spread, dtype=float)[None, :, :]
+	thr = np.asarray(thresholds, dtype=float).reshape(-1, 1, 1)
+	return (s > thr).astype(np.int8) - (s < -thr)
 
-		signal_data.append(s)
-
-	signals = pd.concat(signal_data, axis=1).fillna(0).astype(int)
-	return signals
+def generate_signals(historical_data, config, spread=None):
 
+	if spread is None: spread = funding_spread(historical_data, config)
+	signals = generate_signal_grid(spread.values, [config['edge_threshold']])[0]
+	return pd.DataFrame(signals, index=spread.index, columns=spread.columns).astype(int)
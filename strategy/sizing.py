@@ -1,11 +1,35 @@
-def compute_sizes(signals, config):
+import numpy as np
+import pandas as pd
 
-	# Simply equally weights all signals to position cap
+def compute_sizes(signals, config, spread=None):
+
+	# sizing_mode: fixed Simply equally weights all signals to position cap
+	# sizing_mode: edge Scales with the Forecast Spread (Needs spread)
 	# Safety Cap (in case of incorrect config)
 
-	sizes = signals.astype(float) * config["notional_per_trade"]
-	cap = config["max_position_size"]
-	sizes = sizes.clip(lower=-cap, upper=cap)
+	edge = config['sizing_mode'] == 'edge'
+	sizes = compute_size_grid(signals.values.astype(float)[None], spread.reindex_like(signals).values if edge else None,
+		[config['notional_per_trade']], [config['max_position_size']], [config['edge_size_scale']] if edge else None)[0]
+
+	return pd.DataFrame(sizes, index=signals.index, columns=signals.columns)
+
+def compute_size_grid(signals, spread, notionals, caps, edge_scales=None):
+
+	# Batched Sizing for (param, time, asset) Signals; Parameter Arrays Align with Axis 0
+	# With edge_scales, Size = Notional x |Spread| / Scale (Notional Reached at |Spread| = Scale)
+	notionals = np.asarray(notionals, dtype=float).reshape(-1, 1, 1)
+	caps = np.asarray(caps, dtype=float).reshape(-1, 1, 1)
+	sizes = signals * notionals
+
+	if edge_scales is not None:
+		scales = np.asarray(edge_scales, dtype=float).reshape(-1, 1, 1)
+		edge = np.nan_to_num(np.abs(np.asarray(spread, dtype=float)))[None, :, :]
+		sizes = sizes * edge / scales
+
+	return np.clip(sizes, -caps, caps)
 
-	return sizes
+def param_grid(**params):
 
+	# Cartesian Product of Parameter Lists -> Dict of Aligned Flat Arrays
+	mesh = np.meshgrid(*[np.asarray(v, dtype=float) for v in params.values()], indexing='ij')
+	return {k: m.ravel() for k, m in zip(params, mesh)}